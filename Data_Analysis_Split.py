@@ -4,69 +4,375 @@ from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
 import sys
 import os
 import json
-import subprocess
+import heapq
+import time
+from datetime import date, timedelta
+from request_types import ensure_request_type
+from aggregates import build_cube, save_sidecar
+import timeseries
+import step_runner
+
+REQUEST_KEY_COLUMNS = ["sAMAccountName", "Application", "Request", "Request date"]
 
 # ===== LOAD CONFIG FROM JSON =====
+def apply_config(config, argv):
+    """Settings from the config and step options; run() re-applies them, so the module is imported only once"""
+    global ASSIGNEES, INDIA_OVERFLOW_THRESHOLD, MAX_PER_PERSON_DOMESTIC, MAX_PER_PERSON_MEDITECH, INDIA_KEYWORD
+    global MEDITECH_KEYWORD, REQUESTS_PER_APP_DOMESTIC, ASSIGNMENT_MODE, SOLVER_TIME_BUDGET, ASSIGNEE_PROFILES
+    global STICKY_ASSIGNMENT, HISTORY_FILE, HISTORY_RETENTION_DAYS, SNAPSHOT_FILE, AGE_PRIORITY, AGING_BOOSTS
+    global INDIA_OVERFLOW_MODE, TIMESERIES_ENABLED, TIMESERIES_FILE, TIMESERIES_RETENTION_DAYS
+    global AUTO_MODE, INCREMENTAL_MODE
+    ASSIGNEES = config["assignees"]
+    INDIA_OVERFLOW_THRESHOLD = config["rules"]["india_overflow_threshold"]
+    MAX_PER_PERSON_DOMESTIC = config["rules"]["max_per_person_domestic"]
+    MAX_PER_PERSON_MEDITECH = config["rules"]["max_per_person_meditech"]
+    INDIA_KEYWORD = config["rules"]["india_keyword"]
+    MEDITECH_KEYWORD = config["rules"]["meditech_keyword"]
+    REQUESTS_PER_APP_DOMESTIC = config["rules"]["requests_per_app_domestic"]
+    ASSIGNMENT_MODE = config["rules"].get("assignment_mode", "greedy")
+    SOLVER_TIME_BUDGET = config["rules"].get("solver_time_budget_seconds", 5)
+    ASSIGNEE_PROFILES = config.get("assignee_profiles", {})
+    STICKY_ASSIGNMENT = config["rules"].get("sticky_assignment", False)
+    HISTORY_FILE = config["rules"].get("history_file", "esaf_assignment_history.json")
+    HISTORY_RETENTION_DAYS = config["rules"].get("history_retention_days", 30)
+    SNAPSHOT_FILE = config["rules"].get("snapshot_file", "esaf_assignment_snapshot.json")
+    AGE_PRIORITY = config["rules"].get("age_priority", True)
+    AGING_BOOSTS = config["rules"].get("aging_boosts", [[3, 2], [7, 5]])
+    INDIA_OVERFLOW_MODE = config["rules"].get("india_overflow_mode", "all")
+    TIMESERIES_ENABLED = config.get("timeseries", {}).get("enabled", True)
+    TIMESERIES_FILE = config.get("timeseries", {}).get("file", timeseries.STORE_FILE)
+    TIMESERIES_RETENTION_DAYS = config.get("timeseries", {}).get("daily_retention_days", 400)
+
+    # ===== CONFIG =====
+    AUTO_MODE = "--auto" in argv
+    INCREMENTAL_MODE = ("--incremental" in argv or config["rules"].get("incremental_mode", False)) and "--full" not in argv
+
 with open("esaf_config.json", 'r', encoding='utf-8') as f:
     config = json.load(f)
-
-ASSIGNEES = config["assignees"]
-INDIA_OVERFLOW_THRESHOLD = config["rules"]["india_overflow_threshold"]
-MAX_PER_PERSON_DOMESTIC = config["rules"]["max_per_person_domestic"]
-MAX_PER_PERSON_MEDITECH = config["rules"]["max_per_person_meditech"]
-INDIA_KEYWORD = config["rules"]["india_keyword"]
-MEDITECH_KEYWORD = config["rules"]["meditech_keyword"]
-REQUESTS_PER_APP_DOMESTIC = config["rules"]["requests_per_app_domestic"]
-
-# ===== CONFIG =====
-AUTO_MODE = "--auto" in sys.argv
+apply_config(config, sys.argv)
 
 def load_master_data():
     if not os.path.exists("Today_Assignment.xlsx"):
         print("[ERROR] Today_Assignment.xlsx not found. Run merge_and_cleanup.py first.")
         return None
     try:
-        df = pd.read_excel("Today_Assignment.xlsx", sheet_name="Master_Data")
+        df = ensure_request_type(pd.read_excel("Today_Assignment.xlsx", sheet_name="Master_Data"))
         print(f"[INFO] Loaded {len(df)} rows from Master_Data")
         return df
     except Exception as e:
         print(f"[ERROR] Failed to load Master_Data: {e}")
         return None
 
-def split_data(df):
+def status_buckets(df):
+    """'india'/'meditech'/'domestic' per row from its Status: India first, then Meditech, everything else Domestic"""
     india_mask = df['Status'].str.contains(INDIA_KEYWORD, na=False)
-    india_df = df[india_mask].copy()
-    non_india_df = df[~india_mask].copy()
+    meditech_mask = ~india_mask & df['Status'].str.contains(MEDITECH_KEYWORD, na=False)
+    return pd.Series('domestic', index=df.index).mask(india_mask, 'india').mask(meditech_mask, 'meditech')
 
-    meditech_mask = non_india_df['Status'].str.contains(MEDITECH_KEYWORD, na=False)
-    meditech_df = non_india_df[meditech_mask].copy()
-    domestic_df = non_india_df[~meditech_mask].copy()
+def split_data(df):
+    buckets = status_buckets(df)
+    india_df = df[buckets == 'india'].copy()
+    meditech_df = df[buckets == 'meditech'].copy()
+    domestic_df = df[buckets == 'domestic'].copy()
 
     print(f"[INFO] Split: India={len(india_df)}, Domestic={len(domestic_df)}, Meditech={len(meditech_df)}")
     return india_df, domestic_df, meditech_df
 
-def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_total=15, max_meditech=5, req_per_app=2):
+# ===== ASSIGNEE PROFILES =====
+def build_capacities(assignees, profiles, max_total):
+    """Per-assignee cap = max_total scaled by the profile's capacity_weight (default 1.0)"""
+    capacities = {}
+    for assignee in assignees:
+        weight = profiles.get(assignee, {}).get("capacity_weight", 1.0)
+        capacities[assignee] = max(int(max_total * weight + 0.5), 0)
+    return capacities
+
+def build_skill_index(assignees, profiles):
+    """Map specialist apps to bits and assignees to skill bitsets for O(1) eligibility checks"""
+    # An app listed in any profile's "skills" only goes to people listing it;
+    # every other app is open to the whole team (bit 0).
+    app_bits = {}
+    skill_masks = {}
+    for assignee in assignees:
+        mask = 0
+        for app in profiles.get(assignee, {}).get("skills", []):
+            if app not in app_bits:
+                app_bits[app] = 1 << len(app_bits)
+            mask |= app_bits[app]
+        skill_masks[assignee] = mask
+    return app_bits, skill_masks
+
+def is_eligible(assignee, app, skill_index):
+    app_bits, skill_masks = skill_index
+    bit = app_bits.get(app, 0)
+    return not bit or bool(skill_masks.get(assignee, 0) & bit)
+
+# ===== ASSIGNMENT HISTORY (STICKY OWNERS) =====
+def clean_key_part(value):
+    return "" if pd.isna(value) else str(value).strip()
+
+def request_key(row):
+    """Identity of a request across runs"""
+    return "|".join(clean_key_part(row.get(col)) for col in REQUEST_KEY_COLUMNS)
+
+def load_history(path=HISTORY_FILE):
+    """Load the history index as {index: {key: (assignee, last_seen)}} — empty when missing or unreadable"""
+    history = {"requests": {}, "users": {}, "requesters": {}}
+    if not os.path.exists(path):
+        return history
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        names = raw.get("assignees", [])
+        for index in history:
+            for key, (idx, seen) in raw.get(index, {}).items():
+                if 0 <= idx < len(names):
+                    history[index][key] = (names[idx], seen)
+        print(f"[INFO] Loaded assignment history: {len(history['requests'])} requests, {len(history['users'])} users")
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable history file '{path}': {e}")
+    return history
+
+def lookup_prior_owner(history, row, indexes=("requests", "users", "requesters")):
+    """O(1) lookups in the given indexes: exact request first, then the same user, then the same requester"""
+    for index, key in (("requests", request_key(row)),
+                       ("users", clean_key_part(row.get("sAMAccountName"))),
+                       ("requesters", clean_key_part(row.get("Requested by")))):
+        if index in indexes and key and key in history[index]:
+            return history[index][key][0]
+    return None
+
+def record_history(history, frames, today=None):
+    seen = (today or date.today()).isoformat()
+    for frame in frames:
+        if frame.empty or 'Assignee' not in frame.columns:
+            continue
+        for row in frame.to_dict('records'):
+            assignee = row['Assignee']
+            history["requests"][request_key(row)] = (assignee, seen)
+            for index, col in (("users", "sAMAccountName"), ("requesters", "Requested by")):
+                key = clean_key_part(row.get(col))
+                if key:
+                    history[index][key] = (assignee, seen)
+
+def save_history(history, assignees, retention_days=HISTORY_RETENTION_DAYS, path=HISTORY_FILE, today=None):
+    """Compact on save: drop expired entries and people no longer on the team, store owners as indexes"""
+    cutoff = ((today or date.today()) - timedelta(days=retention_days)).isoformat()
+    names = list(assignees)
+    positions = {name: idx for idx, name in enumerate(names)}
+    compact = {"version": 1, "assignees": names}
+    kept = 0
+    for index, entries in history.items():
+        compact[index] = {
+            key: [positions[assignee], seen]
+            for key, (assignee, seen) in entries.items()
+            if seen >= cutoff and assignee in positions
+        }
+        kept += len(compact[index])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(compact, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    print(f"[INFO] Assignment history saved ({kept} entries, {retention_days}-day retention)")
+
+def apply_sticky_assignments(buckets, history, assignees, capacities, skill_index, max_meditech,
+                             initial_counts=None, initial_meditech_counts=None):
+    """Hand exactly reappearing requests back to their previous owner while caps allow"""
+    # buckets maps 'india'/'domestic'/'meditech' to frames; returns (sticky, remaining, counts, meditech_counts)
+    # Same-user/same-requester matches are only a tie-break inside the engines (prefer=), never a pre-pass
+    counts = dict(initial_counts) if initial_counts else {assignee: 0 for assignee in assignees}
+    meditech_counts = dict(initial_meditech_counts) if initial_meditech_counts else {assignee: 0 for assignee in assignees}
+    sticky = {}
+    remaining = {}
+    for bucket, frame in buckets.items():
+        if frame.empty or not history["requests"]:
+            sticky[bucket] = pd.DataFrame()
+            remaining[bucket] = frame
+            continue
+        kept, rest = [], []
+        for row in frame.to_dict('records'):
+            owner = lookup_prior_owner(history, row, ("requests",))
+            if (owner in counts and counts[owner] < capacities[owner]
+                    and is_eligible(owner, row.get('Application'), skill_index)
+                    and (bucket != 'meditech' or meditech_counts[owner] < max_meditech)):
+                row['Assignee'] = owner
+                counts[owner] += 1
+                if bucket == 'meditech':
+                    meditech_counts[owner] += 1
+                kept.append(row)
+            else:
+                rest.append(row)
+        sticky[bucket] = pd.DataFrame(kept) if kept else pd.DataFrame()
+        remaining[bucket] = pd.DataFrame(rest) if rest else pd.DataFrame()
+    return sticky, remaining, counts, meditech_counts
+
+# ===== INCREMENTAL SNAPSHOT =====
+def frame_request_keys(df):
+    """Vectorised request_key() for a whole frame"""
+    parts = [df[col].map(clean_key_part) if col in df.columns else pd.Series("", index=df.index)
+             for col in REQUEST_KEY_COLUMNS]
+    return parts[0].str.cat(parts[1:], sep="|").tolist()
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Last committed assignment as {request_key: [(bucket, assignee), ...]} — None when there is none"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        names = raw.get("assignees", [])
+        return {
+            key: [(bucket, names[idx] if 0 <= idx < len(names) else None) for bucket, idx in entries]
+            for key, entries in raw.get("rows", {}).items()
+        }
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable snapshot '{path}': {e}")
+        return None
+
+def save_snapshot(buckets, assignees, path=SNAPSHOT_FILE):
+    """Commit the final assignment (bucket + owner per request) for the next incremental run"""
+    names = list(assignees)
+    positions = {name: idx for idx, name in enumerate(names)}
+    rows = {}
+    for bucket, frame in buckets.items():
+        if frame.empty:
+            continue
+        owners = frame['Assignee'].tolist() if 'Assignee' in frame.columns else [None] * len(frame)
+        for key, owner in zip(frame_request_keys(frame), owners):
+            rows.setdefault(key, []).append([bucket, positions.get(owner, -1)])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": 1, "assignees": names, "rows": rows}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def diff_against_snapshot(df, snapshot, assignees):
+    """Split Master_Data into (kept bucket frames with their committed Assignee, rows to place, removed count)"""
+    # Rows previously left in HCA_EXTRA_DATA, or owned by someone no longer on the team, are placed again.
+    # A row whose Status now puts it in another bucket counts as removed from the old one and placed as new.
+    valid = set(assignees)
+    kept_positions = {'india': [], 'domestic': [], 'meditech': []}
+    kept_owners = {'india': [], 'domestic': [], 'meditech': []}
+    new_positions = []
+    moved = 0
+    for pos, (key, current) in enumerate(zip(frame_request_keys(df), status_buckets(df))):
+        entries = snapshot.get(key)
+        if entries:
+            bucket, owner = entries.pop()
+            if bucket == current and owner in valid:
+                kept_positions[bucket].append(pos)
+                kept_owners[bucket].append(owner)
+                continue
+            if bucket in kept_positions and bucket != current:
+                moved += 1
+        new_positions.append(pos)
+    removed = moved + sum(len(entries) for entries in snapshot.values())
+
+    kept = {}
+    for bucket, positions in kept_positions.items():
+        if positions:
+            frame = df.iloc[positions].copy()
+            frame['Assignee'] = kept_owners[bucket]
+            kept[bucket] = frame.reset_index(drop=True)
+        else:
+            kept[bucket] = pd.DataFrame()
+    return kept, df.iloc[new_positions].reset_index(drop=True), removed
+
+def count_loads(kept, assignees):
+    counts = {assignee: 0 for assignee in assignees}
+    meditech_counts = {assignee: 0 for assignee in assignees}
+    for bucket, frame in kept.items():
+        if frame.empty:
+            continue
+        for assignee, count in frame['Assignee'].value_counts().items():
+            counts[assignee] += int(count)
+            if bucket == 'meditech':
+                meditech_counts[assignee] += int(count)
+    return counts, meditech_counts
+
+def combine_frames(*frames):
+    non_empty = [frame for frame in frames if not frame.empty]
+    return pd.concat(non_empty, ignore_index=True) if non_empty else pd.DataFrame()
+
+# ===== AGE PRIORITY =====
+def priority_scores(df, now=None):
+    """Days since Request date plus the largest aging boost earned by days since Last updated time"""
+    now = now or pd.Timestamp.now()
+    missing = pd.Series(pd.NaT, index=df.index)
+    requested = pd.to_datetime(df['Request date'], errors='coerce') if 'Request date' in df.columns else missing
+    updated = pd.to_datetime(df['Last updated time'], errors='coerce') if 'Last updated time' in df.columns else missing
+    age_days = ((now - requested).dt.total_seconds() / 86400).fillna(0)
+    stale_days = ((now - updated).dt.total_seconds() / 86400).fillna(0)
+    boost = pd.Series(0.0, index=df.index)
+    for threshold, boost_days in AGING_BOOSTS:
+        boost = boost.mask(stale_days >= threshold, boost.clip(lower=boost_days))
+    return (age_days + boost).tolist()
+
+def priority_order(items, scores):
+    """Drain a max-heap on score: oldest work first, input order breaks ties"""
+    heap = [(-score, seq) for seq, score in enumerate(scores)]
+    heapq.heapify(heap)
+    return [items[heapq.heappop(heap)[1]] for _ in range(len(heap))]
+
+def split_by_priority(df, limit):
+    """Keep the `limit` highest-priority rows, return (kept, overflow)"""
+    order = priority_order(list(range(len(df))), priority_scores(df))
+    return df.iloc[order[:limit]].reset_index(drop=True), df.iloc[order[limit:]].reset_index(drop=True)
+
+def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_total=15, max_meditech=5, req_per_app=2,
+                            capacities=None, skill_index=None, initial_counts=None, initial_meditech_counts=None,
+                            age_priority=False, prefer=None):
+    """Greedy phases: India, Domestic (app diversity), Meditech — prefer(row) names an owner to favour when they have room"""
     if india_df.empty and domestic_df.empty and meditech_df.empty:
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
+    caps = capacities or {assignee: max_total for assignee in assignees}
+    skill_index = skill_index or ({}, {})
     assigned_india = []
     assigned_domestic = []
     assigned_meditech = []
     extra_rows = []
-    assignee_counts = {assignee: 0 for assignee in assignees}
+    assignee_counts = dict(initial_counts) if initial_counts else {assignee: 0 for assignee in assignees}
 
-    # PHASE 1: INDIA
-    if not india_df.empty:
-        india_list = india_df.to_dict('records')
+    def queue_rows(frame):
+        rows = frame.to_dict('records')
+        return priority_order(rows, priority_scores(frame)) if age_priority else rows
+
+    def has_room(assignee, app):
+        return assignee_counts[assignee] < caps[assignee] and is_eligible(assignee, app, skill_index)
+
+    def preferred_owner(row):
+        """Previous owner of the same user/requester — only decides who gets a row the phase is placing anyway"""
+        owner = prefer(row) if prefer else None
+        return owner if owner in assignee_counts else None
+
+    def give(row, assignee, placed):
+        row['Assignee'] = assignee
+        assignee_counts[assignee] += 1
+        placed.append(row)
+
+    def place_round_robin(rows, placed):
+        """Rotate through assignees, skipping anyone full or not skilled for the row's app"""
         assignee_idx = 0
-        for row in india_list:
-            if assignee_counts[assignees[assignee_idx]] < max_total:
-                row['Assignee'] = assignees[assignee_idx]
-                assignee_counts[assignees[assignee_idx]] += 1
-                assigned_india.append(row)
+        for row in rows:
+            app = row.get('Application')
+            owner = preferred_owner(row)
+            if owner is not None and has_room(owner, app):
+                give(row, owner, placed)
+                continue
+            for offset in range(len(assignees)):
+                idx = (assignee_idx + offset) % len(assignees)
+                assignee = assignees[idx]
+                if has_room(assignee, app):
+                    give(row, assignee, placed)
+                    assignee_idx = (idx + 1) % len(assignees)
+                    break
             else:
                 extra_rows.append(row)
-            assignee_idx = (assignee_idx + 1) % len(assignees)
+                assignee_idx = (assignee_idx + 1) % len(assignees)
+
+    # PHASE 1: INDIA
+    if not india_df.empty:
+        place_round_robin(queue_rows(india_df), assigned_india)
 
     # PHASE 2: DOMESTIC (APP DIVERSITY)
     if not domestic_df.empty:
@@ -75,13 +381,27 @@ def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_t
 
         app_groups = {}
         for app in apps:
-            app_groups[app] = domestic_df[domestic_df['Application'] == app].to_dict('records')
+            app_groups[app] = queue_rows(domestic_df[domestic_df['Application'] == app])
+
+        leftovers = []
+        if age_priority:
+            # Apps holding the oldest work get their diversity round first
+            oldest = {}
+            for app, score in zip(domestic_df['Application'], priority_scores(domestic_df)):
+                oldest[app] = max(oldest.get(app, score), score)
+            apps = priority_order(apps, [oldest.get(app, 0) for app in apps])
 
         for app in apps:
             group = app_groups[app]
             if not group:
                 continue
 
+            eligible = [assignee for assignee in assignees if is_eligible(assignee, app, skill_index)]
+            if not eligible:
+                print(f"[WARNING] Nobody is skilled for '{app}' -> {len(group)} rows to HCA_EXTRA_DATA")
+                extra_rows.extend(group)
+                continue
+
             print(f"[INFO] Assigning {req_per_app} requests per assignee from '{app}'...")
             assignee_idx = 0
 
@@ -89,8 +409,8 @@ def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_t
             for _ in range(req_per_app):
                 if not group:
                     break
-                for assignee in assignees:
-                    if assignee_counts[assignee] < max_total and group:
+                for assignee in eligible:
+                    if assignee_counts[assignee] < caps[assignee] and group:
                         row = group.pop(0)
                         row['Assignee'] = assignee
                         assignee_counts[assignee] += 1
@@ -98,32 +418,52 @@ def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_t
                     if not group:
                         break
 
-            # Round 2: Assign leftovers
+            if age_priority:
+                leftovers.extend(group)
+                continue
+
+            # Round 2: Assign leftovers (round 1 is left alone so requests_per_app diversity holds)
             while group:
-                assignee = assignees[assignee_idx % len(assignees)]
-                if assignee_counts[assignee] < max_total:
+                owner = preferred_owner(group[0])
+                if owner in eligible and has_room(owner, app):
+                    give(group.pop(0), owner, assigned_domestic)
+                    continue
+                assignee = eligible[assignee_idx % len(eligible)]
+                if assignee_counts[assignee] < caps[assignee]:
                     row = group.pop(0)
                     row['Assignee'] = assignee
                     assignee_counts[assignee] += 1
                     assigned_domestic.append(row)
                 else:
                     assignee_idx += 1
-                    if assignee_idx >= len(assignees) * 2:
+                    if assignee_idx >= len(eligible) * 2:
                         break
             extra_rows.extend(group)
 
+        # Round 2 (age priority): leftovers of every app share one queue, so overflow is the youngest work
+        if leftovers:
+            leftover_frame = pd.DataFrame(leftovers)
+            place_round_robin(priority_order(leftovers, priority_scores(leftover_frame)), assigned_domestic)
+
     # PHASE 3: MEDITECH
     if not meditech_df.empty:
-        meditech_list = meditech_df.to_dict('records')
+        meditech_list = queue_rows(meditech_df)
         assignee_idx = 0
-        meditech_counts = {assignee: 0 for assignee in assignees}
+        meditech_counts = dict(initial_meditech_counts) if initial_meditech_counts else {assignee: 0 for assignee in assignees}
 
         for row in meditech_list:
             assigned = False
             start_idx = assignee_idx
+            app = row.get('Application')
+            owner = preferred_owner(row)
+            if owner is not None and has_room(owner, app) and meditech_counts[owner] < max_meditech:
+                give(row, owner, assigned_meditech)
+                meditech_counts[owner] += 1
+                continue
             while assignee_idx < start_idx + len(assignees):
                 assignee = assignees[assignee_idx % len(assignees)]
-                if assignee_counts[assignee] < max_total and meditech_counts[assignee] < max_meditech:
+                if (assignee_counts[assignee] < caps[assignee] and meditech_counts[assignee] < max_meditech
+                        and is_eligible(assignee, app, skill_index)):
                     row['Assignee'] = assignee
                     assignee_counts[assignee] += 1
                     meditech_counts[assignee] += 1
@@ -144,6 +484,201 @@ def assign_requests_dynamic(india_df, domestic_df, meditech_df, assignees, max_t
 
     return india_final, domestic_final, meditech_final, extra_final
 
+# ===== OPTIMAL SOLVER (MIN-COST FLOW) =====
+class MinCostFlow:
+    """Successive shortest paths min-cost flow (Dijkstra with potentials, pure Python)"""
+
+    def __init__(self, node_count):
+        self.graph = [[] for _ in range(node_count)]
+        self.edges = []
+
+    def add_edge(self, u, v, cap, cost):
+        self.graph[u].append([v, cap, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        self.edges.append((u, len(self.graph[u]) - 1, cap))
+        return len(self.edges) - 1
+
+    def flow_on(self, edge_id):
+        u, idx, cap = self.edges[edge_id]
+        return cap - self.graph[u][idx][1]
+
+    def solve(self, source, sink, max_flow, deadline=None):
+        n = len(self.graph)
+        potential = [0] * n
+        total_flow = 0
+        total_cost = 0
+        while total_flow < max_flow:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError("min-cost flow exceeded time budget")
+            dist = [None] * n
+            prev = [None] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for i, (v, cap, cost, _) in enumerate(self.graph[u]):
+                    if cap <= 0:
+                        continue
+                    nd = d + cost + potential[u] - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = (u, i)
+                        heapq.heappush(heap, (nd, v))
+            if dist[sink] is None:
+                break
+            # Capping at dist[sink] keeps every residual reduced cost non-negative
+            for v in range(n):
+                potential[v] += dist[sink] if dist[v] is None else min(dist[v], dist[sink])
+
+            push = max_flow - total_flow
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                push = min(push, self.graph[u][i][1])
+                v = u
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                edge = self.graph[u][i]
+                edge[1] -= push
+                self.graph[v][edge[3]][1] += push
+                v = u
+            total_flow += push
+            total_cost += push * (potential[sink] - potential[source])
+        return total_flow, total_cost
+
+def unassigned_penalty(node_count, max_total):
+    """Cost of leaving a row unassigned — larger than any rerouting gain, so coverage always wins"""
+    return node_count * max(max_total, 1) + 1
+
+def assignment_objective(india_df, domestic_df, meditech_df, extra_df, assignees, max_total=15, req_per_app=2):
+    """Score an assignment: unassigned penalty + load imbalance + per-app concentration"""
+    loads = {assignee: 0 for assignee in assignees}
+    for frame in [india_df, domestic_df, meditech_df]:
+        if not frame.empty:
+            for assignee, count in frame['Assignee'].value_counts().items():
+                loads[assignee] = loads.get(assignee, 0) + int(count)
+
+    spread_cost = 0
+    if not domestic_df.empty:
+        for count in domestic_df.groupby(['Application', 'Assignee'], dropna=False).size():
+            beyond = max(int(count) - req_per_app, 0)
+            spread_cost += beyond * (beyond + 1) // 2
+
+    imbalance_cost = sum(load * (load + 1) // 2 for load in loads.values())
+    unassigned = len(extra_df)
+    total_rows = len(india_df) + len(domestic_df) + len(meditech_df) + unassigned
+    node_count = 4 + total_rows + 2 * len(assignees)
+    objective = unassigned * unassigned_penalty(node_count, max_total) + imbalance_cost + spread_cost
+    return {
+        'objective': objective,
+        'unassigned': unassigned,
+        'imbalance': imbalance_cost,
+        'spread': spread_cost,
+    }
+
+def assign_requests_optimal(india_df, domestic_df, meditech_df, assignees, max_total=15, max_meditech=5, req_per_app=2,
+                            time_budget=5, capacities=None, skill_index=None, initial_counts=None, initial_meditech_counts=None,
+                            age_priority=False, prefer=None):
+    """Solve the whole assignment as one min-cost flow — raises TimeoutError past time_budget"""
+    if india_df.empty and domestic_df.empty and meditech_df.empty:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    caps = capacities or {assignee: max_total for assignee in assignees}
+    skill_index = skill_index or ({}, {})
+    start_counts = initial_counts or {}
+    start_meditech = initial_meditech_counts or {}
+
+    # Rows of one bucket/application are interchangeable, so each group is a single node.
+    # The k-th unit of load on an assignee costs k (quadratic imbalance penalty) and the
+    # j-th unit of an app beyond req_per_app on one assignee costs j (spreads apps out).
+    # India/meditech groups are split by app too so skill eligibility stays per group.
+    groups = []  # (bucket, app, rows)
+    for bucket, frame in [('india', india_df), ('domestic', domestic_df), ('meditech', meditech_df)]:
+        if not frame.empty:
+            for app, app_df in frame.groupby('Application', sort=False, dropna=False):
+                rows = app_df.to_dict('records')
+                if age_priority:
+                    # Unplaced rows are taken from the tail of each group, so order oldest first
+                    rows = priority_order(rows, priority_scores(app_df))
+                groups.append((bucket, app, rows))
+
+    n_assignees = len(assignees)
+    source = 0
+    sink = 1
+    group_base = 2
+    person_base = group_base + len(groups)
+    meditech_base = person_base + n_assignees
+    node_count = meditech_base + n_assignees
+
+    total_rows = len(india_df) + len(domestic_df) + len(meditech_df)
+    penalty = unassigned_penalty(4 + total_rows + 2 * n_assignees, max(caps.values(), default=max_total))
+    solver = MinCostFlow(node_count)
+    group_edges = []
+    for g, (bucket, app, rows) in enumerate(groups):
+        node = group_base + g
+        solver.add_edge(source, node, len(rows), 0)
+        solver.add_edge(node, sink, len(rows), penalty)
+        edges = {}
+        for p, assignee in enumerate(assignees):
+            if not is_eligible(assignee, app, skill_index):
+                edges[p] = []
+            elif bucket == 'india':
+                edges[p] = [solver.add_edge(node, person_base + p, len(rows), 0)]
+            elif bucket == 'meditech':
+                edges[p] = [solver.add_edge(node, meditech_base + p, len(rows), 0)]
+            else:
+                edges[p] = [solver.add_edge(node, person_base + p, min(req_per_app, len(rows)), 0)]
+                for extra in range(1, max(caps[assignee] - req_per_app, 0) + 1):
+                    if extra > len(rows) - req_per_app:
+                        break
+                    edges[p].append(solver.add_edge(node, person_base + p, 1, extra))
+        group_edges.append(edges)
+
+    for p, assignee in enumerate(assignees):
+        solver.add_edge(meditech_base + p, person_base + p, max(max_meditech - start_meditech.get(assignee, 0), 0), 0)
+        for k in range(start_counts.get(assignee, 0) + 1, caps[assignee] + 1):
+            solver.add_edge(person_base + p, sink, 1, k)
+
+    solver.solve(source, sink, total_rows, deadline)
+
+    assigned = {'india': [], 'domestic': [], 'meditech': []}
+    extra_rows = []
+    for (bucket, app, rows), edges in zip(groups, group_edges):
+        takes = [sum(solver.flow_on(e) for e in edges[p]) for p in range(n_assignees)]
+        placed = sum(takes)
+        for row, assignee in zip(rows[:placed], deal_rows(rows[:placed], takes, assignees, prefer)):
+            row['Assignee'] = assignee
+            assigned[bucket].append(row)
+        extra_rows.extend(rows[placed:])
+
+    india_final = pd.DataFrame(assigned['india']) if assigned['india'] else pd.DataFrame()
+    domestic_final = pd.DataFrame(assigned['domestic']) if assigned['domestic'] else pd.DataFrame()
+    meditech_final = pd.DataFrame(assigned['meditech']) if assigned['meditech'] else pd.DataFrame()
+    extra_final = pd.DataFrame(extra_rows) if extra_rows else pd.DataFrame()
+
+    return india_final, domestic_final, meditech_final, extra_final
+
+def deal_rows(rows, takes, assignees, prefer=None):
+    """Owner per row so assignees[p] gets takes[p] rows, each row going to its prefer(row) owner while they have slots left"""
+    slots = dict(zip(assignees, takes))
+    owners = [None] * len(rows)
+    if prefer:
+        for pos, row in enumerate(rows):
+            owner = prefer(row)
+            if slots.get(owner, 0) > 0:
+                owners[pos] = owner
+                slots[owner] -= 1
+    rest = iter([assignee for assignee in assignees for _ in range(slots[assignee])])
+    return [owner if owner is not None else next(rest) for owner in owners]
+
+def print_objective_report(label, score):
+    print(f"   {label}: objective={score['objective']} "
+          f"(unassigned={score['unassigned']}, imbalance={score['imbalance']}, app_spread={score['spread']})")
+
 def apply_sorting_and_styling(worksheet, sort_by_col="Last updated time"):
     sort_col_idx = None
     for col in range(1, worksheet.max_column + 1):
@@ -214,6 +749,37 @@ def save_to_sheets(india_df, domestic_df, meditech_df, extra_df):
     wb.save("Today_Assignment.xlsx")
     print("[SUCCESS] Saved and styled all sheets.")
 
+def sheet_order(frame, sort_by_col="Last updated time"):
+    """Rows in the order apply_sorting_and_styling leaves them on the sheet"""
+    if sort_by_col not in frame.columns:
+        return frame
+    keys = [value if not pd.isna(value) else "" for value in frame[sort_by_col]]
+    try:
+        return frame.iloc[sorted(range(len(keys)), key=keys.__getitem__)]
+    except TypeError:
+        return frame
+
+def assignment_rows(frames):
+    """(request_key, Application, RequestType, Assignee) per assigned row, for the time-series new-placement counts"""
+    rows = []
+    for frame in frames:
+        if frame.empty:
+            continue
+        typed = ensure_request_type(frame.copy())
+        kinds = typed['RequestType'].tolist() if 'RequestType' in typed.columns else [None] * len(typed)
+        rows.extend(zip(frame_request_keys(typed), typed['Application'].tolist(), kinds, typed['Assignee'].tolist()))
+    return rows
+
+def build_sheet_cubes(master_df, india_df, domestic_df, meditech_df, extra_df):
+    """Aggregate cubes for Master_Data and every sheet written by save_to_sheets"""
+    domestic_combined = combine_frames(domestic_df, meditech_df)
+    cubes = {"Master_Data": build_cube(master_df.copy())}
+    for sheet, frame in [("HCA_India", india_df), ("HCA_Domestic", domestic_combined), ("HCA_EXTRA_DATA", extra_df)]:
+        # Sheets that were not rewritten this run are left for readers to count themselves
+        if not frame.empty:
+            cubes[sheet] = build_cube(sheet_order(frame).copy())
+    return cubes
+
 def main():
     print("[INFO] STEP 3: ULTIMATE DYNAMIC ASSIGNMENT ENGINE")
     print("=" * 50)
@@ -221,28 +787,133 @@ def main():
     df = load_master_data()
     if df is None:
         return
+    master_df = df
+
+    kept = {'india': pd.DataFrame(), 'domestic': pd.DataFrame(), 'meditech': pd.DataFrame()}
+    if INCREMENTAL_MODE:
+        snapshot = load_snapshot(SNAPSHOT_FILE)
+        if snapshot is None:
+            print("[INFO] Incremental mode: no snapshot yet -> full assignment this run")
+        else:
+            kept, df, removed = diff_against_snapshot(df, snapshot, ASSIGNEES)
+            kept_total = sum(len(frame) for frame in kept.values())
+            print(f"[INFO] Incremental mode: kept={kept_total}, new={len(df)}, removed={removed}")
 
     india_df, domestic_df, meditech_df = split_data(df)
 
-    if len(india_df) >= INDIA_OVERFLOW_THRESHOLD:
-        print(f"[WARNING] India has {len(india_df)} >= {INDIA_OVERFLOW_THRESHOLD} -> moving ALL to HCA_EXTRA_DATA")
+    india_total = len(kept['india']) + len(india_df)
+    if INDIA_OVERFLOW_MODE == "partial":
+        # Partial mode keeps up to the threshold, so only rows beyond it overflow
+        extra_df = pd.DataFrame()
+        if india_total > INDIA_OVERFLOW_THRESHOLD:
+            india_df, extra_df = split_by_priority(india_df, max(INDIA_OVERFLOW_THRESHOLD - len(kept['india']), 0))
+        if not extra_df.empty:
+            print(f"[WARNING] India has {india_total} > {INDIA_OVERFLOW_THRESHOLD} -> moving {len(extra_df)} youngest rows to HCA_EXTRA_DATA")
+    elif india_total >= INDIA_OVERFLOW_THRESHOLD:
+        if kept['india'].empty:
+            print(f"[WARNING] India has {len(india_df)} >= {INDIA_OVERFLOW_THRESHOLD} -> moving ALL to HCA_EXTRA_DATA")
+        else:
+            print(f"[WARNING] India has {len(kept['india'])} kept + {len(india_df)} new >= {INDIA_OVERFLOW_THRESHOLD} -> moving new India rows to HCA_EXTRA_DATA")
         extra_df = india_df
         india_df = pd.DataFrame()
     else:
         extra_df = pd.DataFrame()
 
-    india_assigned, domestic_assigned, meditech_assigned, extra_assigned = assign_requests_dynamic(
-        india_df, domestic_df, meditech_df, ASSIGNEES,
+    capacities = build_capacities(ASSIGNEES, ASSIGNEE_PROFILES, MAX_PER_PERSON_DOMESTIC)
+    skill_index = build_skill_index(ASSIGNEES, ASSIGNEE_PROFILES)
+    engine_args = dict(
         max_total=MAX_PER_PERSON_DOMESTIC,
         max_meditech=MAX_PER_PERSON_MEDITECH,
-        req_per_app=REQUESTS_PER_APP_DOMESTIC
+        req_per_app=REQUESTS_PER_APP_DOMESTIC,
+        capacities=capacities,
+        skill_index=skill_index,
+        age_priority=AGE_PRIORITY
     )
+    score_args = dict(max_total=max(capacities.values(), default=MAX_PER_PERSON_DOMESTIC), req_per_app=REQUESTS_PER_APP_DOMESTIC)
+
+    kept_counts, kept_meditech = count_loads(kept, ASSIGNEES)
+    history = load_history(HISTORY_FILE)
+    lookup = history if STICKY_ASSIGNMENT else {"requests": {}, "users": {}, "requesters": {}}
+    if STICKY_ASSIGNMENT and (history["users"] or history["requesters"]):
+        # Same user/requester only breaks ties inside each phase, so age priority and app diversity still decide
+        engine_args['prefer'] = lambda row: lookup_prior_owner(history, row, ("users", "requesters"))
+    sticky, remaining, start_counts, start_meditech = apply_sticky_assignments(
+        {'india': india_df, 'domestic': domestic_df, 'meditech': meditech_df},
+        lookup, ASSIGNEES, capacities, skill_index, MAX_PER_PERSON_MEDITECH,
+        initial_counts=kept_counts, initial_meditech_counts=kept_meditech
+    )
+    sticky_total = sum(len(frame) for frame in sticky.values())
+    if sticky_total:
+        print(f"[INFO] Sticky: {sticky_total} rows returned to their previous owners")
+    india_df, domestic_df, meditech_df = remaining['india'], remaining['domestic'], remaining['meditech']
+    engine_args.update(initial_counts=start_counts, initial_meditech_counts=start_meditech)
+
+    def with_sticky(result):
+        india_part, domestic_part, meditech_part, extra_part = result
+        return (combine_frames(kept['india'], sticky['india'], india_part),
+                combine_frames(kept['domestic'], sticky['domestic'], domestic_part),
+                combine_frames(kept['meditech'], sticky['meditech'], meditech_part),
+                extra_part)
+
+    india_assigned, domestic_assigned, meditech_assigned, extra_assigned = with_sticky(assign_requests_dynamic(
+        india_df, domestic_df, meditech_df, ASSIGNEES, **engine_args
+    ))
+
+    if ASSIGNMENT_MODE == "optimal":
+        print(f"\n[INFO] Optimal solver mode (time budget {SOLVER_TIME_BUDGET}s)...")
+        greedy_score = assignment_objective(
+            india_assigned, domestic_assigned, meditech_assigned, extra_assigned, ASSIGNEES, **score_args
+        )
+        try:
+            start = time.perf_counter()
+            optimal_result = with_sticky(assign_requests_optimal(
+                india_df, domestic_df, meditech_df, ASSIGNEES, time_budget=SOLVER_TIME_BUDGET, **engine_args
+            ))
+            elapsed = time.perf_counter() - start
+            optimal_score = assignment_objective(*optimal_result, ASSIGNEES, **score_args)
+            print(f"[INFO] Solver finished in {elapsed:.2f}s")
+            print_objective_report("Greedy ", greedy_score)
+            print_objective_report("Optimal", optimal_score)
+            if optimal_score['objective'] <= greedy_score['objective']:
+                india_assigned, domestic_assigned, meditech_assigned, extra_assigned = optimal_result
+            else:
+                print("[WARNING] Solver result is worse than greedy -> keeping greedy assignment")
+        except TimeoutError:
+            print(f"[WARNING] Solver exceeded {SOLVER_TIME_BUDGET}s -> falling back to greedy assignment")
+            print_objective_report("Greedy ", greedy_score)
 
     if not extra_assigned.empty:
         extra_df = pd.concat([extra_df, extra_assigned], ignore_index=True) if not extra_df.empty else extra_assigned
 
     save_to_sheets(india_assigned, domestic_assigned, meditech_assigned, extra_df)
 
+    cubes = None
+    try:
+        cubes = build_sheet_cubes(master_df, india_assigned, domestic_assigned, meditech_assigned, extra_df)
+        save_sidecar("Today_Assignment.xlsx", cubes)
+    except Exception as e:
+        print(f"[WARNING] Could not save aggregate sidecar: {e}")
+
+    # Today's assigned/backlog counts go into the long-running history the dashboard plots
+    if cubes is not None and TIMESERIES_ENABLED:
+        try:
+            assignments = assignment_rows([india_assigned, domestic_assigned, meditech_assigned])
+            timeseries.record_run(cubes, assignments, TIMESERIES_RETENTION_DAYS, TIMESERIES_FILE)
+        except Exception as e:
+            print(f"[WARNING] Could not update time-series store: {e}")
+
+    try:
+        save_snapshot({'india': india_assigned, 'domestic': domestic_assigned,
+                       'meditech': meditech_assigned, 'extra': extra_df}, ASSIGNEES, SNAPSHOT_FILE)
+    except Exception as e:
+        print(f"[WARNING] Could not save assignment snapshot: {e}")
+
+    record_history(history, [india_assigned, domestic_assigned, meditech_assigned])
+    try:
+        save_history(history, ASSIGNEES, HISTORY_RETENTION_DAYS, HISTORY_FILE)
+    except Exception as e:
+        print(f"[WARNING] Could not save assignment history: {e}")
+
     print("\n[INFO] FINAL ASSIGNMENT SUMMARY:")
     for assignee in ASSIGNEES:
         india_count = len(india_assigned[india_assigned['Assignee'] == assignee]) if not india_assigned.empty else 0
@@ -250,7 +921,7 @@ def main():
         meditech_count = len(meditech_assigned[meditech_assigned['Assignee'] == assignee]) if not meditech_assigned.empty else 0
         total = india_count + domestic_count + meditech_count
         # FIX: Replaced \u2192 with ASCII "->"
-        print(f"   {assignee}: India={india_count}, Domestic={domestic_count}, Meditech={meditech_count} -> TOTAL={total}")
+        print(f"   {assignee}: India={india_count}, Domestic={domestic_count}, Meditech={meditech_count} -> TOTAL={total}/{capacities[assignee]}")
 
     print(f"\n[SUCCESS] STEP 3 COMPLETED — DYNAMIC ASSIGNMENT DONE!")
     print(f"[INFO] HCA_India: {len(india_assigned)} rows")
@@ -260,10 +931,18 @@ def main():
     if AUTO_MODE:
         print("\n[AUTO] Auto-triggering summary_pivot.py...")
         try:
-            subprocess.run([sys.executable, "summary_pivot.py", "--auto"], check=True)
-            print("[SUCCESS] Step 4 completed automatically.")
+            # Same process: Step 4 reuses the modules already loaded here instead of a fresh interpreter
+            if step_runner.run_step("step4", context={"args": ["--auto"]}):
+                print("[SUCCESS] Step 4 completed automatically.")
+            else:
+                print("[ERROR] Step 4 failed.")
         except Exception as e:
             print(f"[ERROR] Failed to auto-trigger summary_pivot.py: {e}")
 
+def run(config, context):
+    """Step runner entry point: context["args"] takes the command-line options (e.g. ["--auto", "--incremental"])"""
+    apply_config(config, context.get("args", []))
+    main()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,27 +4,80 @@ ESAF Executive Dashboard Generator - LEADER-FOCUSED VERSION
 Clear, meaningful visualizations for executive decision-making
 """
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import plotly.io as pio
+from plotly.colors import get_colorscale
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from plotly.utils import PlotlyJSONEncoder
 import json
 import sys
+import uuid
 from pathlib import Path
 import html
 import argparse
+import base64
+import gzip
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from urllib.parse import quote, unquote, urlsplit
+from aggregates import CUBE_COLUMNS, build_cube, cube_type_counts, load_sidecar, workbook_stamp
+from request_types import REQUEST_TYPES
+import timeseries
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ===== LOAD CONFIG =====
+def apply_config(config):
+    """Dashboard settings (missing keys keep their defaults); run() re-applies them, so the module is imported only once"""
+    global DASHBOARD_TITLE, SHEETS_TO_PROCESS, DASHBOARD_WORKERS, PLOTLYJS_MODE, CACHE_DIR, CACHE_ENTRIES
+    global TREND_MAX_POINTS, TIMESERIES_ENABLED, TIMESERIES_FILE, SERVE_PORT, RELOAD_POLL_SECONDS
+    DASHBOARD_TITLE = config.get("dashboard", {}).get("title", "ESAF Access Requests Executive Dashboard")
+    SHEETS_TO_PROCESS = config.get("dashboard", {}).get("sheets", ["Master_Data", "HCA_India", "HCA_Domestic", "Summary"])
+    DASHBOARD_WORKERS = config.get("dashboard", {}).get("workers", 0)
+    PLOTLYJS_MODE = config.get("dashboard", {}).get("plotlyjs", "inline")
+    CACHE_DIR = config.get("dashboard", {}).get("cache_dir", ".dashboard_cache")
+    CACHE_ENTRIES = config.get("dashboard", {}).get("cache_entries", 32)
+    TREND_MAX_POINTS = config.get("dashboard", {}).get("trend_max_points", 500)
+    TIMESERIES_ENABLED = config.get("timeseries", {}).get("enabled", True)
+    TIMESERIES_FILE = config.get("timeseries", {}).get("file", timeseries.STORE_FILE)
+    SERVE_PORT = config.get("dashboard", {}).get("port", 8050)
+    RELOAD_POLL_SECONDS = config.get("dashboard", {}).get("reload_poll_seconds", 15)
+
 try:
     with open("esaf_config.json", 'r', encoding='utf-8') as f:
         config = json.load(f)
-    DASHBOARD_TITLE = config.get("dashboard", {}).get("title", "ESAF Access Requests Executive Dashboard")
-    SHEETS_TO_PROCESS = config.get("dashboard", {}).get("sheets", ["Master_Data", "HCA_India", "HCA_Domestic", "Summary"])
 except Exception:
-    DASHBOARD_TITLE = "ESAF Access Requests Executive Dashboard"
-    SHEETS_TO_PROCESS = ["Master_Data", "HCA_India", "HCA_Domestic", "Summary"]
+    config = {}
+apply_config(config)
+
+PLOTLYJS_MODES = ["inline", "local", "cdn"]
+
+# Page layout lives in templates/: inside the bundle when frozen, else next to this script or in the working folder
+TEMPLATE_DIRS = [str(Path(base) / "templates")
+                 for base in [getattr(sys, '_MEIPASS', None), Path(__file__).resolve().parent, Path.cwd()] if base]
+DASHBOARD_TEMPLATE = "dashboard.html.j2"
+
+# Figures the go.Figure/pio.to_html builders produced for render_fixture_cube(); --check-render compares against them
+RENDER_GOLDEN_FILE = Path(__file__).resolve().parent / "render_golden.json"
+# Trend point budget the golden file was captured with; the check ignores the configured trend_max_points
+GOLDEN_TREND_MAX_POINTS = 500
+
+# Part of every fragment cache key: bump whenever chart/KPI output changes so stale fragments are never reused
+RENDERER_VERSION = 5
 
 # Professional color scheme
 COLORS = {
@@ -42,22 +95,71 @@ COLORS = {
     'delete': '#EF4444'
 }
 
+# One trend series per date column: (cube column, legend label, color)
+TREND_SERIES = [
+    ('RequestDay', 'Requests Received', COLORS['primary']),
+    ('UpdatedDay', 'Requests Updated', COLORS['accent'])
+]
+
+# Named scales are resolved by plotly.py, not plotly.js, so figure specs carry the explicit scale
+RISK_COLORSCALE = get_colorscale('RdYlGn_r')
+
+# Application table: rows are rendered only for the scrolled-to window (row height in px, rows in view, extra rows either side)
+TABLE_ROW_HEIGHT = 45
+TABLE_VISIBLE_ROWS = 10
+TABLE_OVERSCAN = 5
+
 def safe_print(message):
     """Safely print messages without Unicode issues"""
     safe_message = message.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
     print(safe_message)
 
-def create_executive_kpi_cards(df, sheet_name):
+def to_json_default(value):
+    """json fallback for numpy scalars/arrays and dates (orjson handles these itself)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def dumps_json(value):
+    """Compact JSON for figure specs, with orjson when it is installed"""
+    if orjson is not None:
+        text = orjson.dumps(value, default=to_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    else:
+        text = json.dumps(value, separators=(',', ':'), default=to_json_default)
+    # Keep application names like "</script>" from closing the inline script
+    return text.replace('</', '<\\/')
+
+def figure_html(spec, chart_key=None):
+    """Chart fragment for a plain {'data', 'layout'} spec — one Plotly.newPlot call, no go.Figure validation pass"""
+    div_id = str(uuid.uuid4())
+    # data-chart tells the in-page filters which figure this is so they can recompute it
+    chart_attr = f' data-chart="{chart_key}"' if chart_key else ""
+    height = spec['layout'].get('height')
+    outer_height = f"{height}px" if height else "100%"
+    return (
+        f'<div style="height:{outer_height}; width:100%;">'
+        f'<div id="{div_id}" class="plotly-graph-div"{chart_attr} style="height:100%; width:100%;"></div>'
+        f'<script>esafPlot("{div_id}",{dumps_json(spec["data"])},{dumps_json(spec["layout"])});</script>'
+        f'</div>'
+    )
+
+def plotly_template_spec():
+    """The default Plotly template as plain JSON (None without one), emitted once per page instead of inside every figure"""
+    template = pio.templates[pio.templates.default] if pio.templates.default else None
+    return json.loads(json.dumps(template.to_plotly_json(), cls=PlotlyJSONEncoder)) if template else None
+
+def create_executive_kpi_cards(cube, sheet_name):
     """Create executive-focused KPI cards"""
-    total_requests = len(df)
+    total_requests = int(cube['Count'].sum())
     
     # Request type analysis
-    create_count = len(df[df['Request'].str.contains('Create', na=False)]) if 'Request' in df.columns else 0
-    modify_count = len(df[df['Request'].str.contains('Modify', na=False)]) if 'Request' in df.columns else 0
-    delete_count = len(df[df['Request'].str.contains('Delete', na=False)]) if 'Request' in df.columns else 0
+    type_counts = cube_type_counts(cube)
+    create_count = type_counts['Create']
+    modify_count = type_counts['Modify']
+    delete_count = type_counts['Delete']
     
     # Application diversity
-    unique_apps = df['Application'].nunique() if 'Application' in df.columns else 0
+    unique_apps = cube['Application'].dropna().nunique()
     
     # Calculate percentages
     create_pct = (create_count / total_requests * 100) if total_requests > 0 else 0
@@ -71,7 +173,7 @@ def create_executive_kpi_cards(df, sheet_name):
             <div class="kpi-card total">
                 <div class="kpi-icon">TOTAL</div>
                 <div class="kpi-content">
-                    <div class="kpi-value">{total_requests}</div>
+                    <div class="kpi-value" data-kpi="total">{total_requests}</div>
                     <div class="kpi-label">Total Requests</div>
                     <div class="kpi-trend">All Requests</div>
                 </div>
@@ -79,7 +181,7 @@ def create_executive_kpi_cards(df, sheet_name):
             <div class="kpi-card apps">
                 <div class="kpi-icon">APPS</div>
                 <div class="kpi-content">
-                    <div class="kpi-value">{unique_apps}</div>
+                    <div class="kpi-value" data-kpi="apps">{unique_apps}</div>
                     <div class="kpi-label">Applications</div>
                     <div class="kpi-trend">Across Systems</div>
                 </div>
@@ -87,25 +189,25 @@ def create_executive_kpi_cards(df, sheet_name):
             <div class="kpi-card create">
                 <div class="kpi-icon">CREATE</div>
                 <div class="kpi-content">
-                    <div class="kpi-value">{create_count}</div>
+                    <div class="kpi-value" data-kpi="create">{create_count}</div>
                     <div class="kpi-label">New Access</div>
-                    <div class="kpi-trend">{create_pct:.1f}% of total</div>
+                    <div class="kpi-trend" data-kpi-share="create">{create_pct:.1f}% of total</div>
                 </div>
             </div>
             <div class="kpi-card modify">
                 <div class="kpi-icon">MODIFY</div>
                 <div class="kpi-content">
-                    <div class="kpi-value">{modify_count}</div>
+                    <div class="kpi-value" data-kpi="modify">{modify_count}</div>
                     <div class="kpi-label">Access Changes</div>
-                    <div class="kpi-trend">{modify_pct:.1f}% of total</div>
+                    <div class="kpi-trend" data-kpi-share="modify">{modify_pct:.1f}% of total</div>
                 </div>
             </div>
             <div class="kpi-card delete">
                 <div class="kpi-icon">DELETE</div>
                 <div class="kpi-content">
-                    <div class="kpi-value">{delete_count}</div>
+                    <div class="kpi-value" data-kpi="delete">{delete_count}</div>
                     <div class="kpi-label">Access Removal</div>
-                    <div class="kpi-trend">{delete_pct:.1f}% of total</div>
+                    <div class="kpi-trend" data-kpi-share="delete">{delete_pct:.1f}% of total</div>
                 </div>
             </div>
         </div>
@@ -113,15 +215,25 @@ def create_executive_kpi_cards(df, sheet_name):
     """
     return kpi_html
 
-def create_request_type_donut(df):
+def app_counts(cube):
+    """Requests per application, largest first (same ordering as value_counts on the rows)"""
+    return cube.groupby('Application', sort=False)['Count'].sum().sort_values(ascending=False, kind='stable')
+
+def app_type_counts(cube, apps):
+    """Create/Modify/Delete counts for the given applications, in that order (0 where an app has none)"""
+    type_counts = cube.groupby(['Application', 'RequestType'])['Count'].sum().unstack(fill_value=0)
+    return type_counts.reindex(index=apps, columns=['Create', 'Modify', 'Delete'], fill_value=0).astype(int)
+
+def create_request_type_donut(cube):
     """Create donut chart for request type distribution - clear and executive-friendly"""
-    if 'Request' not in df.columns:
+    if cube['RequestType'].isna().all():
         return None
         
-    create_count = len(df[df['Request'].str.contains('Create', na=False)])
-    modify_count = len(df[df['Request'].str.contains('Modify', na=False)])
-    delete_count = len(df[df['Request'].str.contains('Delete', na=False)])
-    other_count = len(df) - (create_count + modify_count + delete_count)
+    type_counts = cube_type_counts(cube)
+    create_count = type_counts['Create']
+    modify_count = type_counts['Modify']
+    delete_count = type_counts['Delete']
+    other_count = type_counts['Other']
     
     labels = ['Create Access', 'Modify Access', 'Delete Access', 'Other']
     values = [create_count, modify_count, delete_count, other_count]
@@ -131,151 +243,162 @@ def create_request_type_donut(df):
     if sum(values) == 0:
         return None
     
-    fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
-        hole=0.6,
-        marker_colors=colors,
-        textinfo='label+percent',
-        textposition='inside',
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title="Access Request Distribution",
-        title_x=0.5,
-        showlegend=False,
-        margin=dict(t=50, b=20, l=20, r=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12, color=COLORS['dark']),
-        height=400
-    )
-    
-    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+    return {
+        'data': [dict(
+            type='pie',
+            labels=labels,
+            values=values,
+            hole=0.6,
+            marker=dict(colors=colors),
+            textinfo='label+percent',
+            textposition='inside',
+            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+        )],
+        'layout': dict(
+            title=dict(text="Access Request Distribution", x=0.5),
+            showlegend=False,
+            margin=dict(t=50, b=20, l=20, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            height=400
+        )
+    }
 
-def create_top_applications_bar(df):
+def create_top_applications_bar(cube):
     """Create horizontal bar chart for top applications - clear ranking"""
-    if 'Application' not in df.columns:
-        return None
-        
-    app_counts = df['Application'].value_counts().head(10)  # Top 10 applications
+    top_apps = app_counts(cube).head(10)  # Top 10 applications
     
-    if len(app_counts) == 0:
+    if len(top_apps) == 0:
         return None
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        y=app_counts.index,
-        x=app_counts.values,
-        orientation='h',
-        marker_color=COLORS['primary'],
-        text=app_counts.values,
-        textposition='auto',
-        hovertemplate='<b>%{y}</b><br>Requests: %{x}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title="Top 10 Applications by Request Volume",
-        title_x=0.5,
-        margin=dict(t=50, b=20, l=150, r=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12, color=COLORS['dark']),
-        xaxis=dict(title="Number of Requests", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        yaxis=dict(title="", autorange="reversed", tickfont=dict(size=11)),
-        height=max(400, len(app_counts) * 40),
-        showlegend=False
-    )
-    
-    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+    return {
+        'data': [dict(
+            type='bar',
+            y=top_apps.index.tolist(),
+            x=top_apps.values.tolist(),
+            orientation='h',
+            marker=dict(color=COLORS['primary']),
+            text=[str(count) for count in top_apps.values],
+            textposition='auto',
+            hovertemplate='<b>%{y}</b><br>Requests: %{x}<extra></extra>'
+        )],
+        'layout': dict(
+            title=dict(text="Top 10 Applications by Request Volume", x=0.5),
+            margin=dict(t=50, b=20, l=150, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Number of Requests"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            yaxis=dict(title=dict(text=""), autorange="reversed", tickfont=dict(size=11)),
+            height=max(400, len(top_apps) * 40),
+            showlegend=False
+        )
+    }
 
-def create_request_trend_analysis(df):
-    """Create line chart showing request trends over time"""
-    date_columns = ['Request date', 'Last updated time']
-    available_date_cols = [col for col in date_columns if col in df.columns]
-    
-    if not available_date_cols:
-        return None
-        
-    trend_data = []
-    for date_col in available_date_cols:
-        if date_col in df.columns:
-            # Convert to datetime and extract date parts
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            daily_counts = df[date_col].dt.date.value_counts().sort_index()
-            
-            for date, count in daily_counts.items():
-                trend_data.append({
-                    'Date': date,
-                    'Count': count,
-                    'Metric': 'Daily Requests'
-                })
-    
-    if not trend_data:
-        return None
+def lttb_indices(y, threshold):
+    """Largest-triangle-three-buckets over evenly spaced points: indices of at most threshold points keeping the shape"""
+    n = len(y)
+    if threshold < 3 or n <= threshold:
+        return np.arange(n)
+    x = np.arange(n, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    picked = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Keep the point of this bucket spanning the largest triangle with the last kept point and the next bucket's mean
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        picked.append(a)
+    picked.append(n - 1)
+    return np.array(picked)
+
+def daily_series(cube, day_col):
+    """Requests per calendar day (days without requests count as 0); the cube itself is left untouched"""
+    counts = cube.groupby(day_col)['Count'].sum()
+    if counts.empty:
+        return counts
+    counts.index = pd.to_datetime(counts.index)
+    return counts.sort_index().asfreq('D', fill_value=0)
+
+def create_request_trend_analysis(cube, max_points=None):
+    """Create line chart showing request trends over time (max_points per trace, default: the configured trend_max_points)"""
+    max_points = TREND_MAX_POINTS if max_points is None else max_points
+    data = []
+    for day_col, label, color in TREND_SERIES:
+        daily_counts = daily_series(cube, day_col)
+        if daily_counts.empty:
+            continue
+        # 7-day average from the full-resolution series, then each trace is downsampled on its own
+        moving_avg = daily_counts.rolling(window=7, min_periods=1).mean() if len(daily_counts) > 7 else None
+        dates = daily_counts.index.strftime('%Y-%m-%d')
         
-    trend_df = pd.DataFrame(trend_data)
-    
-    # Calculate 7-day moving average for trend line
-    if len(trend_df) > 7:
-        trend_df['Moving_Avg'] = trend_df['Count'].rolling(window=7, min_periods=1).mean()
-    
-    fig = go.Figure()
-    
-    # Actual daily counts
-    fig.add_trace(go.Scatter(
-        x=trend_df['Date'],
-        y=trend_df['Count'],
-        mode='lines+markers',
-        name='Daily Requests',
-        line=dict(color=COLORS['primary'], width=3),
-        marker=dict(size=6),
-        hovertemplate='<b>%{x}</b><br>Requests: %{y}<extra></extra>'
-    ))
-    
-    # Moving average trend line
-    if 'Moving_Avg' in trend_df.columns:
-        fig.add_trace(go.Scatter(
-            x=trend_df['Date'],
-            y=trend_df['Moving_Avg'],
-            mode='lines',
-            name='7-Day Average',
-            line=dict(color=COLORS['accent'], width=2, dash='dash'),
-            hovertemplate='<b>%{x}</b><br>7-Day Avg: %{y:.1f}<extra></extra>'
+        keep = lttb_indices(daily_counts.values, max_points)
+        data.append(dict(
+            type='scattergl',
+            x=dates[keep].tolist(),
+            y=daily_counts.values[keep].tolist(),
+            mode='lines+markers',
+            name=label,
+            legendgroup=day_col,
+            line=dict(color=color, width=3),
+            marker=dict(size=6),
+            hovertemplate=f'<b>%{{x}}</b><br>{label}: %{{y}}<extra></extra>'
         ))
+        
+        if moving_avg is not None:
+            keep = lttb_indices(moving_avg.values, max_points)
+            data.append(dict(
+                type='scattergl',
+                x=dates[keep].tolist(),
+                y=moving_avg.values[keep].tolist(),
+                mode='lines',
+                name=f'{label} (7-Day Avg)',
+                legendgroup=day_col,
+                line=dict(color=color, width=2, dash='dash'),
+                hovertemplate='<b>%{x}</b><br>7-Day Avg: %{y:.1f}<extra></extra>'
+            ))
     
-    fig.update_layout(
-        title="Request Volume Trend Analysis",
-        title_x=0.5,
-        margin=dict(t=50, b=40, l=60, r=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12, color=COLORS['dark']),
-        xaxis=dict(title="Date", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        yaxis=dict(title="Number of Requests", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        height=400,
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-    )
+    if not data:
+        return None
     
-    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+    return {
+        'data': data,
+        'layout': dict(
+            title=dict(text="Request Volume Trend Analysis", x=0.5),
+            margin=dict(t=50, b=40, l=60, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Date"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            yaxis=dict(title=dict(text="Number of Requests"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=400,
+            showlegend=True,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+    }
 
-def create_application_priority_matrix(df):
+def create_application_priority_matrix(cube):
     """Create a priority matrix showing application vs request type impact"""
-    if 'Application' not in df.columns or 'Request' not in df.columns:
+    if cube['Application'].isna().all() or cube['RequestType'].isna().all():
         return None
         
     # Prepare data for priority analysis
+    app_totals = app_counts(cube).head(15)  # Top 15 apps by volume
+    type_counts = app_type_counts(cube, app_totals.index)
     priority_data = []
-    for app in df['Application'].dropna().unique()[:15]:  # Top 15 apps
-        app_df = df[df['Application'] == app]
-        total_requests = len(app_df)
+    for app in app_totals.index:
+        total_requests = int(app_totals[app])
         
-        create_count = len(app_df[app_df['Request'].str.contains('Create', na=False)])
-        modify_count = len(app_df[app_df['Request'].str.contains('Modify', na=False)])
-        delete_count = len(app_df[app_df['Request'].str.contains('Delete', na=False)])
+        create_count = int(type_counts.at[app, 'Create'])
+        modify_count = int(type_counts.at[app, 'Modify'])
+        delete_count = int(type_counts.at[app, 'Delete'])
         
         # Calculate risk score (higher for delete operations)
         risk_score = (create_count * 1 + modify_count * 2 + delete_count * 3) / total_requests if total_requests > 0 else 0
@@ -294,43 +417,39 @@ def create_application_priority_matrix(df):
         
     priority_df = pd.DataFrame(priority_data)
     
-    fig = go.Figure(data=go.Scatter(
-        x=priority_df['Total_Requests'],
-        y=priority_df['Risk_Score'],
-        mode='markers+text',
-        marker=dict(
-            size=priority_df['Total_Requests']/priority_df['Total_Requests'].max() * 50 + 20,
-            color=priority_df['Risk_Score'],
-            colorscale='RdYlGn_r',
-            showscale=True,
-            colorbar=dict(title="Risk Level")
-        ),
-        text=priority_df['Application'],
-        textposition="middle center",
-        hovertemplate='<b>%{text}</b><br>Total Requests: %{x}<br>Risk Score: %{y:.2f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title="Application Priority Matrix (Volume vs Risk)",
-        title_x=0.5,
-        margin=dict(t=50, b=60, l=80, r=40),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12, color=COLORS['dark']),
-        xaxis=dict(title="Total Request Volume", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        yaxis=dict(title="Risk Score (Higher = More Critical)", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        height=500
-    )
-    
-    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+    return {
+        'data': [dict(
+            type='scatter',
+            x=priority_df['Total_Requests'].tolist(),
+            y=priority_df['Risk_Score'].tolist(),
+            mode='markers+text',
+            marker=dict(
+                size=(priority_df['Total_Requests']/priority_df['Total_Requests'].max() * 50 + 20).tolist(),
+                color=priority_df['Risk_Score'].tolist(),
+                colorscale=RISK_COLORSCALE,
+                showscale=True,
+                colorbar=dict(title=dict(text="Risk Level"))
+            ),
+            text=priority_df['Application'].tolist(),
+            textposition="middle center",
+            hovertemplate='<b>%{text}</b><br>Total Requests: %{x}<br>Risk Score: %{y:.2f}<extra></extra>'
+        )],
+        'layout': dict(
+            title=dict(text="Application Priority Matrix (Volume vs Risk)", x=0.5),
+            margin=dict(t=50, b=60, l=80, r=40),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Total Request Volume"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            yaxis=dict(title=dict(text="Risk Score (Higher = More Critical)"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=500
+        )
+    }
 
-def create_workload_distribution_chart(df):
+def create_workload_distribution_chart(cube):
     """Create a chart showing workload distribution patterns"""
-    if 'Application' not in df.columns:
-        return None
-        
     # Calculate workload distribution
-    app_distribution = df['Application'].value_counts().head(8)
+    app_distribution = app_counts(cube).head(8)
     
     if len(app_distribution) == 0:
         return None
@@ -339,187 +458,359 @@ def create_workload_distribution_chart(df):
     total = app_distribution.sum()
     percentages = [(count/total * 100) for count in app_distribution.values]
     
-    fig = go.Figure(data=[
-        go.Bar(
-            x=app_distribution.index,
-            y=app_distribution.values,
+    return {
+        'data': [dict(
+            type='bar',
+            x=app_distribution.index.tolist(),
+            y=app_distribution.values.tolist(),
             text=[f'{p:.1f}%' for p in percentages],
             textposition='auto',
-            marker_color=COLORS['primary'],
+            marker=dict(color=COLORS['primary']),
             hovertemplate='<b>%{x}</b><br>Requests: %{y}<br>Share: %{text}<extra></extra>'
+        )],
+        'layout': dict(
+            title=dict(text="Workload Distribution Across Applications", x=0.5),
+            margin=dict(t=50, b=80, l=60, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Applications"), tickangle=45, showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            yaxis=dict(title=dict(text="Number of Requests"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=400
         )
-    ])
-    
-    fig.update_layout(
-        title="Workload Distribution Across Applications",
-        title_x=0.5,
-        margin=dict(t=50, b=80, l=60, r=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12, color=COLORS['dark']),
-        xaxis=dict(title="Applications", tickangle=45, showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        yaxis=dict(title="Number of Requests", showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
-        height=400
-    )
-    
-    return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+    }
+
+def summary_table_data(cube):
+    """Every application, largest first, as columns (apps/total/create/modify/delete) for the in-page table"""
+    app_totals = app_counts(cube)
+    type_counts = app_type_counts(cube, app_totals.index)
+    return {
+        'apps': [str(app) for app in app_totals.index],
+        'total': app_totals.astype(int).tolist(),
+        'create': type_counts['Create'].tolist(),
+        'modify': type_counts['Modify'].tolist(),
+        'delete': type_counts['Delete'].tolist()
+    }
 
-def create_executive_summary_table(df):
+def summary_table_rows(data, start, stop):
+    """Rows start..stop of the table plus the spacers standing in for the rows outside that window"""
+    spacer = '<tr class="table-spacer"><td colspan="5" style="height: {}px"></td></tr>'
+    rows = [spacer.format(start * TABLE_ROW_HEIGHT)] if start else []
+    for i in range(start, stop):
+        total = data['total'][i]
+        shares = [(data[key][i] / total * 100) if total > 0 else 0 for key in ['create', 'modify', 'delete']]
+        rows.append(f"""<tr class="summary-row">
+                        <td title="{html.escape(data['apps'][i])}"><strong>{html.escape(data['apps'][i])}</strong></td>
+                        <td>{total}</td>
+                        <td style="color: {COLORS['create']}">{shares[0]:.1f}%</td>
+                        <td style="color: {COLORS['modify']}">{shares[1]:.1f}%</td>
+                        <td style="color: {COLORS['delete']}">{shares[2]:.1f}%</td>
+                    </tr>""")
+    remaining = len(data['apps']) - stop
+    if remaining > 0:
+        rows.append(spacer.format(remaining * TABLE_ROW_HEIGHT))
+    return "\n".join(rows)
+
+def create_executive_summary_table(cube):
     """Create a summary table for quick executive insights"""
-    if 'Application' not in df.columns or 'Request' not in df.columns:
+    if cube['Application'].isna().all() or cube['RequestType'].isna().all():
         return None
-        
-    # Calculate key metrics for top applications
-    summary_data = []
-    for app in df['Application'].dropna().unique()[:8]:  # Top 8 apps
-        app_df = df[df['Application'] == app]
-        total = len(app_df)
-        
-        create_pct = (len(app_df[app_df['Request'].str.contains('Create', na=False)]) / total * 100) if total > 0 else 0
-        modify_pct = (len(app_df[app_df['Request'].str.contains('Modify', na=False)]) / total * 100) if total > 0 else 0
-        delete_pct = (len(app_df[app_df['Request'].str.contains('Delete', na=False)]) / total * 100) if total > 0 else 0
-        
-        summary_data.append({
-            'Application': app,
-            'Total_Requests': total,
-            'Create_Pct': create_pct,
-            'Modify_Pct': modify_pct,
-            'Delete_Pct': delete_pct
-        })
-    
-    if not summary_data:
+
+    # All applications go into the page as compact columns; only the rows in view are ever in the DOM
+    data = summary_table_data(cube)
+    if not data['apps']:
         return None
-        
-    # Create HTML table
-    table_html = """
+    count = len(data['apps'])
+    first_rows = summary_table_rows(data, 0, min(count, TABLE_VISIBLE_ROWS + TABLE_OVERSCAN))
+
+    return f"""
     <div class="summary-table-section">
         <h3 class="section-title">Application Performance Summary</h3>
-        <div class="table-container">
+        <div class="table-toolbar">
+            <input type="search" class="table-search" placeholder="Search applications..." aria-label="Search applications">
+            <span class="table-count">{count} applications</span>
+        </div>
+        <div class="table-container table-viewport" style="max-height: {TABLE_VISIBLE_ROWS * TABLE_ROW_HEIGHT + 50}px">
             <table class="executive-table">
                 <thead>
                     <tr>
-                        <th>Application</th>
-                        <th>Total Requests</th>
-                        <th>Create %</th>
-                        <th>Modify %</th>
-                        <th>Delete %</th>
+                        <th data-sort="app">Application</th>
+                        <th data-sort="total" aria-sort="descending">Total Requests</th>
+                        <th data-sort="create">Create %</th>
+                        <th data-sort="modify">Modify %</th>
+                        <th data-sort="delete">Delete %</th>
                     </tr>
                 </thead>
-                <tbody>
-    """
-    
-    for item in summary_data:
-        table_html += f"""
-                    <tr>
-                        <td><strong>{html.escape(str(item['Application']))}</strong></td>
-                        <td>{item['Total_Requests']}</td>
-                        <td style="color: {COLORS['create']}">{item['Create_Pct']:.1f}%</td>
-                        <td style="color: {COLORS['modify']}">{item['Modify_Pct']:.1f}%</td>
-                        <td style="color: {COLORS['delete']}">{item['Delete_Pct']:.1f}%</td>
-                    </tr>
-        """
-    
-    table_html += """
+                <tbody class="summary-rows">
+                    {first_rows}
                 </tbody>
             </table>
         </div>
+        <script type="application/json" class="summary-data">{dumps_json(data)}</script>
     </div>
     """
+
+def history_totals(store, period):
+    """New placements (summed over the period) and backlog (as of its latest run) per period, indexed by its first day"""
+    placed = timeseries.rollup_frame(store, period, placed=True)
+    levels = timeseries.rollup_frame(store, period)
+    periods = sorted(set(placed['Period']) | set(levels['Period']))
+    if not periods:
+        return pd.DataFrame(columns=['Placed', 'Backlog'])
+    # Backlog is a level, so a week or month shows its last recorded day rather than a sum of days
+    backlog = levels[levels['Assignee'] == timeseries.BACKLOG]
+    totals = pd.DataFrame({
+        'Placed': placed.groupby('Period')['Count'].sum(),
+        'Backlog': backlog.groupby('Period')['Count'].sum()
+    }).reindex(periods).fillna(0).astype(int)
+    totals.index = [timeseries.period_start(key, period).isoformat() for key in totals.index]
+    return totals
+
+def create_history_kpi_cards(day_totals):
+    """KPI cards for the tracked history"""
+    days = len(day_totals)
+    avg_placed = day_totals['Placed'].mean() if days else 0
+    latest_backlog = int(day_totals['Backlog'].iloc[-1]) if days else 0
     
-    return table_html
-
-def create_interactive_filters():
-    """Create HTML for interactive filter controls"""
-    return """
-    <div class="filter-section">
-        <h3 class="section-title">Data Analysis Controls</h3>
-        <div class="filter-grid">
-            <div class="filter-group">
-                <label for="timeFrameFilter">Time Frame:</label>
-                <select id="timeFrameFilter">
-                    <option value="7d">Last 7 Days</option>
-                    <option value="30d" selected>Last 30 Days</option>
-                    <option value="90d">Last 90 Days</option>
-                    <option value="all">All Time</option>
-                </select>
-            </div>
-            <div class="filter-group">
-                <label for="requestTypeFilter">Request Type:</label>
-                <select id="requestTypeFilter">
-                    <option value="all" selected>All Types</option>
-                    <option value="Create">Create Only</option>
-                    <option value="Modify">Modify Only</option>
-                    <option value="Delete">Delete Only</option>
-                </select>
+    return f"""
+    <div class="kpi-section">
+        <h3 class="section-title">Assignment History</h3>
+        <div class="kpi-grid">
+            <div class="kpi-card total">
+                <div class="kpi-icon">DAYS</div>
+                <div class="kpi-content">
+                    <div class="kpi-value">{days}</div>
+                    <div class="kpi-label">Days Tracked</div>
+                    <div class="kpi-trend">Since {html.escape(day_totals.index[0]) if days else '-'}</div>
+                </div>
             </div>
-            <div class="filter-group">
-                <label for="applicationFilter">Application:</label>
-                <select id="applicationFilter">
-                    <option value="all" selected>All Applications</option>
-                </select>
+            <div class="kpi-card apps">
+                <div class="kpi-icon">THROUGHPUT</div>
+                <div class="kpi-content">
+                    <div class="kpi-value">{avg_placed:.1f}</div>
+                    <div class="kpi-label">Newly Assigned per Day</div>
+                    <div class="kpi-trend">Average over tracked days</div>
+                </div>
             </div>
-            <div class="filter-group">
-                <button onclick="applyExecutiveFilters()" class="filter-btn">Apply Analysis</button>
-                
+            <div class="kpi-card delete">
+                <div class="kpi-icon">BACKLOG</div>
+                <div class="kpi-content">
+                    <div class="kpi-value">{latest_backlog}</div>
+                    <div class="kpi-label">Left Unassigned</div>
+                    <div class="kpi-trend">Latest run</div>
+                </div>
             </div>
         </div>
     </div>
     """
 
-def generate_executive_charts(df, sheet_name):
-    """Generate all executive-focused charts for a sheet"""
+def create_history_trend(period_totals):
+    """New placements vs backlog over time with Daily / Weekly / Monthly views of the rollups"""
+    labels = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}
+    data = []
+    for period in timeseries.PERIODS:
+        totals = period_totals[period]
+        for column, name, color in [('Placed', 'Newly Assigned', COLORS['primary']), ('Backlog', 'Backlog', COLORS['danger'])]:
+            keep = lttb_indices(totals[column].values, TREND_MAX_POINTS)
+            data.append(dict(
+                type='scattergl',
+                x=[totals.index[i] for i in keep],
+                y=totals[column].values[keep].tolist(),
+                mode='lines+markers',
+                name=name,
+                visible=period == 'day',
+                line=dict(color=color, width=3),
+                marker=dict(size=6),
+                hovertemplate=f'<b>{labels[period]} from %{{x}}</b><br>{name}: %{{y}}<extra></extra>'
+            ))
+    
+    buttons = [
+        dict(label=labels[period], method='update',
+             args=[{'visible': [p == period for p in timeseries.PERIODS for _ in range(2)]}])
+        for period in timeseries.PERIODS
+    ]
+    return {
+        'data': data,
+        'layout': dict(
+            title=dict(text="Newly Assigned vs Backlog", x=0.5),
+            margin=dict(t=80, b=40, l=60, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Date"), type='date', showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            yaxis=dict(title=dict(text="Number of Requests"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=400,
+            showlegend=True,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            updatemenus=[dict(type='buttons', direction='left', showactive=True,
+                              x=0, xanchor='left', y=1.18, yanchor='top', buttons=buttons)]
+        )
+    }
+
+def create_history_throughput(store, weeks=12):
+    """Requests newly placed with each assignee per week (most recent weeks); carried-over assignments are not recounted"""
+    frame = timeseries.rollup_frame(store, 'week', placed=True)
+    if frame.empty:
+        return None
+    by_assignee = frame.pivot_table(index='Period', columns='Assignee', values='Count', aggfunc='sum', fill_value=0)
+    by_assignee = by_assignee.sort_index().tail(weeks)
+    
+    return {
+        'data': [dict(
+            type='bar',
+            x=by_assignee.index.tolist(),
+            y=by_assignee[assignee].tolist(),
+            name=str(assignee),
+            hovertemplate=f'<b>%{{x}}</b><br>{html.escape(str(assignee))}: %{{y}}<extra></extra>'
+        ) for assignee in by_assignee.columns],
+        'layout': dict(
+            title=dict(text="Weekly Throughput by Assignee", x=0.5),
+            barmode='stack',
+            margin=dict(t=50, b=60, l=60, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="ISO Week"), type='category'),
+            yaxis=dict(title=dict(text="Requests Newly Assigned"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=400
+        )
+    }
+
+def create_history_request_mix(store, months=12):
+    """Requests newly assigned per month split by request type (most recent months)"""
+    frame = timeseries.rollup_frame(store, 'month', placed=True)
+    if frame.empty:
+        return None
+    by_type = frame.pivot_table(index='Period', columns='RequestType', values='Count', aggfunc='sum', fill_value=0)
+    by_type = by_type.reindex(columns=REQUEST_TYPES, fill_value=0).sort_index().tail(months)
+    colors = {'Create': COLORS['create'], 'Modify': COLORS['modify'], 'Delete': COLORS['delete'], 'Other': COLORS['warning']}
+    
+    return {
+        'data': [dict(
+            type='bar',
+            x=by_type.index.tolist(),
+            y=by_type[kind].tolist(),
+            name=kind,
+            marker=dict(color=colors[kind]),
+            hovertemplate=f'<b>%{{x}}</b><br>{kind}: %{{y}}<extra></extra>'
+        ) for kind in REQUEST_TYPES],
+        'layout': dict(
+            title=dict(text="Monthly Request Mix", x=0.5),
+            barmode='stack',
+            margin=dict(t=50, b=60, l=60, r=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12, color=COLORS['dark']),
+            xaxis=dict(title=dict(text="Month"), type='category'),
+            yaxis=dict(title=dict(text="Number of Requests"), showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+            height=400
+        )
+    }
+
+def generate_history_section(store):
+    """Dashboard section plotted from the time-series rollups (no workbook reads), or None before the first run"""
+    if not store['day']:
+        return None
+    period_totals = {period: history_totals(store, period) for period in timeseries.PERIODS}
+    charts = []
+    for title, spec, css_class in [
+        ('Newly Assigned vs Backlog History', create_history_trend(period_totals), 'chart-full'),
+        ('Weekly Throughput by Assignee', create_history_throughput(store), 'chart-half'),
+        ('Monthly Request Mix', create_history_request_mix(store), 'chart-half'),
+    ]:
+        if spec:
+            charts.append({'title': title, 'div': figure_html(spec), 'figure': spec, 'class': css_class})
+    return {
+        'name': 'History',
+        'kpi_html': create_history_kpi_cards(period_totals['day']),
+        'charts': charts,
+        'rows': len(store['day'])
+    }
+
+def client_filter_config():
+    """Settings the in-page filter script (templates/filters.js) shares with the chart builders"""
+    return {
+        'trendMaxPoints': TREND_MAX_POINTS,
+        'table': {'rowHeight': TABLE_ROW_HEIGHT, 'visibleRows': TABLE_VISIBLE_ROWS, 'overscan': TABLE_OVERSCAN},
+        'typeColors': {'Create': COLORS['create'], 'Modify': COLORS['modify'], 'Delete': COLORS['delete']}
+    }
+
+def columnar_cube(cube):
+    """Cube rows for the in-page filters: each column dictionary-encoded as integer codes (-1 = missing)"""
+    payload = {}
+    for column, key in [('Application', 'app'), ('RequestType', 'type'), ('Assignee', 'assignee')]:
+        # First-appearance order, so "first N applications" match the charts rendered here
+        codes, uniques = pd.factorize(cube[column].astype(object))
+        payload[key] = codes.tolist()
+        payload[key + 's'] = [str(value) for value in uniques]
+    # One sorted day dictionary for both date columns: code order is date order, so date filters compare integers
+    days = sorted(set(cube['RequestDay'].dropna()) | set(cube['UpdatedDay'].dropna()))
+    day_codes = {day: code for code, day in enumerate(days)}
+    payload['days'] = days
+    payload['requestDay'] = [day_codes.get(day, -1) for day in cube['RequestDay']]
+    payload['updatedDay'] = [day_codes.get(day, -1) for day in cube['UpdatedDay']]
+    payload['count'] = cube['Count'].astype(int).tolist()
+    return payload
+
+def generate_executive_charts(cube, sheet_name):
+    """Generate all executive-focused charts for a sheet from its aggregate cube"""
     charts = []
     
     # KPI Cards
-    kpi_html = create_executive_kpi_cards(df, sheet_name)
+    kpi_html = create_executive_kpi_cards(cube, sheet_name)
     
     # Donut Chart for Request Types
-    donut_html = create_request_type_donut(df)
-    if donut_html:
+    donut_fig = create_request_type_donut(cube)
+    if donut_fig:
         charts.append({
             'title': 'Access Request Distribution',
-            'div': donut_html,
+            'div': figure_html(donut_fig, 'donut'),
+            'figure': donut_fig,
             'class': 'chart-half'
         })
     
     # Top Applications Bar Chart
-    top_apps_html = create_top_applications_bar(df)
-    if top_apps_html:
+    top_apps_fig = create_top_applications_bar(cube)
+    if top_apps_fig:
         charts.append({
             'title': 'Top Applications by Volume',
-            'div': top_apps_html,
+            'div': figure_html(top_apps_fig, 'top_apps'),
+            'figure': top_apps_fig,
             'class': 'chart-half'
         })
     
     # Trend Analysis
-    trend_html = create_request_trend_analysis(df)
-    if trend_html:
+    trend_fig = create_request_trend_analysis(cube)
+    if trend_fig:
         charts.append({
             'title': 'Request Volume Trends',
-            'div': trend_html,
+            'div': figure_html(trend_fig, 'trend'),
+            'figure': trend_fig,
             'class': 'chart-full'
         })
     
     # Priority Matrix
-    priority_html = create_application_priority_matrix(df)
-    if priority_html:
+    priority_fig = create_application_priority_matrix(cube)
+    if priority_fig:
         charts.append({
             'title': 'Application Priority Matrix',
-            'div': priority_html,
+            'div': figure_html(priority_fig, 'priority'),
+            'figure': priority_fig,
             'class': 'chart-half'
         })
     
     # Workload Distribution
-    workload_html = create_workload_distribution_chart(df)
-    if workload_html:
+    workload_fig = create_workload_distribution_chart(cube)
+    if workload_fig:
         charts.append({
             'title': 'Workload Distribution',
-            'div': workload_html,
+            'div': figure_html(workload_fig, 'workload'),
+            'figure': workload_fig,
             'class': 'chart-half'
         })
     
     # Executive Summary Table
-    table_html = create_executive_summary_table(df)
+    table_html = create_executive_summary_table(cube)
     if table_html:
         charts.append({
             'title': '',
@@ -529,482 +820,258 @@ def generate_executive_charts(df, sheet_name):
     
     return kpi_html, charts
 
-def build_executive_dashboard(sheet_results, page_title):
-    """Build the complete executive dashboard HTML"""
-    
-    css = """
-    * {
-        margin: 0;
-        padding: 0;
-        box-sizing: border-box;
-    }
-
-    body {
-        font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, sans-serif;
-        background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-        color: #1e293b;
-        min-height: 100vh;
-        padding: 20px;
-        line-height: 1.6;
-    }
-
-    .container {
-        max-width: 1800px;
-        margin: 0 auto;
-    }
-
-    .header {
-        background: white;
-        border-radius: 16px;
-        padding: 30px;
-        margin-bottom: 25px;
-        text-align: center;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e2e8f0;
-    }
-
-    .header h1 {
-        font-weight: 700;
-        font-size: 2.2rem;
-        color: #1E3A5F;
-        margin-bottom: 8px;
-    }
-
-    .header p {
-        color: #64748b;
-        font-size: 1.1rem;
-        font-weight: 500;
-    }
-
-    .header .subtitle {
-        color: #94a3b8;
-        font-size: 0.9rem;
-        margin-top: 8px;
-    }
-
-    .filter-section {
-        background: white;
-        border-radius: 16px;
-        padding: 25px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e2e8f0;
-    }
-
-    .section-title {
-        font-size: 1.3rem;
-        font-weight: 700;
-        color: #1E3A5F;
-        margin-bottom: 20px;
-        border-bottom: 2px solid #e2e8f0;
-        padding-bottom: 10px;
-    }
-
-    .filter-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 20px;
-        align-items: end;
-    }
-
-    .filter-group {
-        display: flex;
-        flex-direction: column;
-        gap: 8px;
-    }
-
-    .filter-group label {
-        font-weight: 600;
-        color: #374151;
-        font-size: 0.9rem;
-    }
-
-    .filter-group select {
-        padding: 12px;
-        border: 2px solid #e2e8f0;
-        border-radius: 10px;
-        font-size: 14px;
-        transition: all 0.3s ease;
-        background: white;
-    }
-
-    .filter-group select:focus {
-        outline: none;
-        border-color: #3B82F6;
-        box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
-    }
-
-    .filter-btn {
-        padding: 12px 24px;
-        background: linear-gradient(135deg, #2E5984, #1E3A5F);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        margin-right: 10px;
-    }
-
-   
-
-    .filter-btn:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15);
-    }
-
-    .sheet-section {
-        background: white;
-        border-radius: 16px;
-        padding: 25px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e2e8f0;
-    }
-
-    .kpi-section {
-        margin-bottom: 25px;
-    }
-
-    .kpi-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-        gap: 20px;
-        margin-top: 15px;
-    }
-
-    .kpi-card {
-        background: linear-gradient(135deg, #ffffff, #f8fafc);
-        border-radius: 12px;
-        padding: 20px;
-        box-shadow: 0 2px 12px rgba(0, 0, 0, 0.06);
-        border-left: 4px solid #cbd5e1;
-        transition: all 0.3s ease;
-    }
-
-    .kpi-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 20px rgba(0, 0, 0, 0.1);
-    }
-
-    .kpi-card.total { border-left-color: #2E5984; }
-    .kpi-card.apps { border-left-color: #FF6B35; }
-    .kpi-card.create { border-left-color: #10B981; }
-    .kpi-card.modify { border-left-color: #3B82F6; }
-    .kpi-card.delete { border-left-color: #EF4444; }
-
-    .kpi-icon {
-        font-size: 0.9rem;
-        font-weight: 700;
-        color: #64748b;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        margin-bottom: 8px;
-    }
-
-    .kpi-value {
-        font-size: 2rem;
-        font-weight: 800;
-        color: #1E3A5F;
-        line-height: 1;
-        margin-bottom: 4px;
-    }
-
-    .kpi-label {
-        font-size: 0.85rem;
-        color: #64748b;
-        font-weight: 600;
-        margin-bottom: 4px;
-    }
-
-    .kpi-trend {
-        font-size: 0.75rem;
-        color: #94a3b8;
-        font-weight: 500;
-    }
-
-    .chart-grid {
-        display: grid;
-        gap: 25px;
-        margin-top: 20px;
-    }
-
-    .chart-full {
-        grid-column: 1 / -1;
-    }
-
-    .chart-half {
-        grid-column: span 1;
-    }
-
-    .table-full {
-        grid-column: 1 / -1;
-    }
-
-    .chart-card {
-        background: white;
-        border-radius: 12px;
-        padding: 20px;
-        box-shadow: 0 2px 12px rgba(0, 0, 0, 0.06);
-        border: 1px solid #f1f5f9;
-    }
-
-    .chart-card h3 {
-        font-size: 1.1rem;
-        font-weight: 700;
-        color: #1E3A5F;
-        margin-bottom: 15px;
-    }
-
-    .plotly-graph {
-        width: 100%;
-        height: 100%;
-        border-radius: 8px;
-    }
-
-    .summary-table-section {
-        margin-top: 10px;
-    }
-
-    .table-container {
-        overflow-x: auto;
-        border-radius: 8px;
-        border: 1px solid #e2e8f0;
-    }
-
-    .executive-table {
-        width: 100%;
-        border-collapse: collapse;
-        font-size: 0.9rem;
-    }
-
-    .executive-table th {
-        background: #2E5984;
-        color: white;
-        padding: 12px 15px;
-        text-align: left;
-        font-weight: 600;
-        border: none;
-    }
-
-    .executive-table td {
-        padding: 12px 15px;
-        border-bottom: 1px solid #e2e8f0;
-    }
-
-    .executive-table tr:hover {
-        background: #f8fafc;
-    }
-
-    .executive-table tr:last-child td {
-        border-bottom: none;
-    }
-
-    footer {
-        text-align: center;
-        color: #64748b;
-        padding: 30px;
-        margin-top: 40px;
-        font-size: 0.85rem;
-        border-top: 1px solid #e2e8f0;
-    }
-
-    @media (min-width: 1200px) {
-        .chart-grid {
-            grid-template-columns: repeat(2, 1fr);
-        }
+def plotlyjs_file_name():
+    return f"plotly-{get_plotlyjs_version()}.min.js"
+
+def plotlyjs_script(mode, out_file):
+    """One <script> for plotly.js, pinned to the version bundled with the installed plotly package"""
+    version = get_plotlyjs_version()
+    if mode == "cdn":
+        return f'<script src="https://cdn.plot.ly/plotly-{version}.min.js" charset="utf-8"></script>'
+    if mode == "local":
+        # Versioned file name doubles as the cache key: written once, reused by every later dashboard
+        file_name = plotlyjs_file_name()
+        local_path = Path(out_file).parent / file_name
+        if not local_path.exists():
+            local_path.write_text(get_plotlyjs(), encoding='utf-8')
+            safe_print(f"[INFO] Cached plotly.js {version} at {local_path.resolve()}")
+        return f'<script src="{file_name}" charset="utf-8"></script>'
+    return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+_template_env = None
+
+def template_env():
+    """Jinja environment for the page, created once per process; compiled templates are kept as bytecode in CACHE_DIR"""
+    global _template_env
+    if _template_env is None:
+        bytecode_cache = None
+        try:
+            bytecode_dir = Path(CACHE_DIR) / "templates"
+            bytecode_dir.mkdir(parents=True, exist_ok=True)
+            # Bytecode is keyed on template source only, so environment changes must bump RENDERER_VERSION
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir), f"__jinja2_%s.v{RENDERER_VERSION}.cache")
+        except OSError as e:
+            safe_print(f"[WARNING] Template bytecode cache unavailable, compiling templates in memory: {e}")
+        _template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIRS), bytecode_cache=bytecode_cache,
+                                    trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+        _template_env.filters['json'] = dumps_json
+    return _template_env
+
+def dashboard_context(sheet_results, page_title, plotlyjs_html=None, reload=None):
+    return {
+        'title': page_title,
+        'plotlyjs_html': plotlyjs_html or plotlyjs_script("cdn", "."),
+        'plotly_template': plotly_template_spec(),
+        'sheets': sheet_results,
+        'chart_config': client_filter_config(),
+        'reload': reload
     }
 
-    @media (max-width: 768px) {
-        .header h1 { font-size: 1.8rem; }
-        .kpi-grid { grid-template-columns: 1fr; }
-        .filter-grid { grid-template-columns: 1fr; }
-        .chart-grid { grid-template-columns: 1fr; }
-        .sheet-section { padding: 20px; }
+def section_html(sheet_data, index):
+    """One sheet section exactly as the page renders it (sheet_section.html.j2), for pages that fetch sections on demand"""
+    if not (sheet_data and (sheet_data.get('kpi_html') or sheet_data.get('charts'))):
+        return ""
+    return str(template_env().get_template("sheet_section.html.j2").module.sheet_section(sheet_data, index))
+
+def build_executive_dashboard(sheet_results, page_title, plotlyjs_html=None, reload=None):
+    """Build the complete executive dashboard HTML (reload: reload_config() for served pages)"""
+    template = template_env().get_template(DASHBOARD_TEMPLATE)
+    return template.render(dashboard_context(sheet_results, page_title, plotlyjs_html, reload))
+
+def write_executive_dashboard(out_file, sheet_results, page_title, plotlyjs_html=None):
+    """Stream the page into out_file as the template renders, without holding the whole page in memory"""
+    template = template_env().get_template(DASHBOARD_TEMPLATE)
+    # Unbuffered on purpose: the file object already batches writes, template-level buffering only re-joins chunks
+    stream = template.stream(dashboard_context(sheet_results, page_title, plotlyjs_html))
+    tmp_path = Path(f"{out_file}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        stream.dump(f)
+    os.replace(tmp_path, out_file)
+
+def plain_json(value):
+    return json.loads(json.dumps(value, cls=PlotlyJSONEncoder))
+
+def check_render(sheet_results):
+    """Run every figure spec through go.Figure validation and list the ones Plotly would render differently"""
+    # Only this check needs graph_objects, so normal runs never load it
+    import plotly.graph_objects as go
+    problems = []
+    checked = 0
+    for sheet_data in sheet_results:
+        for chart in sheet_data['charts']:
+            spec = chart.get('figure')
+            if spec is None:
+                continue
+            checked += 1
+            label = f"{sheet_data['name']} / {chart['title']}"
+            try:
+                validated = go.Figure(spec).to_plotly_json()
+            except Exception as e:
+                problems.append(f"{label}: {e}")
+                continue
+            validated['layout'].pop('template', None)
+            if plain_json(validated) != plain_json(spec):
+                problems.append(f"{label}: spec differs from the validated figure")
+    return checked, problems
+
+def render_fixture_cube():
+    """Fixed synthetic cube (seeded, fixed dates) the golden figures were captured from"""
+    rng = np.random.default_rng(39)
+    days = pd.date_range("2026-01-01", periods=90, freq='D')
+    rows = 600
+    return build_cube(pd.DataFrame({
+        'Application': rng.choice([f"Application {i:02d}" for i in range(20)], rows),
+        'Request': rng.choice(['Create account', 'Modify access', 'Delete user', 'Reset password'], rows, p=[0.5, 0.3, 0.15, 0.05]),
+        'Request date': rng.choice(days, rows),
+        'Last updated time': rng.choice(days, rows),
+        'Assignee': rng.choice([f"Assignee {i}" for i in range(6)], rows)
+    }))
+
+def golden_figures(cube):
+    """{chart key: spec} for every figure builder the golden file covers"""
+    return {
+        'donut': create_request_type_donut(cube),
+        'top_apps': create_top_applications_bar(cube),
+        'trend': create_request_trend_analysis(cube, max_points=GOLDEN_TREND_MAX_POINTS),
+        'priority': create_application_priority_matrix(cube),
+        'workload': create_workload_distribution_chart(cube)
     }
 
-    @media (max-width: 480px) {
-        body { padding: 15px; }
-        .header { padding: 20px; }
-        .kpi-card { padding: 15px; }
-        .kpi-value { font-size: 1.6rem; }
-    }
-    """
+def comparable_figure(value, key=None):
+    """Figure JSON with base64 typed arrays decoded, floats rounded and text labels as displayed, so equal charts compare equal"""
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+            return comparable_figure(array.tolist(), key)
+        return {name: comparable_figure(item, name) for name, item in value.items()}
+    if isinstance(value, list):
+        return [comparable_figure(item, key) for item in value]
+    if isinstance(value, float):
+        value = round(value, 9)
+        value = int(value) if value.is_integer() else value
+    # Plotly.js prints numeric text labels the same as their string form
+    return str(value) if key == 'text' and isinstance(value, (int, float)) else value
+
+def check_golden(path=RENDER_GOLDEN_FILE):
+    """Charts whose spec for render_fixture_cube() differs from the golden go.Figure output: (checked, problems)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+    except OSError:
+        # Only the source tree carries the golden file; the .exe skips this part of the check
+        safe_print(f"[WARNING] Golden figures not found ({path}) - skipping the golden comparison")
+        return 0, []
+    problems = []
+    specs = golden_figures(render_fixture_cube())
+    for key, expected in golden.items():
+        spec = specs.get(key)
+        if spec is None:
+            problems.append(f"golden / {key}: no figure built")
+        elif comparable_figure(plain_json(spec)) != comparable_figure(expected):
+            problems.append(f"golden / {key}: spec differs from the go.Figure builder output")
+    return len(golden), problems
+
+def render_settings():
+    """Config values the sheet charts depend on - add any new one here so changing it re-renders cached sheets"""
+    return {'trend_max_points': TREND_MAX_POINTS}
+
+def fragment_key(sheet, cube):
+    """Hash of the sheet name, its aggregate cube (every column the charts read), the render settings and the renderer version"""
+    settings = json.dumps(render_settings(), sort_keys=True)
+    digest = hashlib.sha256(f"{RENDERER_VERSION}|{settings}|{sheet}|".encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(cube, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def load_fragments(cache_dir, key):
+    """Cached sheet result for key, or None — a hit is touched so eviction stays least-recently-used"""
+    path = Path(cache_dir) / f"{key}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        os.utime(path)
+        return result
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        safe_print(f"[WARNING] Ignoring unreadable dashboard cache entry '{path}': {e}")
+        return None
 
-    js = """
-         <script>
-    // Executive Filter Functions
-    function applyExecutiveFilters() {
-        const timeFrame = document.getElementById('timeFrameFilter').value;
-        const requestType = document.getElementById('requestTypeFilter').value;
-        const application = document.getElementById('applicationFilter').value;
-        
-        // Show analysis summary
-        alert('Analysis Parameters Applied:\\n' +
-              'Time Frame: ' + document.getElementById('timeFrameFilter').options[document.getElementById('timeFrameFilter').selectedIndex].text + '\\n' +
-              'Request Type: ' + document.getElementById('requestTypeFilter').options[document.getElementById('requestTypeFilter').selectedIndex].text + '\\n' +
-              'Application: ' + document.getElementById('applicationFilter').options[document.getElementById('applicationFilter').selectedIndex].text);
-        
-        console.log('Executive Filters:', { timeFrame, requestType, application });
-    }
-    
-    function exportExecutiveReport() {
-        // Simulate report export
-        alert('Executive Report exported successfully!\\nThe report has been saved in your downloads folder.');
-        console.log('Exporting executive report...');
-    }
+def save_fragments(cache_dir, key, result):
+    path = Path(cache_dir) / f"{key}.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, separators=(',', ':'), default=to_json_default)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        safe_print(f"[WARNING] Could not cache dashboard fragments for '{result['name']}': {e}")
 
-    // Real-time executive dashboard updates
-    function updateExecutiveDashboard() {
-        const now = new Date();
-        const timeElement = document.getElementById('currentTime');
-        if (timeElement) {
-            timeElement.textContent = 
-                now.toLocaleString('en-US', { 
-                    weekday: 'long',
-                    year: 'numeric',
-                    month: 'long',
-                    day: 'numeric',
-                    hour: '2-digit',
-                    minute: '2-digit'
-                });
-        }
+def prune_fragment_cache(cache_dir, max_entries):
+    """Drop the least recently used cache entries beyond max_entries"""
+    try:
+        entries = sorted(Path(cache_dir).glob("*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for path in entries[max_entries:]:
+            path.unlink()
+    except Exception as e:
+        safe_print(f"[WARNING] Could not prune dashboard cache: {e}")
+
+def render_sheet(excel_path, sheet, cube=None, cache_dir=None):
+    """Aggregate one sheet (unless its cube is given) and build its KPI/chart fragments"""
+    # One aggregation pass per sheet (none at all when Step 3's sidecar covers it)
+    if cube is None:
+        cube = build_cube(pd.read_excel(excel_path, sheet_name=sheet))
+    key = fragment_key(sheet, cube) if cache_dir else None
+    if key:
+        cached = load_fragments(cache_dir, key)
+        if cached is not None:
+            cached['cached'] = True
+            return cached
+    kpi_html, charts = generate_executive_charts(cube, sheet)
+    result = {
+        'name': sheet,
+        'kpi_html': kpi_html,
+        'charts': charts,
+        'rows': int(cube['Count'].sum()),
+        'data': columnar_cube(cube)
     }
-    
-    // Add executive dashboard enhancements
-    document.addEventListener('DOMContentLoaded', function() {
-        // Smooth loading animations
-        const elements = document.querySelectorAll('.chart-card, .kpi-card');
-        elements.forEach((element, index) => {
-            element.style.opacity = '0';
-            element.style.transform = 'translateY(20px)';
-            setTimeout(() => {
-                element.style.transition = 'all 0.5s ease';
-                element.style.opacity = '1';
-                element.style.transform = 'translateY(0)';
-            }, index * 100);
-        });
-        
-        // Add executive tooltips
-        const kpiCards = document.querySelectorAll('.kpi-card');
-        kpiCards.forEach(card => {
-            card.addEventListener('click', function() {
-                const type = this.classList[1];
-                const insights = {
-                    'total': 'Total number of access requests across all applications',
-                    'apps': 'Number of unique applications with pending requests',
-                    'create': 'New access provisioning requests',
-                    'modify': 'Access modification and update requests',
-                    'delete': 'Access removal and deprovisioning requests'
-                };
-                alert('Executive Insight: ' + (insights[type] || 'Key performance indicator'));
-            });
-        });
-
-        // Initialize and start the clock
-        updateExecutiveDashboard();
-        setInterval(updateExecutiveDashboard, 60000); // Update every minute
-    });
-    </script>
-    """
-
-    head = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{html.escape(page_title)}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <style>{css}</style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{html.escape(page_title)}</h1>
-            <p>Executive Intelligence Platform - Access Request Analytics</p>
-            <p class="subtitle">Last Updated: <span id="currentTime"></span></p>
-        </div>
-        
-        {create_interactive_filters()}
-"""
-
-    body = ""
-    for i, sheet_data in enumerate(sheet_results):
-        sheet_name = sheet_data['name']
-        kpi_html = sheet_data['kpi_html']
-        charts = sheet_data['charts']
-        
-        if not kpi_html and not charts:
-            continue
-
-        body += f"""
-        <div class="sheet-section" id="sheet-{i}">
-            {kpi_html if kpi_html else ''}
-        """
-
-        if charts:
-            # Organize charts by type
-            half_charts = [c for c in charts if c.get('class') == 'chart-half']
-            full_charts = [c for c in charts if c.get('class') == 'chart-full']
-            table_charts = [c for c in charts if c.get('class') == 'table-full']
-            
-            # Display half charts in grid
-            if half_charts:
-                body += '<div class="chart-grid">'
-                for chart in half_charts:
-                    if chart['title']:  # Only add title if it exists
-                        body += f"""
-                        <div class="chart-card">
-                            <h3>{chart['title']}</h3>
-                            <div class="plotly-graph">
-                                {chart['div']}
-                            </div>
-                        </div>
-                        """
-                    else:
-                        body += f"""
-                        <div class="chart-card">
-                            <div class="plotly-graph">
-                                {chart['div']}
-                            </div>
-                        </div>
-                        """
-                body += '</div>'
-            
-            # Display full charts
-            if full_charts:
-                for chart in full_charts:
-                    body += f"""
-                    <div class="chart-card">
-                        <h3>{chart['title']}</h3>
-                        <div class="plotly-graph">
-                            {chart['div']}
-                        </div>
-                    </div>
-                    """
-            
-            # Display tables
-            if table_charts:
-                for chart in table_charts:
-                    body += chart['div']
-
-        body += "</div>"
-
-    footer = f"""
-        <footer>
-            <p><strong>ESAF Executive Dashboard v3.0</strong> - Strategic Access Management Analytics</p>
-            <p>HCA Healthcare Confidential - For Executive Review Only</p>
-        </footer>
-    </div>
-    {js}
-</body>
-</html>
-"""
+    if key:
+        save_fragments(cache_dir, key, result)
+    return result
+
+def render_sheets(excel_path, jobs, workers, cache_dir=None):
+    """[(sheet, result or exception)] in job order — sheets render in a process pool when it pays off"""
+    # Reading a sheet dominates; sheets with a sidecar cube are cheap, so only fan out if several need reading
+    to_read = sum(1 for _, cube in jobs if cube is None)
+    if workers > 1 and to_read > 1:
+        try:
+            # Submit through the importable module so workers can unpickle it even when this file was exec'd
+            import Interactive_Dashboard as worker_module
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [pool.submit(worker_module.render_sheet, excel_path, sheet, cube, cache_dir)
+                           for sheet, cube in jobs]
+                results = []
+                for (sheet, _), future in zip(jobs, futures):
+                    try:
+                        results.append((sheet, future.result()))
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        results.append((sheet, e))
+                return results
+        except Exception as e:
+            safe_print(f"[WARNING] Parallel rendering unavailable ({e}) -> rendering sheets one by one")
 
-    return head + body + footer
+    results = []
+    for sheet, cube in jobs:
+        try:
+            results.append((sheet, render_sheet(excel_path, sheet, cube, cache_dir)))
+        except Exception as e:
+            results.append((sheet, e))
+    return results
 
-def process_excel_to_executive_dashboard(excel_path: Path, out_file: Path, title="ESAF Access Requests Executive Dashboard"):
+def process_excel_to_executive_dashboard(excel_path: Path, out_file: Path, title="ESAF Access Requests Executive Dashboard",
+                                         workers=None, plotlyjs=None, check=False, use_cache=True):
     """Process Excel file and generate executive dashboard"""
     try:
         with pd.ExcelFile(excel_path) as xls:
@@ -1013,53 +1080,387 @@ def process_excel_to_executive_dashboard(excel_path: Path, out_file: Path, title
         safe_print(f"[ERROR] Cannot read Excel file: {e}")
         return
 
-    sheet_results = []
+    # Counts Step 3 already aggregated (only used while the workbook is unchanged since)
+    cubes = load_sidecar(excel_path) or {}
+
+    jobs = []
     for sheet in SHEETS_TO_PROCESS:
         if sheet not in available_sheets:
             safe_print(f"[INFO] Sheet '{sheet}' not found, skipping...")
             continue
-            
-        try:
-            df = pd.read_excel(excel_path, sheet_name=sheet)
-            safe_print(f"[SUCCESS] Processing sheet: {sheet} ({len(df)} rows)")
-            
-            kpi_html, charts = generate_executive_charts(df, sheet)
-            
-            sheet_results.append({
-                'name': sheet,
-                'kpi_html': kpi_html,
-                'charts': charts
-            })
-            
-        except Exception as e:
-            safe_print(f"[ERROR] Failed to process sheet '{sheet}': {e}")
+        jobs.append((sheet, cubes.get(sheet)))
+
+    workers = workers or DASHBOARD_WORKERS or os.cpu_count() or 1
+    # Fragments of sheets whose counts did not change since an earlier build are reused as-is
+    cache_dir = Path(excel_path).parent / CACHE_DIR if use_cache and CACHE_ENTRIES > 0 else None
+    sheet_results = []
+    for sheet, result in render_sheets(excel_path, jobs, workers, cache_dir):
+        if isinstance(result, Exception):
+            safe_print(f"[ERROR] Failed to process sheet '{sheet}': {result}")
+            continue
+        reused = " - unchanged, reused cached charts" if result.get('cached') else ""
+        safe_print(f"[SUCCESS] Processing sheet: {sheet} ({result['rows']} rows){reused}")
+        sheet_results.append(result)
+    if cache_dir:
+        prune_fragment_cache(cache_dir, CACHE_ENTRIES)
 
     if not sheet_results:
         safe_print("[ERROR] No sheets processed successfully")
         return
 
-    html_content = build_executive_dashboard(sheet_results, page_title=title)
-    
+    if TIMESERIES_ENABLED:
+        history = generate_history_section(timeseries.load_store(TIMESERIES_FILE))
+        if history:
+            safe_print(f"[SUCCESS] Added history section ({history['rows']} days tracked)")
+            sheet_results.append(history)
+
+    if check:
+        checked, problems = check_render(sheet_results)
+        golden_checked, golden_problems = check_golden()
+        checked += golden_checked
+        problems += golden_problems
+        for problem in problems:
+            safe_print(f"[ERROR] {problem}")
+        if problems:
+            safe_print(f"[ERROR] {len(problems)} of {checked} figures failed the render check")
+            return False
+        safe_print(f"[SUCCESS] All {checked} figures match their validated Plotly figures ({golden_checked} against golden output)")
+
     try:
-        out_file.write_text(html_content, encoding='utf-8')
+        write_executive_dashboard(
+            out_file, sheet_results, page_title=title, plotlyjs_html=plotlyjs_script(plotlyjs or PLOTLYJS_MODE, out_file)
+        )
         safe_print(f"[SUCCESS] Executive dashboard saved to: {out_file.resolve()}")
         safe_print(f"[INFO] Processed {len(sheet_results)} sheets with executive visualizations")
+        return True
     except Exception as e:
         safe_print(f"[ERROR] Failed to save dashboard: {e}")
 
-def main():
+class DashboardState:
+    """Everything derived from the workbook, built lazily on first request and dropped when the workbook changes"""
+
+    def __init__(self, excel_path, title, cache_dir=None):
+        self.excel_path = Path(excel_path)
+        self.title = title
+        self.cache_dir = cache_dir
+        # One render at a time: requests for the same sheet wait for it instead of rendering it twice
+        self.lock = threading.RLock()
+        self.stamp = None
+        self.reset()
+
+    def reset(self):
+        self.sheets = []
+        self.sidecar = {}
+        self.cubes = {}
+        self.results = {}
+        self.responses = {}
+
+    def refresh(self):
+        """Current workbook stamp ('mtime_ns-size'); a change since the last request resets every cached result"""
+        stamp = "-".join(str(part) for part in workbook_stamp(self.excel_path))
+        with self.lock:
+            if stamp != self.stamp:
+                if self.stamp is not None:
+                    safe_print("[INFO] Workbook changed on disk -> reloading dashboard data")
+                self.reset()
+                with pd.ExcelFile(self.excel_path) as xls:
+                    available_sheets = xls.sheet_names
+                self.sheets = [sheet for sheet in SHEETS_TO_PROCESS if sheet in available_sheets]
+                self.sidecar = load_sidecar(self.excel_path) or {}
+                self.stamp = stamp
+        return stamp
+
+    def cube(self, sheet):
+        with self.lock:
+            if sheet not in self.cubes:
+                cube = self.sidecar.get(sheet)
+                self.cubes[sheet] = cube if cube is not None else build_cube(pd.read_excel(self.excel_path, sheet_name=sheet))
+            return self.cubes[sheet]
+
+    def result(self, sheet):
+        """Rendered KPI/chart fragments for one sheet, only once somebody asks for them"""
+        with self.lock:
+            if sheet not in self.results:
+                self.results[sheet] = render_sheet(self.excel_path, sheet, self.cube(sheet), self.cache_dir)
+            return self.results[sheet]
+
+    def history(self):
+        with self.lock:
+            if 'history' not in self.results:
+                store = timeseries.load_store(TIMESERIES_FILE) if TIMESERIES_ENABLED else timeseries.empty_store()
+                self.results['history'] = generate_history_section(store)
+            return self.results['history']
+
+    def page(self):
+        """Skeleton page: a placeholder per sheet (and History) that the browser fills from /api/.../section on scroll"""
+        with self.lock:
+            stamp = self.stamp
+            pending = [{'name': sheet, 'src': f"/api/sheets/{quote(sheet, safe='')}/section", 'stamp': stamp}
+                       for sheet in self.sheets]
+        if TIMESERIES_ENABLED:
+            pending.append({'name': 'History', 'src': '/api/history/section', 'stamp': stamp})
+        return build_executive_dashboard(
+            pending, page_title=self.title,
+            plotlyjs_html=f'<script src="/{plotlyjs_file_name()}" charset="utf-8"></script>',
+            reload=reload_config(stamp)
+        )
+
+    def section(self, sheet=None):
+        """{'stamp', 'html'} for one sheet's section (History when sheet is None), rendered under the lock so a workbook
+        change mid-render cannot mix two versions; the page reloads when the stamp is not its own"""
+        with self.lock:
+            if sheet is None:
+                html_text = section_html(self.history(), len(self.sheets))
+            elif sheet not in self.sheets:
+                # Gone since the route was matched: the new stamp makes the page reload
+                html_text = ""
+            else:
+                html_text = section_html(self.result(sheet), self.sheets.index(sheet))
+            return {'stamp': self.stamp, 'html': html_text}
+
+def reload_config(stamp):
+    """What served pages need to poll the workbook stamp and reload themselves (templates/reload.js)"""
+    return {'stamp': stamp, 'pollMs': int(RELOAD_POLL_SECONDS * 1000)}
+
+def chart_payload(result):
+    """JSON view of a rendered sheet: KPI HTML plus the figure specs (the client plots them with esafPlot)"""
+    return {
+        'name': result['name'],
+        'rows': result['rows'],
+        'kpi_html': result['kpi_html'],
+        'charts': [{'title': chart['title'], 'class': chart['class'], 'figure': chart['figure']}
+                   for chart in result['charts'] if 'figure' in chart]
+    }
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    """GET-only routes: / (page), /plotly-<version>.min.js, /api/stamp, /api/sheets[/<name>/cube|/charts|/section],
+    /api/history[/section]"""
+
+    def do_GET(self):
+        state = self.server.state
+        path = unquote(urlsplit(self.path).path).rstrip('/') or '/'
+        try:
+            stamp = state.refresh()
+            if path == f"/{plotlyjs_file_name()}":
+                # Versioned name never changes content, so browsers keep it for good
+                return self.send_body(get_plotlyjs().encode('utf-8'), 'application/javascript',
+                                      cache_control='public, max-age=31536000, immutable')
+            if path == '/api/stamp':
+                return self.send_json({'stamp': stamp})
+            # Everything else only changes with the workbook: build once per stamp and replay the bytes
+            with state.lock:
+                cached = state.responses.get(path)
+            if cached is None:
+                cached = self.build_response(state, path)
+                if cached is None:
+                    return self.send_json({'error': f"Not found: {path}"}, status=404)
+                with state.lock:
+                    if state.stamp == stamp:
+                        state.responses[path] = cached
+            body, content_type = cached
+            self.send_body(body, content_type)
+        except Exception as e:
+            safe_print(f"[ERROR] {self.path}: {e}")
+            self.send_json({'error': str(e)}, status=500)
+
+    def build_response(self, state, path):
+        """(body bytes, content type) for a workbook-derived route, or None when the route does not exist"""
+        if path == '/':
+            return state.page().encode('utf-8'), 'text/html; charset=utf-8'
+        if path == '/api/sheets':
+            sheets = [{'name': sheet, 'rows': int(state.cube(sheet)['Count'].sum())} for sheet in state.sheets]
+            return dumps_json({'stamp': state.stamp, 'sheets': sheets}).encode('utf-8'), 'application/json'
+        if path == '/api/history':
+            history = state.history()
+            payload = chart_payload(history) if history else None
+            return dumps_json(payload).encode('utf-8'), 'application/json'
+        if path == '/api/history/section':
+            return dumps_json(state.section()).encode('utf-8'), 'application/json'
+        parts = path.split('/')
+        if len(parts) == 5 and parts[:3] == ['', 'api', 'sheets'] and parts[3] in state.sheets:
+            sheet, view = parts[3], parts[4]
+            if view == 'cube':
+                payload = {'columns': CUBE_COLUMNS, 'rows': state.cube(sheet)[CUBE_COLUMNS].values.tolist()}
+            elif view == 'charts':
+                payload = chart_payload(state.result(sheet))
+            elif view == 'section':
+                payload = state.section(sheet)
+            else:
+                return None
+            return dumps_json(payload).encode('utf-8'), 'application/json'
+        return None
+
+    def send_json(self, payload, status=200):
+        self.send_body(dumps_json(payload).encode('utf-8'), 'application/json', status=status)
+
+    def send_body(self, body, content_type, status=200, cache_control='no-cache'):
+        """Send with a content ETag (304 when the client already has it) and gzip when the client accepts it"""
+        # Bodies big enough to compress come in two encodings: each gets its own ETag, and caches key on Accept-Encoding
+        compressible = len(body) > 1024
+        encoding = 'gzip' if compressible and 'gzip' in self.headers.get('Accept-Encoding', '') else None
+        etag = f'"{hashlib.md5(body).hexdigest()}{"-gz" if encoding else ""}"'
+        if status == 200 and etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            if compressible:
+                self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+        if encoding:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if compressible:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the console to [INFO]/[ERROR] lines instead of one line per request
+        pass
+
+def serve_dashboard(excel_path, title, host, port, use_cache=True):
+    """Serve the dashboard and its JSON API until Ctrl+C"""
+    cache_dir = Path(excel_path).parent / CACHE_DIR if use_cache and CACHE_ENTRIES > 0 else None
+    state = DashboardState(excel_path, title, cache_dir)
+    try:
+        state.refresh()
+        server = ThreadingHTTPServer((host, port), DashboardRequestHandler)
+    except Exception as e:
+        safe_print(f"[ERROR] Cannot start dashboard server: {e}")
+        return False
+    server.state = state
+    safe_print(f"[SUCCESS] Serving dashboard at http://{host}:{port}/ (Ctrl+C to stop)")
+    safe_print("[INFO] Sheet sections render as they scroll into view and reload when the workbook changes")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        safe_print("\n[INFO] Dashboard server stopped")
+    finally:
+        server.server_close()
+    return True
+
+def benchmark_sheet_results(charts=50, seed=7):
+    """Synthetic sheets (random applications, types, dates and assignees) until the page holds at least `charts` charts"""
+    rng = np.random.default_rng(seed)
+    apps = [f"Application {i:03d}" for i in range(120)]
+    people = [f"Assignee {i:02d}" for i in range(25)]
+    days = pd.date_range(end=datetime.now().date(), periods=365, freq='D')
+    sheet_results = []
+    while sum(len(result['charts']) for result in sheet_results) < charts:
+        rows = 2000
+        df = pd.DataFrame({
+            'Application': rng.choice(apps, rows),
+            'RequestType': rng.choice(['Create', 'Modify', 'Delete', 'Other'], rows, p=[0.5, 0.3, 0.15, 0.05]),
+            'Request date': rng.choice(days, rows),
+            'Last updated time': rng.choice(days, rows),
+            'Assignee': rng.choice(people, rows)
+        })
+        cube = build_cube(df)
+        name = f"Sheet {len(sheet_results) + 1}"
+        kpi_html, sheet_charts = generate_executive_charts(cube, name)
+        sheet_results.append({'name': name, 'kpi_html': kpi_html, 'charts': sheet_charts,
+                              'rows': rows, 'data': columnar_cube(cube)})
+    return sheet_results
+
+def benchmark_dashboard(charts=50, repeat=5):
+    """Time template compilation (cold, from bytecode, in memory) and page rendering for a dashboard of `charts` charts"""
+    global _template_env
+    sheet_results = benchmark_sheet_results(charts)
+    chart_count = sum(len(result['charts']) for result in sheet_results)
+    safe_print(f"[INFO] Benchmark dashboard: {len(sheet_results)} sheets, {chart_count} charts")
+
+    def timed(action):
+        started = time.perf_counter()
+        action()
+        return (time.perf_counter() - started) * 1000
+
+    def load_template():
+        template_env().get_template(DASHBOARD_TEMPLATE)
+
+    saved_env = _template_env
+    with tempfile.TemporaryDirectory() as tmp:
+        bytecode_cache = FileSystemBytecodeCache(tmp)
+        # Fresh environments so neither the process-wide env nor an existing bytecode cache hides the compile cost
+        for label in ["Templates compiled from source", "Templates loaded from bytecode cache"]:
+            _template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIRS), bytecode_cache=bytecode_cache,
+                                        trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+            _template_env.filters['json'] = dumps_json
+            safe_print(f"[INFO] {label}: {timed(load_template):.1f} ms")
+        safe_print(f"[INFO] Templates already in memory: {timed(load_template):.3f} ms")
+
+        out_file = Path(tmp) / "benchmark_dashboard.html"
+        results = []
+        # Linked plotly.js isolates the layout work; inline adds the ~4.5 MB library as one more chunk
+        for mode in ["cdn", "inline"]:
+            plotlyjs_html = plotlyjs_script(mode, ".")
+            for label, action in [
+                ("render to string + write", lambda: out_file.write_text(
+                    build_executive_dashboard(sheet_results, "Benchmark", plotlyjs_html), encoding='utf-8')),
+                ("stream to file", lambda: write_executive_dashboard(out_file, sheet_results, "Benchmark", plotlyjs_html))
+            ]:
+                times = sorted(timed(action) for _ in range(repeat))
+                tracemalloc.start()
+                action()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.append((f"{label} ({mode})", times[len(times) // 2], times[0], peak, out_file.stat().st_size))
+    _template_env = saved_env
+
+    safe_print(f"[INFO] Page render ({repeat} runs each):")
+    for label, median, best, peak, size in results:
+        safe_print(f"[INFO]   {label:<35} median {median:7.1f} ms   best {best:7.1f} ms   "
+                   f"peak memory {peak / 1024 / 1024:5.1f} MB   page {size / 1024 / 1024:4.1f} MB")
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Generate Executive ESAF Dashboard")
     parser.add_argument("--out", "-o", default="esaf_executive_dashboard.html", help="Output HTML file name")
     parser.add_argument("--title", "-t", default=DASHBOARD_TITLE, help="Dashboard title")
-    args = parser.parse_args()
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Sheets rendered in parallel (1 = serial)")
+    parser.add_argument("--plotlyjs", choices=PLOTLYJS_MODES, default=None,
+                        help="inline plotly.js in the page, cache it next to the page (local), or load it from the CDN")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every sheet instead of reusing cached charts")
+    parser.add_argument("--serve", action="store_true", help="Serve the dashboard and a JSON API locally instead of writing a file")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on (--serve)")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help="Port to serve on (--serve)")
+    parser.add_argument("--check-render", action="store_true",
+                        help="Validate every chart spec against plotly.graph_objects before writing the page")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time template compilation and page rendering for a synthetic 50-chart dashboard")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark_dashboard()
+        return
     
     excel_path = Path("Today_Assignment.xlsx")
     if not excel_path.exists():
         safe_print("[ERROR] Today_Assignment.xlsx not found")
         sys.exit(1)
         
+    if args.serve:
+        if not serve_dashboard(excel_path, args.title, args.host, args.port, use_cache=not args.no_cache):
+            sys.exit(1)
+        return
+
     out_file = Path(args.out)
-    process_excel_to_executive_dashboard(excel_path, out_file, title=args.title)
+    ok = process_excel_to_executive_dashboard(excel_path, out_file, title=args.title, workers=args.workers,
+                                              plotlyjs=args.plotlyjs, check=args.check_render,
+                                              use_cache=not args.no_cache)
+    if args.check_render and not ok:
+        sys.exit(1)
+
+def run(config, context):
+    """Step runner entry point: context["args"] takes the command-line options (e.g. ["--no-cache"])"""
+    apply_config(config)
+    main(context.get("args", []))
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
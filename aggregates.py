@@ -0,0 +1,94 @@
+"""
+ESAF Aggregate Sidecar
+Per-sheet count cubes (Application x RequestType x day x Assignee) written next to the workbook by Step 3
+"""
+
+import json
+import os
+import pandas as pd
+from request_types import REQUEST_TYPES, ensure_request_type
+
+CUBE_KEYS = ["Application", "RequestType", "RequestDay", "UpdatedDay", "Assignee"]
+CUBE_COLUMNS = CUBE_KEYS + ["Count"]
+SIDECAR_VERSION = 1
+
+def sidecar_path(workbook):
+    return os.path.splitext(str(workbook))[0] + ".aggregates.json"
+
+def empty_cube():
+    return pd.DataFrame(columns=CUBE_COLUMNS)
+
+def day_strings(df, column):
+    if column not in df.columns:
+        return None
+    return pd.to_datetime(df[column], errors='coerce').dt.strftime('%Y-%m-%d')
+
+def build_cube(df):
+    """One groupby over the rows; groups keep first-appearance order so "first N apps" views still match"""
+    if df.empty:
+        return empty_cube()
+    ensure_request_type(df)
+    keys = pd.DataFrame(index=df.index)
+    keys["Application"] = df["Application"] if "Application" in df.columns else None
+    keys["RequestType"] = df["RequestType"].astype(object) if "RequestType" in df.columns else None
+    keys["RequestDay"] = day_strings(df, "Request date")
+    keys["UpdatedDay"] = day_strings(df, "Last updated time")
+    keys["Assignee"] = df["Assignee"] if "Assignee" in df.columns else None
+    cube = keys.groupby(CUBE_KEYS, sort=False, dropna=False).size().reset_index(name="Count")
+    return cube.astype(object).where(cube.notna(), None).astype({"Count": int})
+
+def cube_type_counts(cube):
+    """{type: count} for every RequestType"""
+    counts = cube.groupby("RequestType")["Count"].sum() if not cube.empty else {}
+    return {kind: int(counts.get(kind, 0)) for kind in REQUEST_TYPES}
+
+def workbook_stamp(workbook):
+    stat = os.stat(workbook)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def save_sidecar(workbook, cubes):
+    """Persist {sheet: cube} stamped with the workbook's current mtime/size"""
+    path = sidecar_path(workbook)
+    payload = {
+        "version": SIDECAR_VERSION,
+        "workbook_stamp": workbook_stamp(workbook),
+        "columns": CUBE_COLUMNS,
+        "sheets": {sheet: cube[CUBE_COLUMNS].values.tolist() for sheet, cube in cubes.items()},
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'), default=int)
+    os.replace(tmp_path, path)
+
+def load_sidecar(workbook):
+    """{sheet: cube} when the sidecar matches the workbook on disk, else None (callers rescan rows)"""
+    path = sidecar_path(workbook)
+    if not os.path.exists(path) or not os.path.exists(workbook):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get("version") != SIDECAR_VERSION or payload.get("columns") != CUBE_COLUMNS:
+            return None
+        if payload.get("workbook_stamp") != workbook_stamp(workbook):
+            print("[INFO] Aggregate sidecar is older than the workbook -> counting from rows")
+            return None
+        return {sheet: pd.DataFrame(rows, columns=CUBE_COLUMNS) if rows else empty_cube()
+                for sheet, rows in payload["sheets"].items()}
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable aggregate sidecar '{path}': {e}")
+        return None
+
+def restamp_sidecar(workbook):
+    """Carry a still-valid sidecar across a save that did not touch the sheets it covers"""
+    path = sidecar_path(workbook)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        payload["workbook_stamp"] = workbook_stamp(workbook)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[WARNING] Could not update aggregate sidecar: {e}")
@@ -1,31 +1,22 @@
-import subprocess
+import time
+# Taken before the other imports so --startup-profile can report how long they took
+STARTED = time.perf_counter()
 import sys
 import os
 import json
 import shutil
-import keyboard
-from colorama import Fore, Style, init
-import pyautogui
-import tempfile
-import importlib.util
+from colorama import Fore, init
+import multiprocessing
+import step_runner
 
-# Initialize colorama with full compatibility
-init(autoreset=True, convert=True, strip=False)
+# keyboard and pyautogui are imported where they are used: the menu needs neither, and
+# dashboard worker processes re-import this module on Windows
+DEFERRED_MODULES = ["keyboard", "pyautogui"]
 
 CONFIG_FILE = "esaf_config.json"
 DEFAULTS_FILE = "esaf_config_defaults.json"
 BACKUP_FILE = "esaf_config_backup.json"
 
-# ===== SCRIPT FILENAMES =====
-SCRIPTS = {
-    "step1": "esaf_automation.py",
-    "step2": "merge_and_cleanup.py", 
-    "step3": "Data_Analysis_Split.py",
-    "step4": "summary_pivot.py",
-    "step5": "Interactive_Dashboard.py",
-    "complete": "complete_process.py"
-}
-
 def get_ascii_banner():
     """Return ASCII banner as plain string (safe for all terminals)"""
     return f"""
@@ -45,111 +36,16 @@ def get_ascii_banner():
 {Fore.CYAN}+==============================================================================+
 """
 
-def get_resource_path(relative_path):
-    """Get absolute path to resource, works for dev and for PyInstaller"""
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
-
-def extract_script_to_temp(script_name):
-    """Extract script from bundle to temporary file and return path"""
-    try:
-        # Get the bundled script
-        bundled_path = get_resource_path(script_name)
-        
-        if not os.path.exists(bundled_path):
-            print(f"{Fore.RED}[ERROR] Script not found in bundle: {script_name}")
-            return None
-        
-        # Read the script content
-        with open(bundled_path, 'r', encoding='utf-8') as f:
-            script_content = f.read()
-        
-        # Create temporary file
-        temp_dir = tempfile.mkdtemp()
-        temp_script_path = os.path.join(temp_dir, script_name)
-        
-        # Write script to temporary file
-        with open(temp_script_path, 'w', encoding='utf-8') as f:
-            f.write(script_content)
-        
-        return temp_script_path
-        
-    except Exception as e:
-        print(f"{Fore.RED}[ERROR] Failed to extract script: {e}")
-        return None
-
-def run_script_directly(script_name, step_name):
-    """Run script directly without creating new process"""
+def run_step(step, step_name):
+    """Run a step in this process: its module is imported on first use and reused for later menu actions"""
     try:
         print(f"\n{Fore.CYAN}[RUN] Starting {step_name}...")
         print(f"{Fore.YELLOW}[ABORT] Press ESC anytime to stop!")
-        
-        # Extract script to temp file
-        script_path = extract_script_to_temp(script_name)
-        if not script_path:
+
+        if not step_runner.run_step(step):
+            print(f"\n{Fore.RED}[ERROR] {step_name} stopped with an error.")
             return False
-        
-        # Read and execute the script
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script_code = f.read()
-        
-        # Create a temporary module and execute it
-        temp_module_name = f"temp_{script_name.replace('.', '_')}"
-        spec = importlib.util.spec_from_loader(temp_module_name, loader=None)
-        temp_module = importlib.util.module_from_spec(spec)
-        
-        # Set up the environment for the script
-        script_globals = {
-            '__name__': '__main__',
-            '__file__': script_path,
-            'sys': sys,
-            'os': os,
-            'json': json,
-            'shutil': shutil,
-            'keyboard': keyboard,
-            'Fore': Fore,
-            'Style': Style,
-            'init': init,
-            'pyautogui': pyautogui,
-            'pd': None,  # pandas
-            'load_workbook': None,  # openpyxl
-            'px': None,  # plotly express
-            'go': None,  # plotly graph_objects
-            'pio': None,  # plotly io
-            'subprocess': subprocess
-        }
-        
-        # Try to import required modules for the script
-        try:
-            import pandas as pd
-            script_globals['pd'] = pd
-        except ImportError:
-            pass
-            
-        try:
-            from openpyxl import load_workbook
-            script_globals['load_workbook'] = load_workbook
-        except ImportError:
-            pass
-            
-        try:
-            import plotly.express as px
-            import plotly.graph_objects as go
-            import plotly.io as pio
-            script_globals['px'] = px
-            script_globals['go'] = go
-            script_globals['pio'] = pio
-        except ImportError:
-            pass
-        
-        # Execute the script
-        exec(script_code, script_globals)
-        
+
         print(f"\n{Fore.GREEN}[SUCCESS] {step_name} completed!")
         return True
         
@@ -162,6 +58,7 @@ def run_script_directly(script_name, step_name):
 
 def check_abort():
     """Check if user pressed ESC - can be called anywhere"""
+    import keyboard
     if keyboard.is_pressed('esc'):
         print(f"\n{Fore.RED}[ABORT] EMERGENCY STOP: ESC key pressed!")
         raise KeyboardInterrupt("User pressed ESC")
@@ -195,13 +92,22 @@ def ensure_defaults():
             "queues": ["CORP-ACCESS-INDIA"],
             "keywords": ["SMART", "SMART Inventory", "Smart admin", "abc", "HOST"],
             "assignees": ["Akhil", "Swathi", "Divya", "Amreen", "Riya", "Madhurima", "Vamsitha"],
+            "assignee_profiles": {},
             "rules": {
                 "india_overflow_threshold": 70,
                 "max_per_person_domestic": 15,
                 "max_per_person_meditech": 5,
                 "requests_per_app_domestic": 2,
                 "india_keyword": "CORP-ACCESS-INDIA",
-                "meditech_keyword": "MEDITECH_Expanse_CAP_Panhandle_Market"
+                "meditech_keyword": "MEDITECH_Expanse_CAP_Panhandle_Market",
+                "assignment_mode": "greedy",
+                "solver_time_budget_seconds": 5,
+                "sticky_assignment": True,
+                "history_retention_days": 30,
+                "incremental_mode": False,
+                "age_priority": True,
+                "aging_boosts": [[3, 2], [7, 5]],
+                "india_overflow_mode": "all"
             },
             "output_file": "Today_Assignment.xlsx",
             "keep_columns": [
@@ -287,6 +193,7 @@ def edit_url(config):
     print(f"{Fore.GREEN}[OK] URL updated to: {Fore.WHITE}{final_url}")
 
 def capture_mouse_coordinates(config):
+    import pyautogui
     print(f"\n{Fore.CYAN}[MOUSE] Coordinate Capture Tool")
     print(f"{Fore.YELLOW}[NOTE] Set browser zoom to 100% and keep window position fixed!")
     if "mouse_coords" not in config:
@@ -472,6 +379,8 @@ def crud_menu():
 
 def main():
     ensure_defaults()
+    # Libraries and step modules load in the background while the menu waits for input
+    step_runner.warm_up()
     while True:
         try:
             show_menu()
@@ -479,17 +388,17 @@ def main():
             if choice == "1":
                 crud_menu()
             elif choice == "2":
-                run_script_directly(SCRIPTS["complete"], "Full End-to-End Process")
+                run_step("complete", "Full End-to-End Process")
             elif choice == "3":
-                run_script_directly(SCRIPTS["step1"], "Step 1: ESAF UI Automation")
+                run_step("step1", "Step 1: ESAF UI Automation")
             elif choice == "4":
-                run_script_directly(SCRIPTS["step2"], "Step 2: Merge & Cleanup")
+                run_step("step2", "Step 2: Merge & Cleanup")
             elif choice == "5":
-                run_script_directly(SCRIPTS["step3"], "Step 3: Assign Requests to Team")
+                run_step("step3", "Step 3: Assign Requests to Team")
             elif choice == "6":
-                run_script_directly(SCRIPTS["step4"], "Step 4: Summary + Pivot")
+                run_step("step4", "Step 4: Summary + Pivot")
             elif choice == "7":
-                run_script_directly(SCRIPTS["step5"], "Step 5: Interactive Dashboard")
+                run_step("step5", "Step 5: Interactive Dashboard")
             elif choice == "0":
                 print(f"\n{Fore.CYAN}Thank you for using ESAF AutoPilot™. Goodbye!")
                 break
@@ -506,11 +415,33 @@ def main():
             print(f"\n{Fore.RED}[ERROR] Unexpected error: {e}")
             input(f"\n{Fore.CYAN}Press Enter to continue...")
 
+def startup_profile():
+    """--startup-profile: Python import time before the menu, the menu's own set-up, then each deferred and warmed-up import in load order"""
+    # Counted from the first line of this script, so a onefile .exe's unpacking and interpreter start are not included
+    print(f"{Fore.CYAN}[PROFILE] Python imports before the menu: {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+    started = time.perf_counter()
+    ensure_defaults()
+    validate_config()
+    print(f"{Fore.CYAN}[PROFILE] Menu set-up (defaults file, config check): {(time.perf_counter() - started) * 1000:.0f} ms")
+    total = 0
+    for module_name, seconds in step_runner.profile_imports(DEFERRED_MODULES + step_runner.warm_up_modules()):
+        if seconds is None:
+            print(f"{Fore.YELLOW}[PROFILE]   {module_name:<25} failed to import")
+            continue
+        total += seconds
+        print(f"{Fore.CYAN}[PROFILE]   {module_name:<25} {seconds * 1000:8.0f} ms")
+    print(f"{Fore.CYAN}[PROFILE] Imported after the menu: {total * 1000:.0f} ms (in the background for warmed-up modules)")
+
 if __name__ == "__main__":
+    # Worker processes (dashboard rendering) re-launch the frozen .exe; let them run their task instead of the menu
+    multiprocessing.freeze_support()
     # Ensure UTF-8 and color support
     if hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding='utf-8')
     init(autoreset=True, convert=True, strip=False)
-    main()
+    if "--startup-profile" in sys.argv:
+        startup_profile()
+    else:
+        main()
 
 
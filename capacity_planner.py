@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+ESAF Capacity Planner - what-if sweep over Step 3 assignment rules
+Replays the assignment engine against Master_Data for every rule combination
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import Data_Analysis_Split as step3
+
+# ===== WORKER STATE =====
+# Each worker receives the split frames once (pool initializer) instead of once per combination
+_FRAMES = None
+
+def init_worker(frames):
+    global _FRAMES
+    _FRAMES = frames
+
+def simulate(combo):
+    """Run one rule combination through the Step 3 engine and return its metrics"""
+    india_threshold, max_domestic, max_meditech, req_per_app = combo
+    india_df, domestic_df, meditech_df = _FRAMES
+
+    # Same India overflow rule as Step 3
+    if len(india_df) >= india_threshold:
+        if step3.INDIA_OVERFLOW_MODE == "partial":
+            india_df, overflow_df = step3.split_by_priority(india_df, india_threshold)
+        else:
+            india_df, overflow_df = pd.DataFrame(), india_df
+    else:
+        overflow_df = pd.DataFrame()
+
+    capacities = step3.build_capacities(step3.ASSIGNEES, step3.ASSIGNEE_PROFILES, max_domestic)
+    skill_index = step3.build_skill_index(step3.ASSIGNEES, step3.ASSIGNEE_PROFILES)
+    # The engine narrates every app it visits; keep the sweep output to the result table
+    with contextlib.redirect_stdout(io.StringIO()):
+        india, domestic, meditech, extra = step3.assign_requests_dynamic(
+            india_df, domestic_df, meditech_df, step3.ASSIGNEES,
+            max_total=max_domestic,
+            max_meditech=max_meditech,
+            req_per_app=req_per_app,
+            capacities=capacities,
+            skill_index=skill_index,
+            age_priority=step3.AGE_PRIORITY
+        )
+
+    loads = {assignee: 0 for assignee in step3.ASSIGNEES}
+    for frame in [india, domestic, meditech]:
+        if not frame.empty:
+            for assignee, count in frame['Assignee'].value_counts().items():
+                loads[assignee] += int(count)
+    score = step3.assignment_objective(india, domestic, meditech, extra, step3.ASSIGNEES, max_domestic, req_per_app)
+    return {
+        'india_threshold': india_threshold,
+        'max_domestic': max_domestic,
+        'max_meditech': max_meditech,
+        'req_per_app': req_per_app,
+        'unassigned': len(extra) + len(overflow_df),
+        'max_load': max(loads.values(), default=0),
+        'min_load': min(loads.values(), default=0),
+        'app_spread': score['spread'],
+    }
+
+def run_sweep(frames, combos, workers):
+    """Fan combinations out over a process pool, falling back to a serial loop if the pool cannot start"""
+    if workers > 1 and len(combos) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(frames,)) as pool:
+                return list(pool.map(simulate, combos, chunksize=max(len(combos) // (workers * 4), 1)))
+        except Exception as e:
+            print(f"[WARNING] Process pool unavailable ({e}) -> running serially")
+    init_worker(frames)
+    return [simulate(combo) for combo in combos]
+
+def main():
+    rules = step3.config["rules"]
+    parser = argparse.ArgumentParser(description="Sweep Step 3 assignment rules against Master_Data")
+    parser.add_argument("--india-threshold", type=int, nargs="+", default=[rules["india_overflow_threshold"]],
+                        help="india_overflow_threshold values")
+    parser.add_argument("--max-domestic", type=int, nargs="+", default=[rules["max_per_person_domestic"]],
+                        help="max_per_person_domestic values")
+    parser.add_argument("--max-meditech", type=int, nargs="+", default=[rules["max_per_person_meditech"]],
+                        help="max_per_person_meditech values")
+    parser.add_argument("--req-per-app", type=int, nargs="+", default=[rules["requests_per_app_domestic"]],
+                        help="requests_per_app_domestic values")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = serial)")
+    parser.add_argument("--csv", help="Also write the result table to this CSV file")
+    args = parser.parse_args()
+
+    print("[INFO] ESAF CAPACITY PLANNER")
+    print("=" * 50)
+
+    df = step3.load_master_data()
+    if df is None:
+        sys.exit(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames = step3.split_data(df)
+
+    combos = list(itertools.product(args.india_threshold, args.max_domestic, args.max_meditech, args.req_per_app))
+    print(f"[INFO] Sweeping {len(combos)} rule combinations with {min(args.workers, len(combos))} worker(s)...")
+    results = pd.DataFrame(run_sweep(frames, combos, args.workers))
+
+    # Fewest unassigned first, then the most even load, then the best app spread
+    results['load_gap'] = results['max_load'] - results['min_load']
+    results = results.sort_values(['unassigned', 'load_gap', 'app_spread'], kind='stable').drop(columns='load_gap')
+    print()
+    print(results.to_string(index=False))
+
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+        print(f"\n[SUCCESS] Results saved to {args.csv}")
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
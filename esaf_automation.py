@@ -11,39 +11,47 @@ import subprocess
 import json
 
 # ===== LOAD CONFIG FROM JSON =====
+def apply_config(config):
+    """Settings from the config; run() re-applies them, so the module is imported only once"""
+    global URL, REQUESTS_ASSIGNED_COORDS, ADVANCED_FILTER_BUTTON, APPLICATION_NAME_FIELD, CLICK_OUTSIDE_TARGET
+    global APPLY_BUTTON, EXPORT_XLS_COORDS, STATUS_FIELD_COORDS, APPLY_2_BUTTON_COORDS, WAIT_AFTER_PAGE_LOAD
+    global WAIT_AFTER_REQUESTS_CLICK, WAIT_AFTER_ADVANCED_FILTER_OPEN, WAIT_AFTER_PASTE, WAIT_AFTER_APPLY
+    global WAIT_AFTER_EXPORT, MAX_WAIT_FOR_DOWNLOAD, CHECK_INTERVAL, QUEUES, KEYWORDS, DOWNLOADS_FOLDER
+    global BASE_ASSIGNMENT_FOLDER, NO_REQUESTS_TEXT
+    URL = config["url"]
+    REQUESTS_ASSIGNED_COORDS = tuple(config["mouse_coords"]["requests_assigned"])
+    ADVANCED_FILTER_BUTTON = tuple(config["mouse_coords"]["advanced_filter"])
+    APPLICATION_NAME_FIELD = tuple(config["mouse_coords"]["app_field"])
+    CLICK_OUTSIDE_TARGET = tuple(config["mouse_coords"]["click_outside"])
+    APPLY_BUTTON = tuple(config["mouse_coords"]["apply_button"])
+    EXPORT_XLS_COORDS = tuple(config["mouse_coords"]["export_xls"])
+    STATUS_FIELD_COORDS = tuple(config["mouse_coords"]["status_field"])
+    APPLY_2_BUTTON_COORDS = tuple(config["mouse_coords"]["apply_2_button"])
+
+    WAIT_AFTER_PAGE_LOAD = config["timings"]["wait_after_page_load"]
+    WAIT_AFTER_REQUESTS_CLICK = config["timings"]["wait_after_requests_click"]
+    WAIT_AFTER_ADVANCED_FILTER_OPEN = config["timings"]["wait_after_advanced_filter_open"]
+    WAIT_AFTER_PASTE = config["timings"]["wait_after_paste"]
+    WAIT_AFTER_APPLY = config["timings"]["wait_after_apply"]
+    WAIT_AFTER_EXPORT = config["timings"]["wait_after_export"]
+    MAX_WAIT_FOR_DOWNLOAD = config["timings"]["max_wait_for_download"]
+    CHECK_INTERVAL = config["timings"]["check_interval"]
+
+    QUEUES = config.get("queues", [])
+    KEYWORDS = config.get("keywords", [])
+
+    downloads_raw = config.get("downloads_folder", "AUTO")
+    if downloads_raw == "AUTO" or not str(downloads_raw).strip():
+        DOWNLOADS_FOLDER = os.path.join(os.path.expanduser("~"), "Downloads").replace("\\", "/")
+    else:
+        DOWNLOADS_FOLDER = downloads_raw.replace("\\", "/")
+
+    BASE_ASSIGNMENT_FOLDER = config.get("base_assignment_folder", "assignment_")
+    NO_REQUESTS_TEXT = config.get("no_requests_text", "There are no requests available")
+
 with open("esaf_config.json", 'r', encoding='utf-8') as f:
     config = json.load(f)
-
-URL = config["url"]
-REQUESTS_ASSIGNED_COORDS = tuple(config["mouse_coords"]["requests_assigned"])
-ADVANCED_FILTER_BUTTON = tuple(config["mouse_coords"]["advanced_filter"])
-APPLICATION_NAME_FIELD = tuple(config["mouse_coords"]["app_field"])
-CLICK_OUTSIDE_TARGET = tuple(config["mouse_coords"]["click_outside"])
-APPLY_BUTTON = tuple(config["mouse_coords"]["apply_button"])
-EXPORT_XLS_COORDS = tuple(config["mouse_coords"]["export_xls"])
-STATUS_FIELD_COORDS = tuple(config["mouse_coords"]["status_field"])
-APPLY_2_BUTTON_COORDS = tuple(config["mouse_coords"]["apply_2_button"])
-
-WAIT_AFTER_PAGE_LOAD = config["timings"]["wait_after_page_load"]
-WAIT_AFTER_REQUESTS_CLICK = config["timings"]["wait_after_requests_click"]
-WAIT_AFTER_ADVANCED_FILTER_OPEN = config["timings"]["wait_after_advanced_filter_open"]
-WAIT_AFTER_PASTE = config["timings"]["wait_after_paste"]
-WAIT_AFTER_APPLY = config["timings"]["wait_after_apply"]
-WAIT_AFTER_EXPORT = config["timings"]["wait_after_export"]
-MAX_WAIT_FOR_DOWNLOAD = config["timings"]["max_wait_for_download"]
-CHECK_INTERVAL = config["timings"]["check_interval"]
-
-QUEUES = config.get("queues", [])
-KEYWORDS = config.get("keywords", [])
-
-downloads_raw = config.get("downloads_folder", "AUTO")
-if downloads_raw == "AUTO" or not str(downloads_raw).strip():
-    DOWNLOADS_FOLDER = os.path.join(os.path.expanduser("~"), "Downloads").replace("\\", "/")
-else:
-    DOWNLOADS_FOLDER = downloads_raw.replace("\\", "/")
-
-BASE_ASSIGNMENT_FOLDER = config.get("base_assignment_folder", "assignment_")
-NO_REQUESTS_TEXT = config.get("no_requests_text", "There are no requests available")
+apply_config(config)
 
 # ===== TRACKER & SETUP =====
 downloaded_files = []
@@ -121,130 +129,141 @@ def move_downloaded_files(target_folder):
     print(f"[SUCCESS] Successfully moved {moved_count} files.")
 
 # ===== SAFETY & START =====
-pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.3
-
-print("[STOP] MOVE MOUSE TO TOP-LEFT CORNER TO ABORT.")
-print("[STOP] PRESS 'ESC' KEY ANYTIME TO STOP IMMEDIATELY.")
-print(f"[INFO] Monitoring Downloads: {DOWNLOADS_FOLDER}")
-print("[INFO] Starting ESAF Multi-Phase Automation...")
-
-try:
-    print(f"[INFO] Opening: {URL}")
-    webbrowser.open(URL)
-    time.sleep(WAIT_AFTER_PAGE_LOAD)
-
-    check_abort()
-    print(f"[ACTION] Clicking 'Requests Assigned to Me' at {REQUESTS_ASSIGNED_COORDS}")
-    pyautogui.click(REQUESTS_ASSIGNED_COORDS)
-    time.sleep(WAIT_AFTER_REQUESTS_CLICK)
-
-    # ===== PHASE 1: PROCESS QUEUES =====
-    if QUEUES:
-        print(f"\n=== PHASE 1: PROCESSING {len(QUEUES)} QUEUES ===")
-        for i, queue in enumerate(QUEUES, 1):
-            check_abort()
-            print(f"\n[PROCESS] Processing queue {i}/{len(QUEUES)}: '{queue}'")
-
-            print(f"[ACTION] Clicking Advanced Filter at {ADVANCED_FILTER_BUTTON}")
-            pyautogui.click(ADVANCED_FILTER_BUTTON)
-            time.sleep(WAIT_AFTER_ADVANCED_FILTER_OPEN)
-
-            # FIX: Replaced ⚡ with plain text
-            print("[ACTION] HYPER-SCROLL: Blasting mouse wheel down for 4 seconds...")
-            start_time = time.time()
-            while time.time() - start_time < 4:
-                pyautogui.scroll(-150)
-            time.sleep(1.5)
-
-            print(f"[ACTION] Clicking Status Field at {STATUS_FIELD_COORDS}")
-            pyautogui.click(STATUS_FIELD_COORDS)
-
-            print("[ACTION] Clearing field...")
-            pyautogui.hotkey('ctrl', 'a')
-            pyautogui.press('backspace')
-            print(f"[ACTION] Pasting queue: '{queue}'")
-            pyperclip.copy(queue)
-            pyautogui.hotkey('ctrl', 'v')
-            print("[SUCCESS] Queue pasted.")
-
-            print(f"[ACTION] Clicking Apply_2 Button at {APPLY_2_BUTTON_COORDS}")
-            pyautogui.click(APPLY_2_BUTTON_COORDS)
-            time.sleep(WAIT_AFTER_APPLY)
-
-            print(f"[ACTION] Clicking Export XLS at {EXPORT_XLS_COORDS}")
-            pyautogui.click(EXPORT_XLS_COORDS)
-
-            if not wait_for_download(i):
-                print("[WARNING] Proceeding despite timeout.")
-
-            if i < len(QUEUES):
-                print(f"[WAIT] Waiting {WAIT_AFTER_EXPORT} seconds before next queue...")
-                for sec in range(WAIT_AFTER_EXPORT):
-                    check_abort()
-                    time.sleep(1)
-
-    # ===== PHASE 2: PROCESS KEYWORDS =====
-    if KEYWORDS:
-        print(f"\n=== PHASE 2: PROCESSING {len(KEYWORDS)} KEYWORDS ===")
-        for i, keyword in enumerate(KEYWORDS, 1):
-            check_abort()
-            print(f"\n[PROCESS] Processing keyword {i}/{len(KEYWORDS)}: '{keyword}'")
-
-            print(f"[ACTION] Clicking Advanced Filter at {ADVANCED_FILTER_BUTTON}")
-            pyautogui.click(ADVANCED_FILTER_BUTTON)
-            time.sleep(WAIT_AFTER_ADVANCED_FILTER_OPEN)
-
-            print(f"[ACTION] Clicking Application Name Field at {APPLICATION_NAME_FIELD}")
-            pyautogui.click(APPLICATION_NAME_FIELD)
-
-            print("[ACTION] Clearing field with Ctrl+Shift+Right...")
-            pyautogui.hotkey('ctrl', 'shift', 'right')
-            pyautogui.press('backspace')
-
-            print(f"[ACTION] Pasting: '{keyword}'")
-            pyperclip.copy(keyword)
-            pyautogui.hotkey('ctrl', 'v')
-            print("[SUCCESS] Keyword pasted.")
-
-            print("[ACTION] Clicking outside target to trigger scroll...")
-            pyautogui.click(CLICK_OUTSIDE_TARGET)
-            time.sleep(0.5)
-
-            # FIX: Replaced ⚡ with plain text
-            print("[ACTION] HYPER-SCROLL: Blasting mouse wheel down for 4 seconds...")
-            start_time = time.time()
-            while time.time() - start_time < 4:
-                pyautogui.scroll(-150)
-            time.sleep(1.5)
-
-            print(f"[ACTION] Clicking Apply Button at {APPLY_BUTTON}")
-            pyautogui.click(APPLY_BUTTON)
-            time.sleep(WAIT_AFTER_APPLY)
-
-            print(f"[ACTION] Clicking Export XLS at {EXPORT_XLS_COORDS}")
-            pyautogui.click(EXPORT_XLS_COORDS)
-
-            if not wait_for_download(i):
-                print("[WARNING] Proceeding despite timeout.")
-
-            if i < len(KEYWORDS):
-                print(f"[WAIT] Waiting {WAIT_AFTER_EXPORT} seconds before next keyword...")
-                for sec in range(WAIT_AFTER_EXPORT):
-                    check_abort()
-                    time.sleep(1)
-
-    print("\n[INFO] All phases completed. Preparing to organize files...")
-    assignment_folder = create_assignment_folder()
-    move_downloaded_files(assignment_folder)
-
-    print(f"\n[SUCCESS] FULL AUTOMATION COMPLETED SUCCESSFULLY!")
-    print(f"[INFO] All files moved to: {assignment_folder}")
-    print("[SUCCESS] Automation fully completed.")
-
-except Exception as e:
-    print(f"[ERROR] {e}")
-    print("[FATAL] Script stopped due to error.")
-
-except KeyboardInterrupt:
-    print("\n[INFO] Script manually aborted by user (Ctrl+C).")
\ No newline at end of file
+def main():
+    # Files from an earlier run in this process were already moved
+    downloaded_files.clear()
+    pyautogui.FAILSAFE = True
+    pyautogui.PAUSE = 0.3
+
+    print("[STOP] MOVE MOUSE TO TOP-LEFT CORNER TO ABORT.")
+    print("[STOP] PRESS 'ESC' KEY ANYTIME TO STOP IMMEDIATELY.")
+    print(f"[INFO] Monitoring Downloads: {DOWNLOADS_FOLDER}")
+    print("[INFO] Starting ESAF Multi-Phase Automation...")
+
+    try:
+        print(f"[INFO] Opening: {URL}")
+        webbrowser.open(URL)
+        time.sleep(WAIT_AFTER_PAGE_LOAD)
+
+        check_abort()
+        print(f"[ACTION] Clicking 'Requests Assigned to Me' at {REQUESTS_ASSIGNED_COORDS}")
+        pyautogui.click(REQUESTS_ASSIGNED_COORDS)
+        time.sleep(WAIT_AFTER_REQUESTS_CLICK)
+
+        # ===== PHASE 1: PROCESS QUEUES =====
+        if QUEUES:
+            print(f"\n=== PHASE 1: PROCESSING {len(QUEUES)} QUEUES ===")
+            for i, queue in enumerate(QUEUES, 1):
+                check_abort()
+                print(f"\n[PROCESS] Processing queue {i}/{len(QUEUES)}: '{queue}'")
+
+                print(f"[ACTION] Clicking Advanced Filter at {ADVANCED_FILTER_BUTTON}")
+                pyautogui.click(ADVANCED_FILTER_BUTTON)
+                time.sleep(WAIT_AFTER_ADVANCED_FILTER_OPEN)
+
+                # FIX: Replaced ⚡ with plain text
+                print("[ACTION] HYPER-SCROLL: Blasting mouse wheel down for 4 seconds...")
+                start_time = time.time()
+                while time.time() - start_time < 4:
+                    pyautogui.scroll(-150)
+                time.sleep(1.5)
+
+                print(f"[ACTION] Clicking Status Field at {STATUS_FIELD_COORDS}")
+                pyautogui.click(STATUS_FIELD_COORDS)
+
+                print("[ACTION] Clearing field...")
+                pyautogui.hotkey('ctrl', 'a')
+                pyautogui.press('backspace')
+                print(f"[ACTION] Pasting queue: '{queue}'")
+                pyperclip.copy(queue)
+                pyautogui.hotkey('ctrl', 'v')
+                print("[SUCCESS] Queue pasted.")
+
+                print(f"[ACTION] Clicking Apply_2 Button at {APPLY_2_BUTTON_COORDS}")
+                pyautogui.click(APPLY_2_BUTTON_COORDS)
+                time.sleep(WAIT_AFTER_APPLY)
+
+                print(f"[ACTION] Clicking Export XLS at {EXPORT_XLS_COORDS}")
+                pyautogui.click(EXPORT_XLS_COORDS)
+
+                if not wait_for_download(i):
+                    print("[WARNING] Proceeding despite timeout.")
+
+                if i < len(QUEUES):
+                    print(f"[WAIT] Waiting {WAIT_AFTER_EXPORT} seconds before next queue...")
+                    for sec in range(WAIT_AFTER_EXPORT):
+                        check_abort()
+                        time.sleep(1)
+
+        # ===== PHASE 2: PROCESS KEYWORDS =====
+        if KEYWORDS:
+            print(f"\n=== PHASE 2: PROCESSING {len(KEYWORDS)} KEYWORDS ===")
+            for i, keyword in enumerate(KEYWORDS, 1):
+                check_abort()
+                print(f"\n[PROCESS] Processing keyword {i}/{len(KEYWORDS)}: '{keyword}'")
+
+                print(f"[ACTION] Clicking Advanced Filter at {ADVANCED_FILTER_BUTTON}")
+                pyautogui.click(ADVANCED_FILTER_BUTTON)
+                time.sleep(WAIT_AFTER_ADVANCED_FILTER_OPEN)
+
+                print(f"[ACTION] Clicking Application Name Field at {APPLICATION_NAME_FIELD}")
+                pyautogui.click(APPLICATION_NAME_FIELD)
+
+                print("[ACTION] Clearing field with Ctrl+Shift+Right...")
+                pyautogui.hotkey('ctrl', 'shift', 'right')
+                pyautogui.press('backspace')
+
+                print(f"[ACTION] Pasting: '{keyword}'")
+                pyperclip.copy(keyword)
+                pyautogui.hotkey('ctrl', 'v')
+                print("[SUCCESS] Keyword pasted.")
+
+                print("[ACTION] Clicking outside target to trigger scroll...")
+                pyautogui.click(CLICK_OUTSIDE_TARGET)
+                time.sleep(0.5)
+
+                # FIX: Replaced ⚡ with plain text
+                print("[ACTION] HYPER-SCROLL: Blasting mouse wheel down for 4 seconds...")
+                start_time = time.time()
+                while time.time() - start_time < 4:
+                    pyautogui.scroll(-150)
+                time.sleep(1.5)
+
+                print(f"[ACTION] Clicking Apply Button at {APPLY_BUTTON}")
+                pyautogui.click(APPLY_BUTTON)
+                time.sleep(WAIT_AFTER_APPLY)
+
+                print(f"[ACTION] Clicking Export XLS at {EXPORT_XLS_COORDS}")
+                pyautogui.click(EXPORT_XLS_COORDS)
+
+                if not wait_for_download(i):
+                    print("[WARNING] Proceeding despite timeout.")
+
+                if i < len(KEYWORDS):
+                    print(f"[WAIT] Waiting {WAIT_AFTER_EXPORT} seconds before next keyword...")
+                    for sec in range(WAIT_AFTER_EXPORT):
+                        check_abort()
+                        time.sleep(1)
+
+        print("\n[INFO] All phases completed. Preparing to organize files...")
+        assignment_folder = create_assignment_folder()
+        move_downloaded_files(assignment_folder)
+
+        print(f"\n[SUCCESS] FULL AUTOMATION COMPLETED SUCCESSFULLY!")
+        print(f"[INFO] All files moved to: {assignment_folder}")
+        print("[SUCCESS] Automation fully completed.")
+
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        print("[FATAL] Script stopped due to error.")
+
+    except KeyboardInterrupt:
+        print("\n[INFO] Script manually aborted by user (Ctrl+C).")
+
+def run(config, context):
+    """Step runner entry point"""
+    apply_config(config)
+    main()
+
+if __name__ == "__main__":
+    main()
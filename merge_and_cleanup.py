@@ -6,16 +6,22 @@ import re
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-import subprocess
+from request_types import ensure_request_type
+import step_runner
 
 # ===== LOAD CONFIG FROM JSON =====
+def apply_config(config, argv):
+    """Settings from the config and step options; run() re-applies them, so the module is imported only once"""
+    global KEEP_COLUMNS, OUTPUT_FILE, AUTO_MODE
+    KEEP_COLUMNS = config["keep_columns"]
+    OUTPUT_FILE = config["output_file"]
+    AUTO_MODE = "--auto" in argv
+
 with open("esaf_config.json", 'r', encoding='utf-8') as f:
     config = json.load(f)
+apply_config(config, sys.argv)
 
-KEEP_COLUMNS = config["keep_columns"]
-OUTPUT_FILE = config["output_file"]
 AUTO_FIT_COLUMN_WIDTH = True
-AUTO_MODE = "--auto" in sys.argv
 
 def clean_value(value):
     """Convert to string and remove ALL non-ASCII characters"""
@@ -167,6 +173,8 @@ def save_to_excel(df, append_mode=False):
         # Final clean before save
         for col in final_df.columns:
             final_df[col] = final_df[col].apply(clean_value)
+        # Classify Create/Modify/Delete once here; Steps 3-5 read the RequestType column
+        final_df = ensure_request_type(final_df)
         final_df.to_excel(OUTPUT_FILE, index=False, engine='openpyxl')
 
         wb = load_workbook(OUTPUT_FILE)
@@ -216,10 +224,18 @@ def main():
     if AUTO_MODE:
         print("\n[AUTO] Triggering Data_Analysis_Split.py...")
         try:
-            subprocess.run([sys.executable, "Data_Analysis_Split.py", "--auto"], check=True)
-            print("[SUCCESS] Step 3 done.")
+            # Same process: Step 3 reuses the pandas/openpyxl already loaded here instead of a fresh interpreter
+            if step_runner.run_step("step3", context={"args": ["--auto"]}):
+                print("[SUCCESS] Step 3 done.")
+            else:
+                print("[ERROR] Step 3 failed.")
         except Exception as e:
             print(f"[ERROR] Step 3 failed: {e}")
 
+def run(config, context):
+    """Step runner entry point: context["args"] takes the command-line options (e.g. ["--auto"])"""
+    apply_config(config, context.get("args", []))
+    main()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
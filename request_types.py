@@ -0,0 +1,42 @@
+"""
+ESAF Request Type Classifier
+Derives the categorical RequestType column once (Step 2) so later steps never rescan Request strings
+"""
+
+import re
+import pandas as pd
+
+REQUEST_TYPES = ["Create", "Modify", "Delete", "Other"]
+REQUEST_TYPE_DTYPE = pd.CategoricalDtype(REQUEST_TYPES)
+
+# First match wins, in this order — a request mentioning both Create and Delete is a Create
+_PATTERNS = [(kind, re.compile(kind)) for kind in REQUEST_TYPES[:-1]]
+
+def classify_request(value):
+    if not isinstance(value, str):
+        return "Other"
+    for kind, pattern in _PATTERNS:
+        if pattern.search(value):
+            return kind
+    return "Other"
+
+def classify_requests(requests):
+    """Classify a Request column — each distinct string is matched once, then mapped"""
+    lookup = {value: classify_request(value) for value in requests.dropna().unique()}
+    return requests.map(lookup).fillna("Other").astype(REQUEST_TYPE_DTYPE)
+
+def ensure_request_type(df):
+    """Make sure df carries a categorical RequestType (derived from Request for older workbooks)"""
+    if "RequestType" in df.columns:
+        known = df["RequestType"].where(df["RequestType"].isin(REQUEST_TYPES), "Other")
+        df["RequestType"] = known.astype(REQUEST_TYPE_DTYPE)
+    elif "Request" in df.columns:
+        df["RequestType"] = classify_requests(df["Request"])
+    return df
+
+def request_type_counts(df):
+    """{type: count} for every RequestType (all zero when the column is missing)"""
+    if "RequestType" not in df.columns:
+        return {kind: 0 for kind in REQUEST_TYPES}
+    counts = df["RequestType"].value_counts()
+    return {kind: int(counts.get(kind, 0)) for kind in REQUEST_TYPES}
@@ -0,0 +1,88 @@
+"""
+ESAF Step Runner
+Imports each step module once and calls its run(config, context) in this process
+"""
+
+import importlib
+import json
+import sys
+import threading
+import time
+
+CONFIG_FILE = "esaf_config.json"
+
+# (module, display name) per step, in workflow order
+STEPS = {
+    "step1": ("esaf_automation", "Step 1: ESAF UI Automation"),
+    "step2": ("merge_and_cleanup", "Step 2: Merge & Cleanup"),
+    "step3": ("Data_Analysis_Split", "Step 3: Assign Requests to Team"),
+    "step4": ("summary_pivot", "Step 4: Summary & Pivot Tables"),
+    "step5": ("Interactive_Dashboard", "Step 5: Interactive Executive Dashboard"),
+    "complete": ("complete_process", "Full End-to-End Process")
+}
+WORKFLOW = ["step1", "step2", "step3", "step4", "step5"]
+
+# Imported before the step modules: together they are most of a step's start-up time
+HEAVY_MODULES = ["numpy", "pandas", "openpyxl", "plotly.io", "jinja2"]
+
+_warm_up_thread = None
+
+def load_config(path=CONFIG_FILE):
+    """Read fresh for every run, so config edits made from the menu apply to already-imported steps"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def import_step(module_name):
+    """The step module: imported (and its bytecode cached) on first use, reused from sys.modules after that"""
+    # Frozen builds carry the step sources in the bundle folder
+    bundle = getattr(sys, '_MEIPASS', None)
+    if bundle and bundle not in sys.path:
+        sys.path.insert(0, bundle)
+    return importlib.import_module(module_name)
+
+def warm_up_modules(steps=WORKFLOW + ["complete"]):
+    """The heavy libraries, then the step modules, in the order warm_up() imports them"""
+    return HEAVY_MODULES + [STEPS[step][0] for step in steps]
+
+def import_all(steps):
+    """Import the heavy libraries, then every step module; failures are left for the real run to report"""
+    for module_name in warm_up_modules(steps):
+        try:
+            import_step(module_name)
+        except Exception:
+            pass
+
+def profile_imports(module_names):
+    """(module, seconds) per import in order, None when it fails; shared dependencies count towards the first module that loads them"""
+    timings = []
+    for module_name in module_names:
+        started = time.perf_counter()
+        try:
+            import_step(module_name)
+        except Exception:
+            timings.append((module_name, None))
+            continue
+        timings.append((module_name, time.perf_counter() - started))
+    return timings
+
+def warm_up(steps=WORKFLOW + ["complete"]):
+    """Start importing everything the steps need on a background thread (once per process)"""
+    global _warm_up_thread
+    if _warm_up_thread is None:
+        _warm_up_thread = threading.Thread(target=import_all, args=(steps,), name="esaf-warm-up", daemon=True)
+        _warm_up_thread.start()
+    return _warm_up_thread
+
+def run_step(step, config=None, context=None):
+    """Call the step's run(config, context); True when it finished, exceptions other than SystemExit propagate"""
+    module_name, _ = STEPS[step]
+    # Let a running warm-up finish rather than import the same packages from two threads at once
+    if _warm_up_thread is not None and _warm_up_thread is not threading.current_thread():
+        _warm_up_thread.join()
+    module = import_step(module_name)
+    try:
+        module.run(load_config() if config is None else config, context or {})
+    except SystemExit as e:
+        # Steps still sys.exit() on fatal errors; only a non-zero code is a failure
+        return e.code in (None, 0)
+    return True
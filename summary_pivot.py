@@ -5,151 +5,129 @@ from openpyxl.utils import get_column_letter
 import sys
 import os
 import json
+from request_types import REQUEST_TYPES
+from aggregates import build_cube, empty_cube, load_sidecar, restamp_sidecar
 
 # ===== LOAD CONFIG FROM JSON =====
+def apply_config(config, argv):
+    """Settings from the config and step options; run() re-applies them, so the module is imported only once"""
+    global ASSIGNEES, ASSIGNEE_PROFILES, MAX_PER_PERSON, AUTO_MODE
+    ASSIGNEES = config["assignees"]
+    ASSIGNEE_PROFILES = config.get("assignee_profiles", {})
+    MAX_PER_PERSON = config["rules"]["max_per_person_domestic"]
+    AUTO_MODE = "--auto" in argv
+
 with open("esaf_config.json", 'r', encoding='utf-8') as f:
     config = json.load(f)
-
-ASSIGNEES = config["assignees"]
+apply_config(config, sys.argv)
 
 # ===== CONFIG =====
-AUTO_MODE = "--auto" in sys.argv
+WORKBOOK = "Today_Assignment.xlsx"
+DATA_SHEETS = ["HCA_India", "HCA_Domestic", "HCA_EXTRA_DATA"]
 
-def load_data():
-    """Load HCA_India, HCA_Domestic, and HCA_EXTRA_DATA (if exists) — SAFE"""
-    if not os.path.exists("Today_Assignment.xlsx"):
+def load_cubes():
+    """Count cubes for HCA_India, HCA_Domestic, HCA_EXTRA_DATA — from Step 3's sidecar when it is current, else from rows"""
+    if not os.path.exists(WORKBOOK):
         print("[ERROR] Today_Assignment.xlsx not found. Run step3_assign_split.py first.")
-        return None, None, None
+        return None, False
 
+    sidecar = load_sidecar(WORKBOOK) or {}
     try:
-        wb = load_workbook("Today_Assignment.xlsx")
-        sheet_names = wb.sheetnames
-
-        # Load HCA_India (or empty)
-        if "HCA_India" in sheet_names:
-            india_df = pd.read_excel("Today_Assignment.xlsx", sheet_name="HCA_India")
-        else:
-            india_df = pd.DataFrame()
-
-        # Load HCA_Domestic (or empty)
-        if "HCA_Domestic" in sheet_names:
-            domestic_df = pd.read_excel("Today_Assignment.xlsx", sheet_name="HCA_Domestic")
-        else:
-            domestic_df = pd.DataFrame()
-
-        # Load HCA_EXTRA_DATA (or empty)
-        if "HCA_EXTRA_DATA" in sheet_names:
-            extra_df = pd.read_excel("Today_Assignment.xlsx", sheet_name="HCA_EXTRA_DATA")
-        else:
-            extra_df = pd.DataFrame()
-
-        print(f"[INFO] Loaded  India={len(india_df)}, Domestic={len(domestic_df)}, Extra={len(extra_df)}")
-        return india_df, domestic_df, extra_df
+        cubes = []
+        with pd.ExcelFile(WORKBOOK) as xls:
+            for sheet in DATA_SHEETS:
+                if sheet in sidecar:
+                    cubes.append(sidecar[sheet])
+                elif sheet in xls.sheet_names:
+                    cubes.append(build_cube(pd.read_excel(xls, sheet_name=sheet)))
+                else:
+                    cubes.append(empty_cube())
+
+        source = "aggregate sidecar" if sidecar else "sheet rows"
+        india, domestic, extra = (int(cube["Count"].sum()) for cube in cubes)
+        print(f"[INFO] Loaded  India={india}, Domestic={domestic}, Extra={extra} (from {source})")
+        return cubes, bool(sidecar)
 
     except Exception as e:
         print(f"[ERROR] Failed to load: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-def create_summary_sheet(india_df, domestic_df, extra_df):
+        return [empty_cube(), empty_cube(), empty_cube()], False
+
+def get_capacity(assignee):
+    """Same rule as Step 3: max_per_person_domestic scaled by the profile's capacity_weight"""
+    weight = ASSIGNEE_PROFILES.get(assignee, {}).get("capacity_weight", 1.0)
+    return max(int(MAX_PER_PERSON * weight + 0.5), 0)
+
+def format_utilisation(load, capacity):
+    pct = (load / capacity * 100) if capacity > 0 else 0
+    return f"{load}/{capacity} ({pct:.0f}%)"
+
+def combine_assigned(india_cube, domestic_cube):
+    """Both assigned cubes in one frame, tagged with their Bucket"""
+    frames = [cube.assign(Bucket=bucket) for bucket, cube in [("India", india_cube), ("Domestic", domestic_cube)]
+              if not cube.empty]
+    if not frames:
+        return empty_cube().assign(Bucket=None)
+    return pd.concat(frames, ignore_index=True)
+
+def sum_counts(cube, index, columns):
+    """Count totals as an index x columns table (missing combinations are 0)"""
+    if cube.empty:
+        return pd.DataFrame(0, index=pd.Index([], name=index), columns=pd.Index([], name=columns))
+    return cube.groupby([index, columns])["Count"].sum().unstack(fill_value=0)
+
+def create_summary_sheet(india_cube, domestic_cube, extra_cube):
     """Create Summary sheet — works even if all are empty"""
     summary_data = []
 
-    total_india = len(india_df)
-    total_domestic = len(domestic_df)
-    total_extra = len(extra_df)
+    total_india = int(india_cube["Count"].sum())
+    total_domestic = int(domestic_cube["Count"].sum())
+    total_extra = int(extra_cube["Count"].sum())
     total_all = total_india + total_domestic + total_extra
 
     summary_data.append(["TOTAL REQUESTS", "India", "Domestic", "Extra", "All"])
     summary_data.append(["Count", total_india, total_domestic, total_extra, total_all])
 
+    combined = combine_assigned(india_cube, domestic_cube)
+
     summary_data.append([])
-    summary_data.append(["ASSIGNEE LOAD", "India", "Domestic", "Total"])
-    for assignee in ASSIGNEES:
-        india_count = len(india_df[india_df['Assignee'] == assignee]) if not india_df.empty else 0
-        domestic_count = len(domestic_df[domestic_df['Assignee'] == assignee]) if not domestic_df.empty else 0
+    summary_data.append(["ASSIGNEE LOAD", "India", "Domestic", "Total", "Utilisation"])
+    loads = sum_counts(combined, "Assignee", "Bucket").reindex(
+        index=ASSIGNEES, columns=["India", "Domestic"], fill_value=0
+    )
+    for assignee, india_count, domestic_count in zip(ASSIGNEES, loads["India"].tolist(), loads["Domestic"].tolist()):
         total = india_count + domestic_count
-        summary_data.append([assignee, india_count, domestic_count, total])
+        summary_data.append([assignee, india_count, domestic_count, total, format_utilisation(total, get_capacity(assignee))])
 
     summary_data.append([])
     summary_data.append(["APPLICATIONS", "Create", "Modify", "Delete", "Total"])
 
-    all_apps = set()
-    if not india_df.empty and 'Application' in india_df.columns:
-        all_apps.update(india_df['Application'].dropna().unique())
-    if not domestic_df.empty and 'Application' in domestic_df.columns:
-        all_apps.update(domestic_df['Application'].dropna().unique())
-
-    create_total = 0
-    modify_total = 0
-    delete_total = 0
-    grand_total = 0
-
-    for app in sorted(all_apps):
-        create_count = 0
-        modify_count = 0
-        delete_count = 0
-
-        if not india_df.empty and 'Request' in india_df.columns:
-            app_mask = india_df['Application'] == app
-            for req in india_df[app_mask]['Request'].dropna():
-                if 'Create' in req:
-                    create_count += 1
-                elif 'Modify' in req:
-                    modify_count += 1
-                elif 'Delete' in req:
-                    delete_count += 1
-
-        if not domestic_df.empty and 'Request' in domestic_df.columns:
-            app_mask = domestic_df['Application'] == app
-            for req in domestic_df[app_mask]['Request'].dropna():
-                if 'Create' in req:
-                    create_count += 1
-                elif 'Modify' in req:
-                    modify_count += 1
-                elif 'Delete' in req:
-                    delete_count += 1
-
-        total_app = create_count + modify_count + delete_count
-        summary_data.append([app, create_count, modify_count, delete_count, total_app])
-        create_total += create_count
-        modify_total += modify_count
-        delete_total += delete_count
-        grand_total += total_app
-
-    summary_data.append(["GrandFull Total", create_total, modify_total, delete_total, grand_total])
+    all_apps = sorted(combined["Application"].dropna().unique())
+    counted_types = REQUEST_TYPES[:-1]  # "Other" is left out of the table
+    typed = combined["RequestType"].isin(counted_types)
+    counts = sum_counts(combined[typed], "Application", "RequestType").reindex(
+        index=all_apps, columns=counted_types, fill_value=0
+    )
+    counts["Total"] = counts.sum(axis=1)
+
+    for app, row in zip(all_apps, counts.to_numpy().tolist()):
+        summary_data.append([app] + row)
+
+    summary_data.append(["GrandFull Total"] + counts.sum(axis=0).tolist())
     return pd.DataFrame(summary_data[1:], columns=summary_data[0])
 
-def create_pivot_tables(india_df, domestic_df):
+def create_pivot_tables(india_cube, domestic_cube):
     """Create Pivot Tables — handles empty DataFrames"""
-    all_assignees = ASSIGNEES
-
-    # India Pivot
-    if not india_df.empty and 'Application' in india_df.columns and 'Assignee' in india_df.columns:
-        india_pivot = india_df.pivot_table(
-            index='Application',
-            columns='Assignee',
-            aggfunc='size',
-            fill_value=0
-        ).reindex(columns=all_assignees, fill_value=0)
-        india_pivot['Grand Total'] = india_pivot.sum(axis=1)
-        india_pivot = india_pivot.reset_index()
-    else:
-        india_pivot = pd.DataFrame(columns=['Application'] + all_assignees + ['Grand Total'])
-
-    # Domestic Pivot
-    if not domestic_df.empty and 'Application' in domestic_df.columns and 'Assignee' in domestic_df.columns:
-        domestic_pivot = domestic_df.pivot_table(
-            index='Application',
-            columns='Assignee',
-            aggfunc='size',
-            fill_value=0
-        ).reindex(columns=all_assignees, fill_value=0)
-        domestic_pivot['Grand Total'] = domestic_pivot.sum(axis=1)
-        domestic_pivot = domestic_pivot.reset_index()
-    else:
-        domestic_pivot = pd.DataFrame(columns=['Application'] + all_assignees + ['Grand Total'])
-
-    return india_pivot, domestic_pivot
+    return cube_pivot(india_cube), cube_pivot(domestic_cube)
+
+def cube_pivot(cube):
+    """Application x Assignee counts with a Grand Total column"""
+    columns = ['Application'] + ASSIGNEES + ['Grand Total']
+    owned = cube[cube["Application"].notna() & cube["Assignee"].notna()]
+    if owned.empty:
+        return pd.DataFrame(columns=columns)
+    pivot = sum_counts(owned, "Application", "Assignee").reindex(columns=ASSIGNEES, fill_value=0)
+    pivot['Grand Total'] = pivot.sum(axis=1)
+    return pivot.reset_index()[columns]
 
 def apply_styling(worksheet, title=""):
     header_fill = PatternFill(start_color="2E5984", end_color="2E5984", fill_type="solid")
@@ -195,11 +173,44 @@ def auto_fit_columns(worksheet):
         width = max(max_length + 2, 25) if column_letter == 'A' else min(max_length + 2, 20)
         worksheet.column_dimensions[column_letter].width = width
 
+def build_pivot_sheet(india_pivot, domestic_pivot):
+    """Stack labelled India/Domestic sections with subtotals, grand total, capacity and utilisation rows"""
+    value_columns = ASSIGNEES + ['Grand Total']
+    columns = ['Application'] + value_columns
+    rows = []
+    section_rows = []
+    total_rows = []
+    grand_total = pd.Series(0, index=value_columns)
+
+    if india_pivot.empty and domestic_pivot.empty:
+        return pd.DataFrame(columns=columns), section_rows, total_rows
+
+    for label, pivot in [("HCA INDIA", india_pivot), ("HCA DOMESTIC", domestic_pivot)]:
+        section_rows.append(len(rows))
+        rows.append([label] + [None] * len(value_columns))
+        rows.extend(pivot[columns].values.tolist())
+        subtotal = pivot[value_columns].sum().reindex(value_columns, fill_value=0).astype(int)
+        grand_total += subtotal
+        total_rows.append(len(rows))
+        rows.append([f"{label.split()[-1].title()} Subtotal"] + subtotal.tolist())
+
+    rows.append([None] * len(columns))
+    capacities = [get_capacity(assignee) for assignee in ASSIGNEES]
+    capacities.append(sum(capacities))
+    utilisation = [round(load / capacity * 100, 1) if capacity else 0
+                   for load, capacity in zip(grand_total.tolist(), capacities)]
+    for label, values in [("GrandFull Total", grand_total.tolist()), ("Capacity", capacities), ("Utilisation %", utilisation)]:
+        total_rows.append(len(rows))
+        rows.append([label] + values)
+
+    return pd.DataFrame(rows, columns=columns, dtype=object), section_rows, total_rows
+
 def save_to_sheets(summary_df, india_pivot, domestic_pivot):
+    pivot_df, section_rows, total_rows = build_pivot_sheet(india_pivot, domestic_pivot)
     with pd.ExcelWriter("Today_Assignment.xlsx", engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
         summary_df.to_excel(writer, sheet_name="Summary", index=False)
-        combined_pivot = pd.concat([india_pivot, domestic_pivot], ignore_index=True)
-        combined_pivot.to_excel(writer, sheet_name="Pivot", index=False)
+        # Row 1 is left for the sheet title, so the header lands on row 2
+        pivot_df.to_excel(writer, sheet_name="Pivot", index=False, startrow=1)
 
     wb = load_workbook("Today_Assignment.xlsx")
 
@@ -218,20 +229,16 @@ def save_to_sheets(summary_df, india_pivot, domestic_pivot):
         apply_styling(ws, "HCA INDIA & DOMESTIC PIVOT TABLES")
         auto_fit_columns(ws)
 
-        last_row = ws.max_row
-        last_col = ws.max_column
-        if last_row >= 2:  # Only add total if there's data
-            grand_total_row = last_row + 2
-            ws.cell(row=grand_total_row, column=1, value="GrandFull Total")
-            total_sum = 0
-            for col in range(2, last_col):
-                col_sum = sum(ws.cell(row=r, column=col).value or 0 for r in range(2, last_row + 1))
-                ws.cell(row=grand_total_row, column=col, value=col_sum)
-                total_sum += col_sum
-            ws.cell(row=grand_total_row, column=last_col, value=total_sum)
-
+        # Frame row i sits on sheet row i + 3 (title, header)
+        last_col = len(pivot_df.columns)
+        for idx in section_rows:
             for col in range(1, last_col + 1):
-                cell = ws.cell(row=grand_total_row, column=col)
+                cell = ws.cell(row=idx + 3, column=col)
+                cell.font = Font(bold=True, color="FFFFFF")
+                cell.fill = PatternFill(start_color="1E3A5F", end_color="1E3A5F", fill_type="solid")
+        for idx in total_rows:
+            for col in range(1, last_col + 1):
+                cell = ws.cell(row=idx + 3, column=col)
                 cell.font = Font(bold=True, color="2E5984")
                 cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
 
@@ -242,16 +249,25 @@ def main():
     print("[INFO] STEP 4: EXECUTIVE SUMMARY & PIVOT TABLES")
     print("=" * 50)
 
-    india_df, domestic_df, extra_df = load_data()
-    if india_df is None:
+    cubes, from_sidecar = load_cubes()
+    if cubes is None:
         return
 
-    summary_df = create_summary_sheet(india_df, domestic_df, extra_df)
-    india_pivot, domestic_pivot = create_pivot_tables(india_df, domestic_df)
+    india_cube, domestic_cube, extra_cube = cubes
+    summary_df = create_summary_sheet(india_cube, domestic_cube, extra_cube)
+    india_pivot, domestic_pivot = create_pivot_tables(india_cube, domestic_cube)
     save_to_sheets(summary_df, india_pivot, domestic_pivot)
+    if from_sidecar:
+        # Summary/Pivot do not change the sheets the sidecar covers, so keep it valid for Step 5
+        restamp_sidecar(WORKBOOK)
 
     print("\n[SUCCESS] STEP 4 COMPLETED — EXECUTIVE DASHBOARD READY!")
     print("[INFO] Summary and Pivot sheets created successfully.")
 
+def run(config, context):
+    """Step runner entry point: context["args"] takes the command-line options (e.g. ["--auto"])"""
+    apply_config(config, context.get("args", []))
+    main()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+function exportExecutiveReport() {
+    // Simulate report export
+    alert('Executive Report exported successfully!\nThe report has been saved in your downloads folder.');
+    console.log('Exporting executive report...');
+}
+
+// Real-time executive dashboard updates
+function updateExecutiveDashboard() {
+    const now = new Date();
+    const timeElement = document.getElementById('currentTime');
+    if (timeElement) {
+        timeElement.textContent = 
+            now.toLocaleString('en-US', { 
+                weekday: 'long',
+                year: 'numeric',
+                month: 'long',
+                day: 'numeric',
+                hour: '2-digit',
+                minute: '2-digit'
+            });
+    }
+}
+
+// Served pages (--serve): fetch one section and swap it in for its placeholder
+function esafLoadSection(placeholder) {
+    fetch(placeholder.dataset.src, { cache: 'no-cache' })
+        .then(response => response.json())
+        .then(payload => {
+            // Rendered for a newer workbook than this page: reload rather than mix two versions
+            if (payload.stamp !== placeholder.dataset.stamp) {
+                location.reload();
+                return;
+            }
+            const holder = document.createElement('div');
+            holder.innerHTML = payload.html;
+            const section = holder.firstElementChild;
+            if (!section) {
+                placeholder.remove();
+                return;
+            }
+            placeholder.replaceWith(section);
+            // Scripts added through innerHTML never run; fresh copies do (the esafPlot calls)
+            section.querySelectorAll('script:not([type])').forEach(old => {
+                const script = document.createElement('script');
+                script.textContent = old.textContent;
+                old.replaceWith(script);
+            });
+            esafSectionAdded(section);
+        })
+        .catch(() => {
+            placeholder.querySelector('.sheet-loading').textContent = 'Could not load this section - refresh to retry';
+        });
+}
+
+// Sections are only fetched (and rendered on the server) as they come near the viewport
+function esafLoadPendingSections() {
+    const pending = document.querySelectorAll('.sheet-pending');
+    if (!('IntersectionObserver' in window)) {
+        pending.forEach(esafLoadSection);
+        return;
+    }
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            observer.unobserve(entry.target);
+            esafLoadSection(entry.target);
+        });
+    }, { rootMargin: '600px 0px' });
+    pending.forEach(placeholder => observer.observe(placeholder));
+}
+
+// Add executive dashboard enhancements
+document.addEventListener('DOMContentLoaded', function() {
+    esafLoadPendingSections();
+
+    // Smooth loading animations
+    const elements = document.querySelectorAll('.chart-card, .kpi-card');
+    elements.forEach((element, index) => {
+        element.style.opacity = '0';
+        element.style.transform = 'translateY(20px)';
+        setTimeout(() => {
+            element.style.transition = 'all 0.5s ease';
+            element.style.opacity = '1';
+            element.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+
+    // Add executive tooltips
+    const kpiCards = document.querySelectorAll('.kpi-card');
+    kpiCards.forEach(card => {
+        card.addEventListener('click', function() {
+            const type = this.classList[1];
+            const insights = {
+                'total': 'Total number of access requests across all applications',
+                'apps': 'Number of unique applications with pending requests',
+                'create': 'New access provisioning requests',
+                'modify': 'Access modification and update requests',
+                'delete': 'Access removal and deprovisioning requests'
+            };
+            alert('Executive Insight: ' + (insights[type] || 'Key performance indicator'));
+        });
+    });
+
+    // Initialize and start the clock
+    updateExecutiveDashboard();
+    setInterval(updateExecutiveDashboard, 60000); // Update every minute
+});
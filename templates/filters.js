@@ -0,0 +1,419 @@
+var ESAF_SHEETS = null;
+
+function esafSheets() {
+    if (ESAF_SHEETS === null) {
+        ESAF_SHEETS = [];
+        document.querySelectorAll('script.sheet-data').forEach(function (node) {
+            var sheet = JSON.parse(node.textContent);
+            sheet.section = node.closest('.sheet-section');
+            sheet.postings = {};
+            ESAF_SHEETS.push(sheet);
+        });
+    }
+    return ESAF_SHEETS;
+}
+
+// Row ids per code of one column (ascending), built on first use
+function esafPostings(sheet, column) {
+    if (!sheet.postings[column]) {
+        var codes = sheet[column], lists = [];
+        for (var i = 0; i < codes.length; i++) {
+            if (codes[i] >= 0) (lists[codes[i]] = lists[codes[i]] || []).push(i);
+        }
+        sheet.postings[column] = lists;
+    }
+    return sheet.postings[column];
+}
+
+// Rows matching every filter, in cube order; the smallest posting list seeds the scan
+function esafSelectRows(sheet, filters) {
+    var conditions = [];
+    var dimensions = [['app', 'apps'], ['type', 'types'], ['assignee', 'assignees']];
+    for (var d = 0; d < dimensions.length; d++) {
+        var value = filters[dimensions[d][0]];
+        if (value === null) continue;
+        var code = sheet[dimensions[d][1]].indexOf(value);
+        if (code < 0) return [];
+        conditions.push({column: dimensions[d][0], code: code, rows: esafPostings(sheet, dimensions[d][0])[code] || []});
+    }
+    var fromCode = -1;
+    if (filters.fromDay !== null) {
+        var lo = 0, hi = sheet.days.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (sheet.days[mid] < filters.fromDay) lo = mid + 1; else hi = mid;
+        }
+        fromCode = lo;
+    }
+    conditions.sort(function (a, b) { return a.rows.length - b.rows.length; });
+    var seed = conditions.length ? conditions.shift().rows : null;
+    var total = seed ? seed.length : sheet.count.length;
+    var selected = [];
+    for (var k = 0; k < total; k++) {
+        var row = seed ? seed[k] : k;
+        var keep = fromCode < 0 || sheet.requestDay[row] >= fromCode;
+        for (var c = 0; keep && c < conditions.length; c++) {
+            keep = sheet[conditions[c].column][row] === conditions[c].code;
+        }
+        if (keep) selected.push(row);
+    }
+    return selected;
+}
+
+// The same totals the Python chart builders take from the cube, over the selected rows only
+function esafAggregate(sheet, rows) {
+    var result = {total: 0, types: {}, apps: new Map(), appTypes: new Map(), requestDay: new Map(), updatedDay: new Map()};
+    rows.forEach(function (row) {
+        var count = sheet.count[row];
+        var type = sheet.type[row] >= 0 ? sheet.types[sheet.type[row]] : null;
+        result.total += count;
+        if (type !== null) result.types[type] = (result.types[type] || 0) + count;
+        if (sheet.app[row] >= 0) {
+            var app = sheet.apps[sheet.app[row]];
+            result.apps.set(app, (result.apps.get(app) || 0) + count);
+            if (!result.appTypes.has(app)) result.appTypes.set(app, {});
+            if (type !== null) result.appTypes.get(app)[type] = (result.appTypes.get(app)[type] || 0) + count;
+        }
+        ['requestDay', 'updatedDay'].forEach(function (column) {
+            var day = sheet[column][row];
+            if (day >= 0) result[column].set(day, (result[column].get(day) || 0) + count);
+        });
+    });
+    return result;
+}
+
+function esafTopApps(agg, limit) {
+    // Array.sort is stable, so ties keep first-appearance order like the Python stable sort
+    return Array.from(agg.apps.entries()).sort(function (a, b) { return b[1] - a[1]; }).slice(0, limit);
+}
+
+function esafShare(part, total) {
+    return total > 0 ? part / total * 100 : 0;
+}
+
+// Per calendar day from the first to the last day seen, days without requests count as 0
+function esafDailySeries(sheet, byDay) {
+    var codes = Array.from(byDay.keys()).sort(function (a, b) { return a - b; });
+    var dates = [], counts = [];
+    if (!codes.length) return {dates: dates, counts: counts};
+    var byDate = {};
+    codes.forEach(function (code) { byDate[sheet.days[code]] = byDay.get(code); });
+    var day = new Date(sheet.days[codes[0]] + 'T00:00:00Z');
+    var last = new Date(sheet.days[codes[codes.length - 1]] + 'T00:00:00Z');
+    for (; day <= last; day.setUTCDate(day.getUTCDate() + 1)) {
+        var key = day.toISOString().slice(0, 10);
+        dates.push(key);
+        counts.push(byDate[key] || 0);
+    }
+    return {dates: dates, counts: counts};
+}
+
+function esafMovingAverage(values, window) {
+    var out = [], sum = 0;
+    for (var i = 0; i < values.length; i++) {
+        sum += values[i];
+        if (i >= window) sum -= values[i - window];
+        out.push(sum / Math.min(i + 1, window));
+    }
+    return out;
+}
+
+// Largest-triangle-three-buckets, same as lttb_indices in the generator
+function esafLttb(values, threshold) {
+    var n = values.length, picked = [];
+    if (threshold < 3 || n <= threshold) {
+        for (var i = 0; i < n; i++) picked.push(i);
+        return picked;
+    }
+    var every = (n - 2) / (threshold - 2), a = 0;
+    picked.push(0);
+    for (var b = 0; b < threshold - 2; b++) {
+        var start = Math.floor(b * every) + 1, end = Math.floor((b + 1) * every) + 1;
+        var nextEnd = Math.min(Math.floor((b + 2) * every) + 1, n);
+        var avgX = 0, avgY = 0;
+        for (var j = end; j < nextEnd; j++) { avgX += j; avgY += values[j]; }
+        avgX /= nextEnd - end;
+        avgY /= nextEnd - end;
+        var best = start, bestArea = -1;
+        for (var r = start; r < end; r++) {
+            var area = Math.abs((a - avgX) * (values[r] - values[a]) - (a - r) * (avgY - values[a]));
+            if (area > bestArea) { bestArea = area; best = r; }
+        }
+        a = best;
+        picked.push(a);
+    }
+    picked.push(n - 1);
+    return picked;
+}
+
+function esafPick(values, indices) {
+    return indices.map(function (i) { return values[i]; });
+}
+
+// New {data, layout} for one chart: the original figure keeps every style, only the numbers change
+function esafChartSpec(key, base, sheet, agg) {
+    var data = JSON.parse(JSON.stringify(base.data));
+    var layout = JSON.parse(JSON.stringify(base.layout));
+    if (key === 'donut') {
+        data[0].values = ['Create', 'Modify', 'Delete', 'Other'].map(function (type) { return agg.types[type] || 0; });
+    } else if (key === 'top_apps') {
+        var top = esafTopApps(agg, 10);
+        data[0].y = top.map(function (item) { return item[0]; });
+        data[0].x = top.map(function (item) { return item[1]; });
+        data[0].text = top.map(function (item) { return String(item[1]); });
+        layout.height = Math.max(400, top.length * 40);
+    } else if (key === 'workload') {
+        var top8 = esafTopApps(agg, 8);
+        var total = top8.reduce(function (sum, item) { return sum + item[1]; }, 0);
+        data[0].x = top8.map(function (item) { return item[0]; });
+        data[0].y = top8.map(function (item) { return item[1]; });
+        data[0].text = top8.map(function (item) { return esafShare(item[1], total).toFixed(1) + '%'; });
+    } else if (key === 'priority') {
+        var top15 = esafTopApps(agg, 15);
+        var apps = top15.map(function (item) { return item[0]; });
+        var totals = top15.map(function (item) { return item[1]; });
+        var risks = apps.map(function (app) {
+            var types = agg.appTypes.get(app), total = agg.apps.get(app);
+            return total > 0 ? ((types.Create || 0) + (types.Modify || 0) * 2 + (types.Delete || 0) * 3) / total : 0;
+        });
+        var largest = Math.max.apply(null, totals.concat([0]));
+        data[0].x = totals;
+        data[0].y = risks;
+        data[0].text = apps;
+        data[0].marker.size = totals.map(function (total) { return total / largest * 50 + 20; });
+        data[0].marker.color = risks;
+    } else if (key === 'trend') {
+        var traces = [];
+        ['requestDay', 'updatedDay'].forEach(function (column) {
+            var group = column === 'requestDay' ? 'RequestDay' : 'UpdatedDay';
+            var styles = data.filter(function (trace) { return trace.legendgroup === group; });
+            var series = esafDailySeries(sheet, agg[column]);
+            if (!styles.length || !series.dates.length) return;
+            var keep = esafLttb(series.counts, ESAF_CHART_CONFIG.trendMaxPoints);
+            traces.push(Object.assign(styles[0], {x: esafPick(series.dates, keep), y: esafPick(series.counts, keep)}));
+            if (styles.length > 1 && series.counts.length > 7) {
+                var average = esafMovingAverage(series.counts, 7);
+                keep = esafLttb(average, ESAF_CHART_CONFIG.trendMaxPoints);
+                traces.push(Object.assign(styles[1], {x: esafPick(series.dates, keep), y: esafPick(average, keep)}));
+            }
+        });
+        data = traces;
+    }
+    return {data: data, layout: layout};
+}
+
+function esafEscape(text) {
+    return String(text).replace(/[&<>"']/g, function (ch) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'}[ch];
+    });
+}
+
+function esafUpdateKpis(section, agg) {
+    var values = {total: agg.total, apps: agg.apps.size, create: agg.types.Create || 0,
+                  modify: agg.types.Modify || 0, delete: agg.types.Delete || 0};
+    Object.keys(values).forEach(function (name) {
+        var value = section.querySelector('[data-kpi="' + name + '"]');
+        if (value) value.textContent = values[name];
+        var share = section.querySelector('[data-kpi-share="' + name + '"]');
+        if (share) share.textContent = esafShare(values[name], agg.total).toFixed(1) + '% of total';
+    });
+}
+
+// Application table: the full list lives in table.data, sorting and search only reorder
+// indices into it and the DOM holds just the rows around the scroll position
+function esafTable(root) {
+    if (!root._esafTable) {
+        root._esafTable = {data: JSON.parse(root.querySelector('script.summary-data').textContent),
+                           sortKey: 'total', descending: true, query: '', order: [], rowHeight: 0};
+        esafTableOrder(root._esafTable);
+    }
+    return root._esafTable;
+}
+
+function esafTableValue(data, key, i) {
+    if (key === 'app') return data.apps[i].toLowerCase();
+    if (key === 'total') return data.total[i];
+    return esafShare(data[key][i], data.total[i]);
+}
+
+function esafTableOrder(table) {
+    var data = table.data, query = table.query.trim().toLowerCase(), order = [];
+    for (var i = 0; i < data.apps.length; i++) {
+        if (!query || data.apps[i].toLowerCase().indexOf(query) >= 0) order.push(i);
+    }
+    var key = table.sortKey, sign = table.descending ? -1 : 1;
+    // Rows arrive largest first, so ties fall back to volume order
+    order.sort(function (a, b) {
+        var x = esafTableValue(data, key, a), y = esafTableValue(data, key, b);
+        return x < y ? -sign : x > y ? sign : a - b;
+    });
+    table.order = order;
+}
+
+function esafTableRow(data, i) {
+    var colors = ESAF_CHART_CONFIG.typeColors, app = esafEscape(data.apps[i]), total = data.total[i];
+    return '<tr class="summary-row"><td title="' + app + '"><strong>' + app + '</strong></td><td>' + total + '</td>' +
+        [['Create', 'create'], ['Modify', 'modify'], ['Delete', 'delete']].map(function (type) {
+            return '<td style="color: ' + colors[type[0]] + '">' + esafShare(data[type[1]][i], total).toFixed(1) + '%</td>';
+        }).join('') + '</tr>';
+}
+
+function esafRenderTable(root) {
+    var table = esafTable(root), settings = ESAF_CHART_CONFIG.table;
+    var viewport = root.querySelector('.table-viewport'), body = root.querySelector('tbody.summary-rows');
+    var height = table.rowHeight || settings.rowHeight, count = table.order.length;
+    var inView = Math.ceil((viewport.clientHeight || settings.visibleRows * height) / height);
+    var start = Math.max(0, Math.floor(viewport.scrollTop / height) - settings.overscan);
+    var stop = Math.min(count, start + inView + 2 * settings.overscan);
+    var spacer = function (rows) { return '<tr class="table-spacer"><td colspan="5" style="height: ' + rows * height + 'px"></td></tr>'; };
+    var html = start > 0 ? spacer(start) : '';
+    for (var k = start; k < stop; k++) html += esafTableRow(table.data, table.order[k]);
+    if (stop < count) html += spacer(count - stop);
+    body.innerHTML = count ? html : '<tr><td colspan="5" class="table-empty">No applications match</td></tr>';
+    if (!table.rowHeight && stop > start) {
+        // Spacers are sized from the real row height once a row has been laid out
+        var measured = body.querySelector('tr.summary-row').getBoundingClientRect().height;
+        if (measured > 0) {
+            table.rowHeight = measured;
+            if (Math.abs(measured - height) > 0.5) return esafRenderTable(root);
+        }
+    }
+    var all = table.data.apps.length;
+    root.querySelector('.table-count').textContent = (count === all ? all : count + ' of ' + all) + ' applications';
+    root.querySelectorAll('th[data-sort]').forEach(function (th) {
+        if (th.dataset.sort === table.sortKey) th.setAttribute('aria-sort', table.descending ? 'descending' : 'ascending');
+        else th.removeAttribute('aria-sort');
+    });
+}
+
+function esafInitTable(root) {
+    var table = esafTable(root), viewport = root.querySelector('.table-viewport'), pending = false;
+    viewport.addEventListener('scroll', function () {
+        if (pending) return;
+        pending = true;
+        requestAnimationFrame(function () { pending = false; esafRenderTable(root); });
+    });
+    root.querySelector('.table-search').addEventListener('input', function (event) {
+        table.query = event.target.value;
+        esafTableOrder(table);
+        viewport.scrollTop = 0;
+        esafRenderTable(root);
+    });
+    root.querySelectorAll('th[data-sort]').forEach(function (th) {
+        th.addEventListener('click', function () {
+            var key = th.dataset.sort;
+            // Names start A-Z, numbers start with the largest
+            table.descending = key === table.sortKey ? !table.descending : key !== 'app';
+            table.sortKey = key;
+            esafTableOrder(table);
+            viewport.scrollTop = 0;
+            esafRenderTable(root);
+        });
+    });
+    esafRenderTable(root);
+}
+
+function esafUpdateTable(section, agg) {
+    var root = section.querySelector('.summary-table-section');
+    if (!root) return;
+    var table = esafTable(root), apps = esafTopApps(agg, Infinity);
+    var typeColumn = function (type) { return apps.map(function (item) { return agg.appTypes.get(item[0])[type] || 0; }); };
+    table.data = {apps: apps.map(function (item) { return item[0]; }), total: apps.map(function (item) { return item[1]; }),
+                  create: typeColumn('Create'), modify: typeColumn('Modify'), delete: typeColumn('Delete')};
+    esafTableOrder(table);
+    root.querySelector('.table-viewport').scrollTop = 0;
+    esafRenderTable(root);
+}
+
+function esafCurrentFilters(sheets) {
+    var value = function (id) { var v = document.getElementById(id).value; return v === 'all' ? null : v; };
+    var filters = {app: value('applicationFilter'), type: value('requestTypeFilter'),
+                   assignee: value('assigneeFilter'), fromDay: null};
+    var frame = value('timeFrameFilter');
+    if (frame !== null) {
+        // "Last N days" counts back from the newest request date in the workbook, not from today
+        // (sheet.days also holds update dates, so take the newest code that appears in requestDay)
+        var newest = '';
+        sheets.forEach(function (sheet) {
+            var code = -1;
+            for (var row = 0; row < sheet.requestDay.length; row++) if (sheet.requestDay[row] > code) code = sheet.requestDay[row];
+            if (code >= 0 && sheet.days[code] > newest) newest = sheet.days[code];
+        });
+        if (newest) {
+            var from = new Date(newest + 'T00:00:00Z');
+            from.setUTCDate(from.getUTCDate() - (parseInt(frame, 10) - 1));
+            filters.fromDay = from.toISOString().slice(0, 10);
+        }
+    }
+    return filters;
+}
+
+function applyExecutiveFilters() {
+    var started = performance.now();
+    var sheets = esafSheets();
+    var filters = esafCurrentFilters(sheets);
+    var shown = 0, total = 0;
+    sheets.forEach(function (sheet) {
+        var agg = esafAggregate(sheet, esafSelectRows(sheet, filters));
+        shown += agg.total;
+        total += sheet.count.reduce(function (sum, count) { return sum + count; }, 0);
+        esafUpdateKpis(sheet.section, agg);
+        esafUpdateTable(sheet.section, agg);
+        sheet.section.querySelectorAll('[data-chart]').forEach(function (element) {
+            if (!element._esafBase) return;
+            var spec = esafChartSpec(element.dataset.chart, element._esafBase, sheet, agg);
+            if (spec.layout.height) element.parentNode.style.height = spec.layout.height + 'px';
+            esafReplot(element, spec.data, spec.layout);
+        });
+    });
+    document.getElementById('filterStatus').textContent =
+        'Showing ' + shown + ' of ' + total + ' requests across ' + sheets.length + ' sheets (' +
+        Math.round(performance.now() - started) + ' ms)';
+}
+
+function resetExecutiveFilters() {
+    ['timeFrameFilter', 'requestTypeFilter', 'applicationFilter', 'assigneeFilter'].forEach(function (id) {
+        document.getElementById(id).value = 'all';
+    });
+    applyExecutiveFilters();
+}
+
+// Application/assignee lists: every name in the loaded sheets, sorted, keeping the current selection
+function esafFillFilterOptions(sheets) {
+    [['applicationFilter', 'apps'], ['assigneeFilter', 'assignees']].forEach(function (pair) {
+        var names = new Set();
+        sheets.forEach(function (sheet) { sheet[pair[1]].forEach(function (name) { names.add(name); }); });
+        var select = document.getElementById(pair[0]), current = select.value;
+        while (select.options.length > 1) select.remove(1);
+        Array.from(names).sort().forEach(function (name) {
+            var option = document.createElement('option');
+            option.value = name;
+            option.textContent = name;
+            select.appendChild(option);
+        });
+        select.value = current;
+    });
+}
+
+function esafFiltersActive() {
+    return ['timeFrameFilter', 'requestTypeFilter', 'applicationFilter', 'assigneeFilter'].some(function (id) {
+        return document.getElementById(id).value !== 'all';
+    });
+}
+
+// A section fetched after page load (served pages): pick up its data and table, and apply the filters already set
+function esafSectionAdded(section) {
+    ESAF_SHEETS = null;
+    esafFillFilterOptions(esafSheets());
+    section.querySelectorAll('.summary-table-section').forEach(esafInitTable);
+    if (esafFiltersActive()) applyExecutiveFilters();
+}
+
+// Fill the application/assignee lists from the embedded data and filter as soon as a selection changes
+document.addEventListener('DOMContentLoaded', function () {
+    esafFillFilterOptions(esafSheets());
+    ['timeFrameFilter', 'requestTypeFilter', 'applicationFilter', 'assigneeFilter'].forEach(function (id) {
+        document.getElementById(id).addEventListener('change', applyExecutiveFilters);
+    });
+    document.querySelectorAll('.summary-table-section').forEach(esafInitTable);
+});
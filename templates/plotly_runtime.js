@@ -0,0 +1,40 @@
+// Chart runtime: every chart fragment calls esafPlot(id, data, layout); ESAF_PLOTLY_TEMPLATE is set by the page
+window.PLOTLYENV = window.PLOTLYENV || {};
+
+// Charts are drawn when they come near the viewport and purged again once they leave it,
+// so the browser only holds plots (and WebGL contexts) for what is on screen
+var esafObserver = ('IntersectionObserver' in window) ? new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+        if (entry.isIntersecting) {
+            esafDraw(entry.target);
+        } else if (entry.target._esafPlotted) {
+            Plotly.purge(entry.target);
+            entry.target._esafPlotted = false;
+        }
+    });
+}, {rootMargin: '300px 0px'}) : null;
+
+function esafLayout(layout) {
+    // Plotly writes into the layout it is given; keep the stored spec clean for the next draw
+    layout = JSON.parse(JSON.stringify(layout));
+    if (ESAF_PLOTLY_TEMPLATE) layout.template = ESAF_PLOTLY_TEMPLATE;
+    return layout;
+}
+function esafDraw(element) {
+    if (element._esafPlotted) return;
+    var spec = element._esafSpec;
+    Plotly.newPlot(element, JSON.parse(JSON.stringify(spec.data)), esafLayout(spec.layout), {"responsive": true});
+    element._esafPlotted = true;
+}
+function esafPlot(id, data, layout) {
+    var element = document.getElementById(id);
+    // Untouched copy of the figure: the in-page filters restyle from it
+    element._esafBase = JSON.parse(JSON.stringify({data: data, layout: layout}));
+    element._esafSpec = {data: data, layout: layout};
+    if (esafObserver) esafObserver.observe(element); else esafDraw(element);
+}
+function esafReplot(element, data, layout) {
+    element._esafSpec = {data: data, layout: layout};
+    // Off-screen charts just keep the new spec and are drawn with it when they scroll into view
+    if (element._esafPlotted) Plotly.react(element, data, esafLayout(layout), {"responsive": true});
+}
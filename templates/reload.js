@@ -0,0 +1,10 @@
+// Served pages (--serve) poll the workbook stamp and reload themselves once Step 3 rewrites the workbook;
+// ESAF_RELOAD ({stamp, pollMs}) is set by the page
+(function () {
+    setInterval(function () {
+        fetch('/api/stamp', {cache: 'no-cache'})
+            .then(function (response) { return response.json(); })
+            .then(function (data) { if (data.stamp !== ESAF_RELOAD.stamp) location.reload(); })
+            .catch(function () {});
+    }, ESAF_RELOAD.pollMs);
+})();
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The step modules live in the repository root, not in an installed package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
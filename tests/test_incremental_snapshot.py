@@ -0,0 +1,58 @@
+"""Incremental mode: diff_against_snapshot keeps only rows whose request and bucket both match the committed snapshot"""
+
+import importlib
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture(scope="module")
+def step3(tmp_path_factory):
+    # Step 3 reads esaf_config.json from the working folder when it is imported
+    folder = tmp_path_factory.mktemp("step3")
+    shutil.copy(ROOT / "esaf_config_defaults.json", folder / "esaf_config.json")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(folder)
+        return importlib.import_module("Data_Analysis_Split")
+
+def master_rows(statuses):
+    return pd.DataFrame({
+        'sAMAccountName': [f"sam{i}" for i in range(len(statuses))],
+        'Application': ["App"] * len(statuses),
+        'Request': ["Create account"] * len(statuses),
+        'Request date': ["2026-09-01 10:00"] * len(statuses),
+        'Status': statuses
+    })
+
+def test_unchanged_rows_keep_their_owner(step3):
+    owner = step3.ASSIGNEES[0]
+    df = master_rows([f"{step3.INDIA_KEYWORD} queue", "HCA-DOMESTIC"])
+    keys = step3.frame_request_keys(df)
+    snapshot = {keys[0]: [('india', owner)], keys[1]: [('domestic', owner)]}
+    kept, new, removed = step3.diff_against_snapshot(df, snapshot, step3.ASSIGNEES)
+    assert kept['india']['Assignee'].tolist() == [owner]
+    assert kept['domestic']['Assignee'].tolist() == [owner]
+    assert new.empty
+    assert removed == 0
+
+def test_bucket_change_is_removed_and_placed_again(step3):
+    owner = step3.ASSIGNEES[0]
+    df = master_rows(["HCA-DOMESTIC", f"{step3.MEDITECH_KEYWORD} on hold", "HCA-DOMESTIC"])
+    keys = step3.frame_request_keys(df)
+    # Row 0 stays Domestic, row 1 moved Domestic -> Meditech, row 2 moved India -> Domestic
+    snapshot = {keys[0]: [('domestic', owner)], keys[1]: [('domestic', owner)], keys[2]: [('india', owner)]}
+    kept, new, removed = step3.diff_against_snapshot(df, snapshot, step3.ASSIGNEES)
+    assert kept['domestic']['sAMAccountName'].tolist() == ["sam0"]
+    assert kept['india'].empty and kept['meditech'].empty
+    assert new['sAMAccountName'].tolist() == ["sam1", "sam2"]
+    assert removed == 2
+
+def test_split_data_uses_the_same_buckets(step3):
+    df = master_rows([f"{step3.INDIA_KEYWORD} queue", f"{step3.MEDITECH_KEYWORD} queue", "HCA-DOMESTIC", None])
+    india, domestic, meditech = step3.split_data(df)
+    assert india['sAMAccountName'].tolist() == ["sam0"]
+    assert meditech['sAMAccountName'].tolist() == ["sam1"]
+    assert domestic['sAMAccountName'].tolist() == ["sam2", "sam3"]
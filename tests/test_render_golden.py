@@ -0,0 +1,142 @@
+"""
+The plain-dict figure specs must match what the go.Figure builders they replaced produce for the same data.
+The reference builders below are the go.Figure versions, with the intended later changes applied:
+top 15 applications by volume in the priority matrix, and gap-filled WebGL series per date column in the trend chart.
+"""
+
+import json
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from plotly.utils import PlotlyJSONEncoder
+
+import Interactive_Dashboard as dashboard
+from aggregates import cube_type_counts
+
+COLORS = dashboard.COLORS
+PLAIN_AXES = dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)')
+CLEAR_BACKGROUND = dict(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+
+def reference_donut(cube):
+    type_counts = cube_type_counts(cube)
+    fig = go.Figure(data=[go.Pie(
+        labels=['Create Access', 'Modify Access', 'Delete Access', 'Other'],
+        values=[type_counts['Create'], type_counts['Modify'], type_counts['Delete'], type_counts['Other']],
+        hole=0.6,
+        marker_colors=[COLORS['create'], COLORS['modify'], COLORS['delete'], COLORS['light']],
+        textinfo='label+percent',
+        textposition='inside',
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig.update_layout(title="Access Request Distribution", title_x=0.5, showlegend=False,
+                      margin=dict(t=50, b=20, l=20, r=20), font=dict(size=12, color=COLORS['dark']),
+                      height=400, **CLEAR_BACKGROUND)
+    return fig
+
+def reference_top_apps(cube):
+    top_apps = dashboard.app_counts(cube).head(10)
+    fig = go.Figure(go.Bar(
+        y=top_apps.index, x=top_apps.values, orientation='h', marker_color=COLORS['primary'],
+        text=top_apps.values, textposition='auto',
+        hovertemplate='<b>%{y}</b><br>Requests: %{x}<extra></extra>'
+    ))
+    fig.update_layout(title="Top 10 Applications by Request Volume", title_x=0.5,
+                      margin=dict(t=50, b=20, l=150, r=20), font=dict(size=12, color=COLORS['dark']),
+                      xaxis=dict(title="Number of Requests", **PLAIN_AXES),
+                      yaxis=dict(title="", autorange="reversed", tickfont=dict(size=11)),
+                      height=max(400, len(top_apps) * 40), showlegend=False, **CLEAR_BACKGROUND)
+    return fig
+
+def reference_trend(cube):
+    fig = go.Figure()
+    for day_col, label, color in [('RequestDay', 'Requests Received', COLORS['primary']),
+                                  ('UpdatedDay', 'Requests Updated', COLORS['accent'])]:
+        daily = cube.groupby(day_col)['Count'].sum()
+        daily.index = pd.to_datetime(daily.index)
+        daily = daily.sort_index().asfreq('D', fill_value=0)
+        dates = daily.index.strftime('%Y-%m-%d')
+        fig.add_trace(go.Scattergl(
+            x=dates, y=daily.values, mode='lines+markers', name=label, legendgroup=day_col,
+            line=dict(color=color, width=3), marker=dict(size=6),
+            hovertemplate=f'<b>%{{x}}</b><br>{label}: %{{y}}<extra></extra>'))
+        if len(daily) > 7:
+            fig.add_trace(go.Scattergl(
+                x=dates, y=daily.rolling(window=7, min_periods=1).mean().values, mode='lines',
+                name=f'{label} (7-Day Avg)', legendgroup=day_col, line=dict(color=color, width=2, dash='dash'),
+                hovertemplate='<b>%{x}</b><br>7-Day Avg: %{y:.1f}<extra></extra>'))
+    fig.update_layout(title="Request Volume Trend Analysis", title_x=0.5, margin=dict(t=50, b=40, l=60, r=20),
+                      font=dict(size=12, color=COLORS['dark']),
+                      xaxis=dict(title="Date", **PLAIN_AXES), yaxis=dict(title="Number of Requests", **PLAIN_AXES),
+                      height=400, showlegend=True,
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1), **CLEAR_BACKGROUND)
+    return fig
+
+def reference_priority(cube):
+    type_counts = cube.groupby(['Application', 'RequestType'])['Count'].sum().unstack(fill_value=0)
+    type_counts = type_counts.reindex(columns=['Create', 'Modify', 'Delete'], fill_value=0)
+    app_totals = dashboard.app_counts(cube)
+    rows = []
+    for app in app_totals.head(15).index:
+        total = int(app_totals[app])
+        create, modify, delete = (int(type_counts.at[app, kind]) for kind in ['Create', 'Modify', 'Delete'])
+        rows.append({'Application': app, 'Total_Requests': total,
+                     'Risk_Score': (create + 2 * modify + 3 * delete) / total})
+    priority = pd.DataFrame(rows)
+    fig = go.Figure(go.Scatter(
+        x=priority['Total_Requests'], y=priority['Risk_Score'], mode='markers+text',
+        marker=dict(size=priority['Total_Requests'] / priority['Total_Requests'].max() * 50 + 20,
+                    color=priority['Risk_Score'], colorscale='RdYlGn_r', showscale=True,
+                    colorbar=dict(title="Risk Level")),
+        text=priority['Application'], textposition="middle center",
+        hovertemplate='<b>%{text}</b><br>Total Requests: %{x}<br>Risk Score: %{y:.2f}<extra></extra>'))
+    fig.update_layout(title="Application Priority Matrix (Volume vs Risk)", title_x=0.5,
+                      margin=dict(t=50, b=60, l=80, r=40), font=dict(size=12, color=COLORS['dark']),
+                      xaxis=dict(title="Total Request Volume", **PLAIN_AXES),
+                      yaxis=dict(title="Risk Score (Higher = More Critical)", **PLAIN_AXES),
+                      height=500, **CLEAR_BACKGROUND)
+    return fig
+
+def reference_workload(cube):
+    app_distribution = dashboard.app_counts(cube).head(8)
+    total = app_distribution.sum()
+    fig = go.Figure(go.Bar(
+        x=app_distribution.index, y=app_distribution.values,
+        text=[f'{count / total * 100:.1f}%' for count in app_distribution.values], textposition='auto',
+        marker_color=COLORS['primary'],
+        hovertemplate='<b>%{x}</b><br>Requests: %{y}<br>Share: %{text}<extra></extra>'
+    ))
+    fig.update_layout(title="Workload Distribution Across Applications", title_x=0.5,
+                      margin=dict(t=50, b=80, l=60, r=20), font=dict(size=12, color=COLORS['dark']),
+                      xaxis=dict(title="Applications", tickangle=45, **PLAIN_AXES),
+                      yaxis=dict(title="Number of Requests", **PLAIN_AXES), height=400, **CLEAR_BACKGROUND)
+    return fig
+
+REFERENCE_BUILDERS = {'donut': reference_donut, 'top_apps': reference_top_apps, 'trend': reference_trend,
+                      'priority': reference_priority, 'workload': reference_workload}
+
+def reference_json(fig):
+    figure = fig.to_plotly_json()
+    figure['layout'].pop('template', None)
+    return dashboard.comparable_figure(json.loads(json.dumps(figure, cls=PlotlyJSONEncoder)))
+
+@pytest.fixture(scope="module")
+def cube():
+    return dashboard.render_fixture_cube()
+
+@pytest.mark.parametrize("key", sorted(REFERENCE_BUILDERS))
+def test_spec_matches_go_figure_builder(cube, key):
+    spec = dashboard.golden_figures(cube)[key]
+    assert dashboard.comparable_figure(dashboard.plain_json(spec)) == reference_json(REFERENCE_BUILDERS[key](cube))
+
+@pytest.mark.parametrize("key", sorted(REFERENCE_BUILDERS))
+def test_golden_file_is_go_figure_output(cube, key):
+    with open(dashboard.RENDER_GOLDEN_FILE, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    assert golden[key] == reference_json(REFERENCE_BUILDERS[key](cube))
+
+def test_check_golden_ignores_configured_trend_points(monkeypatch):
+    monkeypatch.setattr(dashboard, "TREND_MAX_POINTS", 50)
+    checked, problems = dashboard.check_golden()
+    assert checked == len(REFERENCE_BUILDERS)
+    assert problems == []
@@ -0,0 +1,191 @@
+"""
+ESAF Time-Series Store
+Assigned/backlog levels (Application x RequestType x Assignee) and new placements per day, with week and month rollups
+"""
+
+import json
+import os
+from collections import Counter
+from datetime import date, timedelta
+import pandas as pd
+
+STORE_VERSION = 2
+STORE_FILE = "esaf_timeseries.json"
+PERIODS = ["day", "week", "month"]
+SERIES_KEYS = ["Application", "RequestType", "Assignee"]
+BACKLOG = "(unassigned)"
+
+# Sheets whose rows count as assigned work; HCA_EXTRA_DATA rows are the backlog left for the next run
+ASSIGNED_SHEETS = ["HCA_India", "HCA_Domestic"]
+BACKLOG_SHEETS = ["HCA_EXTRA_DATA"]
+
+def period_key(day, period):
+    """'2024-05-17' / '2024-W20' (ISO week) / '2024-05'"""
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return day.strftime("%Y-%m")
+    return day.isoformat()
+
+def clean_part(value):
+    return "" if value is None or pd.isna(value) else str(value)
+
+def snapshot_from_cubes(cubes):
+    """{(app, type, assignee): count} for one run, straight from Step 3's sheet cubes"""
+    counts = {}
+    for sheet, cube in cubes.items():
+        if sheet in ASSIGNED_SHEETS:
+            owner = None
+        elif sheet in BACKLOG_SHEETS:
+            owner = BACKLOG
+        else:
+            continue
+        if cube.empty:
+            continue
+        grouped = cube.groupby(SERIES_KEYS, sort=False, dropna=False)["Count"].sum()
+        for (app, kind, assignee), count in grouped.items():
+            key = (clean_part(app), clean_part(kind) or "Other", owner or clean_part(assignee) or BACKLOG)
+            counts[key] = counts.get(key, 0) + int(count)
+    return counts
+
+def empty_store():
+    """Levels per period (the latest recorded day's snapshot in each week/month), new placements per period, and the
+    open assignments new placements are diffed against"""
+    store = {period: {} for period in PERIODS}
+    store["as_of"] = {"week": {}, "month": {}}
+    store["placed"] = {period: {} for period in PERIODS}
+    store["open"] = {"day": None, "rows": Counter()}
+    store["base"] = {"day": None, "rows": Counter()}
+    return store
+
+def parse_rows(rows):
+    return {(app, kind, assignee): count for app, kind, assignee, count in rows}
+
+def dump_rows(rows):
+    return [[app, kind, assignee, count] for (app, kind, assignee), count in rows.items()]
+
+def set_level(store, day_key, snapshot):
+    """Make snapshot the day's level and, unless a later day is already recorded there, its week's and month's"""
+    store["day"][day_key] = dict(snapshot)
+    day = date.fromisoformat(day_key)
+    for period in ["week", "month"]:
+        key = period_key(day, period)
+        if store["as_of"][period].get(key, "") <= day_key:
+            store[period][key] = dict(snapshot)
+            store["as_of"][period][key] = day_key
+
+def load_store(path=STORE_FILE):
+    """{period: {period_key: {(app, type, assignee): count}}} levels plus "placed" rollups — empty when missing or unreadable"""
+    store = empty_store()
+    if not os.path.exists(path):
+        return store
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get("version") == 1:
+            # Version 1 summed whole daily snapshots into weeks/months; only its daily levels are still meaningful
+            for key, rows in sorted(payload.get("day", {}).items()):
+                set_level(store, key, parse_rows(rows))
+            print(f"[INFO] Converted time-series store '{path}': weekly/monthly levels rebuilt from daily snapshots, "
+                  f"new-placement counts start with this run")
+            return store
+        if payload.get("version") != STORE_VERSION:
+            print(f"[WARNING] Ignoring time-series store '{path}' written by another version")
+            return store
+        for period in PERIODS:
+            store[period] = {key: parse_rows(rows) for key, rows in payload.get(period, {}).items()}
+            store["placed"][period] = {key: parse_rows(rows) for key, rows in payload.get("placed", {}).get(period, {}).items()}
+        store["as_of"].update(payload.get("as_of", {}))
+        for name in ["open", "base"]:
+            entry = payload.get(name, {})
+            store[name] = {"day": entry.get("day"), "rows": Counter(entry.get("rows", {}))}
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable time-series store '{path}': {e}")
+        return empty_store()
+    return store
+
+def assignment_id(request_key, assignee):
+    return f"{request_key}\t{assignee}"
+
+def new_placements(assignments, base):
+    """{(app, type, assignee): count} of assignments not already open with the same owner in base"""
+    placed = {}
+    seen = Counter()
+    for request_key, app, kind, assignee in assignments:
+        ident = assignment_id(request_key, assignee)
+        seen[ident] += 1
+        if seen[ident] > base[ident]:
+            key = (clean_part(app), clean_part(kind) or "Other", clean_part(assignee) or BACKLOG)
+            placed[key] = placed.get(key, 0) + 1
+    return placed
+
+def record_snapshot(store, snapshot, assignments, today=None):
+    """Record today's levels and the requests newly placed with an assignee since the previous recorded day
+
+    snapshot is {(app, type, assignee): count}; assignments lists (request_key, app, type, assignee) per assigned row.
+    """
+    today = today or date.today()
+    day_key = period_key(today, "day")
+    set_level(store, day_key, snapshot)
+
+    # The base is the last earlier day's final assignment, so a same-day re-run is diffed against the same base
+    if store["open"]["day"] is not None and store["open"]["day"] < day_key:
+        store["base"] = store["open"]
+    placed = new_placements(assignments, store["base"]["rows"])
+    store["open"] = {"day": day_key,
+                     "rows": Counter(assignment_id(request_key, assignee) for request_key, _, _, assignee in assignments)}
+
+    # Placements are flows: a re-run replaces that day, and weeks/months move by the difference
+    previous = store["placed"]["day"].get(day_key, {})
+    store["placed"]["day"][day_key] = placed
+    for period in ["week", "month"]:
+        bucket = store["placed"][period].setdefault(period_key(today, period), {})
+        for key in set(previous) | set(placed):
+            value = bucket.get(key, 0) + placed.get(key, 0) - previous.get(key, 0)
+            if value:
+                bucket[key] = value
+            else:
+                bucket.pop(key, None)
+
+def save_store(store, retention_days, path=STORE_FILE, today=None):
+    """Drop day entries past retention (weeks and months are kept) and write atomically"""
+    cutoff = ((today or date.today()) - timedelta(days=retention_days)).isoformat()
+    store["day"] = {key: rows for key, rows in store["day"].items() if key >= cutoff}
+    store["placed"]["day"] = {key: rows for key, rows in store["placed"]["day"].items() if key >= cutoff}
+    payload = {"version": STORE_VERSION}
+    for period in PERIODS:
+        payload[period] = {key: dump_rows(rows) for key, rows in sorted(store[period].items())}
+    payload["placed"] = {period: {key: dump_rows(rows) for key, rows in sorted(store["placed"][period].items())}
+                         for period in PERIODS}
+    payload["as_of"] = {period: dict(sorted(keys.items())) for period, keys in store["as_of"].items()}
+    for name in ["open", "base"]:
+        payload[name] = {"day": store[name]["day"], "rows": dict(store[name]["rows"])}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def record_run(cubes, assignments, retention_days, path=STORE_FILE, today=None):
+    store = load_store(path)
+    record_snapshot(store, snapshot_from_cubes(cubes), assignments, today)
+    save_store(store, retention_days, path, today)
+    print(f"[INFO] Time-series store updated ({len(store['day'])} days, "
+          f"{len(store['week'])} weeks, {len(store['month'])} months)")
+
+def rollup_frame(store, period, placed=False):
+    """Long frame (Period + SERIES_KEYS + Count) of one rollup — levels, or new placements — oldest period first"""
+    rollup = store["placed"][period] if placed else store[period]
+    rows = [(key, app, kind, assignee, count)
+            for key, entries in sorted(rollup.items())
+            for (app, kind, assignee), count in entries.items()]
+    return pd.DataFrame(rows, columns=["Period"] + SERIES_KEYS + ["Count"])
+
+def period_start(key, period):
+    """First calendar day of a period key, so every rollup can share a date axis"""
+    if period == "week":
+        year, week = key.split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    if period == "month":
+        return date.fromisoformat(f"{key}-01")
+    return date.fromisoformat(key)